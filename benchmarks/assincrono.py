@@ -0,0 +1,142 @@
+"""Benchmark da leitura assíncrona ("escola/assincrono.py")
+
+Intenção :
+    Compara, com 1000 conexões simultâneas (keep-alive), a latência (p50/p95/p99) e as requisições por segundo de:
+      - WSGI : gunicorn com worker "gthread", a forma usual de servir o "setup/wsgi.py";
+      - ASGI síncrono : uvicorn com o "setup/asgi.py" e "LEITURA_ASSINCRONA=0" (cada requisição passa pelo "sync_to_async");
+      - ASGI assíncrono : uvicorn com o "setup/asgi.py", a leitura assíncrona e os middlewares de "escola/middlewares.py".
+    Todos com 1 processo, o mesmo banco SQLite em arquivo temporário (fixtures do projeto) e as rotas anônimas de leitura de cursos,
+    com e sem o cache de respostas. O cliente é um gerador HTTP/1.1 em asyncio, no mesmo processo do script.
+    Obs: o cliente e o servidor dividem a mesma máquina; compare os servidores entre si, não os números absolutos. Como cada conexão
+    envia a próxima requisição assim que recebe a resposta, a latência fica próxima de conexões / (requisições por segundo).
+    O uvicorn usa o "httptools" e o "uvloop" quando instalados ("pip install uvicorn[standard]").
+
+Uso :
+    python benchmarks/assincrono.py [conexoes] [segundos]
+"""
+
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PORTA = 8765
+ROTAS = ['/cursos/', '/cursos/1/']
+SERVIDORES = {
+    'WSGI (gunicorn gthread)': (
+        ['gunicorn', 'setup.wsgi:application', '-w', '1', '-k', 'gthread', '--threads', '32',
+         '--worker-connections', '4000', '--backlog', '4096', '-b', f'127.0.0.1:{PORTA}', '--log-level', 'warning'],
+        {'LEITURA_ASSINCRONA': '0'},
+    ),
+    'ASGI síncrono (uvicorn)': (
+        ['uvicorn', 'setup.asgi:application', '--port', str(PORTA), '--backlog', '4096', '--no-access-log', '--log-level', 'warning'],
+        {'LEITURA_ASSINCRONA': '0'},
+    ),
+    'ASGI assíncrono (uvicorn)': (
+        ['uvicorn', 'setup.asgi:application', '--port', str(PORTA), '--backlog', '4096', '--no-access-log', '--log-level', 'warning'],
+        {'LEITURA_ASSINCRONA': '1'},
+    ),
+}
+
+def preparar_banco(pasta):
+    banco = os.path.join(pasta, 'carga.sqlite3')
+    ambiente = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'benchmarks.settings_carga', 'BENCHMARK_BANCO': banco}
+    for comando in (['migrate', '-v', '0'], ['loaddata', 'prototipo_banco.json', '-v', '0']):
+        subprocess.run([sys.executable, 'manage.py', *comando], cwd=RAIZ, env=ambiente, check=True)
+    return banco
+
+def aguardar_porta(segundos=30):
+    limite = time.monotonic() + segundos
+    while time.monotonic() < limite:
+        try:
+            socket.create_connection(('127.0.0.1', PORTA), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('o servidor não iniciou')
+
+async def ler_resposta(leitor):
+    cabecalho = await leitor.readuntil(b'\r\n\r\n')
+    status = int(cabecalho[9:12])
+    tamanho = 0
+    for linha in cabecalho.split(b'\r\n'):
+        if linha.lower().startswith(b'content-length:'):
+            tamanho = int(linha.split(b':', 1)[1])
+    await leitor.readexactly(tamanho)
+    return status
+
+async def conexao(rota, fim, inicio_medicao, latencias, erros):
+# uma conexão keep-alive enviando uma requisição após a outra até o fim do tempo; são medidas as respostas recebidas entre o fim do
+# aquecimento e o fim do tempo
+
+    pedido = f'GET {rota} HTTP/1.1\r\nHost: 127.0.0.1\r\nAccept: application/json\r\n\r\n'.encode()
+    try:
+        leitor, escritor = await asyncio.open_connection('127.0.0.1', PORTA)
+    except OSError:
+        erros.append('conexão')
+        return
+    try:
+        while time.monotonic() < fim:
+            antes = time.monotonic()
+            escritor.write(pedido)
+            status = await ler_resposta(leitor)
+            depois = time.monotonic()
+            if not inicio_medicao <= depois < fim:
+                continue
+            if status != 200:
+                erros.append(status)
+            else:
+                latencias.append(depois - antes)
+    except (OSError, asyncio.IncompleteReadError):
+        erros.append('conexão')
+    finally:
+        escritor.close()
+
+async def carga(rota, conexoes, segundos, aquecimento=5):
+    latencias, erros = [], []
+    inicio_medicao = time.monotonic() + aquecimento
+    fim = inicio_medicao + segundos
+    await asyncio.gather(*(conexao(rota, fim, inicio_medicao, latencias, erros) for _ in range(conexoes)))
+    return latencias, erros
+
+def percentil(valores, p):
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))] * 1000 if valores else float('nan')
+
+def main():
+    conexoes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    segundos = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    pasta = tempfile.mkdtemp()
+    try:
+        banco = preparar_banco(pasta)
+        print(f'{conexoes} conexões, {segundos}s por medição')
+        print(f'{"servidor":<28} {"cache":<6} {"rota":<12} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"erros":>6}')
+        for cache_ativo in ('0', '1'):
+            for nome, (comando, variaveis) in SERVIDORES.items():
+                ambiente = {
+                    **os.environ, **variaveis, 'DJANGO_SETTINGS_MODULE': 'benchmarks.settings_carga',
+                    'BENCHMARK_BANCO': banco, 'BENCHMARK_CACHE': cache_ativo,
+                }
+                servidor = subprocess.Popen(comando, cwd=RAIZ, env=ambiente)
+                try:
+                    aguardar_porta()
+                    for rota in ROTAS:
+                        latencias, erros = asyncio.run(carga(rota, conexoes, segundos))
+                        latencias.sort()
+                        print(
+                            f'{nome:<28} {"sim" if cache_ativo == "1" else "não":<6} {rota:<12} {len(latencias) / segundos:>8.0f} '
+                            f'{percentil(latencias, 50):>8.1f} {percentil(latencias, 95):>8.1f} {percentil(latencias, 99):>8.1f} '
+                            f'{len(erros):>6}'
+                        )
+                finally:
+                    servidor.terminate()
+                    servidor.wait()
+    finally:
+        shutil.rmtree(pasta)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark da autenticação ("escola/authentication.py")
+
+Intenção :
+    Requisições por segundo em um único núcleo (uma thread, um processo) com:
+      - HTTP Basic sem o cache de credenciais ("CREDENCIAIS_CACHE_TAMANHO = 0"): o PBKDF2 da senha a cada requisição, como antes;
+      - HTTP Basic com o cache de credenciais;
+      - o token assinado da rota "token/" ("Authorization: Token <token>").
+    Para uma leitura ("GET estudantes/<pk>/", com o cache de respostas) e uma escrita ("PUT cursos/<pk>/"). Mede também o tempo de
+    apenas conferir a senha com o hasher padrão do Django. Usa um banco SQLite em memória com as fixtures, criado pelo próprio script.
+
+Uso :
+    python benchmarks/autenticacao.py [segundos por medição]
+"""
+
+import base64
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
+
+import django
+from django.conf import settings
+
+settings.DATABASES['default']['NAME'] = ':memory:'
+settings.DEBUG = False
+settings.ALLOWED_HOSTS = ['*']
+settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = {'anon': '1000000000/day', 'user': '1000000000/day'}
+django.setup()
+
+from django.contrib.auth.hashers import check_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+from escola.authentication import limpar_credenciais
+
+def por_segundo(requisicao, segundos):
+    requisicao()
+    quantidade = 0
+    inicio = time.perf_counter()
+    while time.perf_counter() - inicio < segundos:
+        response = requisicao()
+        assert response.status_code == 200, response.status_code
+        quantidade += 1
+    return quantidade / (time.perf_counter() - inicio)
+
+def main():
+    segundos = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    call_command('migrate', verbosity=0)
+    call_command('loaddata', 'prototipo_banco.json', verbosity=0)
+    usuario = User.objects.create_superuser('carga', 'carga@gmail.com', 'senha-carga')
+    cliente = APIClient()
+
+    inicio = time.perf_counter()
+    check_password('senha-carga', usuario.password)
+    print(f'{os.cpu_count()} núcleo(s); conferir a senha ({usuario.password.split("$")[0]}): {(time.perf_counter() - inicio) * 1000:.0f} ms')
+
+    basic = {'Authorization': 'Basic ' + base64.b64encode(b'carga:senha-carga').decode()}
+    token = {'Authorization': 'Token ' + cliente.post('/token/', headers=basic).data['token']}
+    curso = {'codigo': 'CBM', 'descricao': 'Benchmark', 'nivel': 'B'}
+    requisicoes = {
+        'leitura': lambda cabecalho: cliente.get('/estudantes/1/', headers=cabecalho),
+        'escrita': lambda cabecalho: cliente.put('/cursos/1/', curso, headers=cabecalho),
+    }
+    autenticacoes = [('Basic sem cache', basic, 0), ('Basic com cache', basic, settings.CREDENCIAIS_CACHE_TAMANHO), ('Token', token, 0)]
+
+    print(f'{"autenticação":<16} {"leitura (req/s)":>16} {"escrita (req/s)":>16}')
+    for nome, cabecalho, tamanho in autenticacoes:
+        limpar_credenciais()
+        with override_settings(CREDENCIAIS_CACHE_TAMANHO=tamanho):
+            taxas = [por_segundo(lambda: requisicao(cabecalho), segundos) for requisicao in requisicoes.values()]
+        print(f'{nome:<16} {taxas[0]:>16.1f} {taxas[1]:>16.1f}')
+
+if __name__ == '__main__':
+    main()
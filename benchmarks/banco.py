@@ -0,0 +1,120 @@
+"""Benchmark do perfil de produção do SQLite ("escola/backends/sqlite3", "escola/transacoes.py")
+
+Intenção :
+    Carga mista de leitura e escrita pela API, com várias threads ao mesmo tempo sobre o mesmo arquivo SQLite:
+      - 60% GET "estudantes/?page=N" e 10% GET "cursos/<pk>/matriculas/";
+      - 15% POST "matriculas/" (uma matrícula) e 15% POST "matriculas/lote/" (20 matrículas, lê e grava na mesma transação).
+    Compara o perfil padrão (journal DELETE, conexão nova a cada requisição, sem repetição das transações) com o perfil de
+    produção ("BANCO_PERFIL=producao": WAL, PRAGMAs, conexões persistentes, "BEGIN IMMEDIATE" e repetição das transações
+    bloqueadas). Cada perfil roda em um processo separado, com um banco criado pelo próprio script (cache de respostas desativado).
+
+Uso :
+    python benchmarks/banco.py [threads] [segundos]
+"""
+
+import logging
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ESTUDANTES = 2000
+PERFIS = {
+    'padrão': {'BANCO_PERFIL': 'desenvolvimento', 'TRANSACAO_TENTATIVAS': '1'},
+    'produção': {'BANCO_PERFIL': 'producao', 'TRANSACAO_TENTATIVAS': '5'},
+}
+
+def configurar():
+    sys.path.insert(0, RAIZ)
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'benchmarks.settings_carga'
+    import django
+    from django.conf import settings
+    django.setup()
+    settings.ALLOWED_HOSTS = ['*']
+    settings.TRANSACAO_TENTATIVAS = int(os.environ.get('TRANSACAO_TENTATIVAS', 5))
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+    # os erros 500 são contados pelo benchmark, sem o traceback de cada um
+
+def preparar():
+    configurar()
+    from django.core.management import call_command
+    from escola.models import Estudante
+    call_command('migrate', verbosity=0)
+    call_command('loaddata', 'prototipo_banco.json', verbosity=0)
+    Estudante.objects.bulk_create(
+        Estudante(nome=f'Carga {i}', email='carga@gmail.com', cpf=f'{i:011d}', data_nascimento='2000-01-01', celular='21970758285')
+        for i in range(ESTUDANTES)
+    )
+
+def operacao(cliente, sorteio, estudantes, cursos):
+    tipo = sorteio.random()
+    if tipo < 0.60:
+        return 'leitura', cliente.get(f'/estudantes/?page={sorteio.randint(1, len(estudantes) // 20)}')
+    if tipo < 0.70:
+        return 'leitura', cliente.get(f'/cursos/{sorteio.choice(cursos)}/matriculas/')
+    if tipo < 0.85:
+        dados = {'estudante': sorteio.choice(estudantes), 'curso': sorteio.choice(cursos), 'periodo': 'M'}
+        return 'escrita', cliente.post('/matriculas/', dados, format='json')
+    dados = [{'estudante': sorteio.choice(estudantes), 'curso': sorteio.choice(cursos), 'periodo': 'N'} for _ in range(20)]
+    return 'lote', cliente.post('/matriculas/lote/', dados, format='json')
+
+def carga(threads, segundos):
+    configurar()
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIClient
+    from escola.models import Curso, Estudante
+
+    usuario = User.objects.get(username='massoto')
+    estudantes = list(Estudante.objects.values_list('id', flat=True))
+    cursos = list(Curso.objects.values_list('id', flat=True))
+    resultados = Counter()
+    fim = time.monotonic() + segundos
+
+    def trabalhador(semente):
+        cliente = APIClient(raise_request_exception=False)
+        cliente.force_authenticate(user=usuario)
+        sorteio = random.Random(semente)
+        while time.monotonic() < fim:
+            tipo, response = operacao(cliente, sorteio, estudantes, cursos)
+            resultados[tipo, 'erro' if response.status_code >= 500 else 'ok'] += 1
+
+    trabalhadores = [threading.Thread(target=trabalhador, args=(semente,)) for semente in range(threads)]
+    for trabalhador_ in trabalhadores:
+        trabalhador_.start()
+    for trabalhador_ in trabalhadores:
+        trabalhador_.join()
+
+    total = sum(resultados.values())
+    erros = sum(quantidade for (_, situacao), quantidade in resultados.items() if situacao == 'erro')
+    partes = '  '.join(
+        f'{tipo} {resultados[tipo, "ok"] / segundos:>6.0f}/s ({resultados[tipo, "erro"]} erros)' for tipo in ('leitura', 'escrita', 'lote')
+    )
+    print(f'{os.environ["PERFIL"]:<10} {total / segundos:>8.0f}/s {erros:>7} erros 500   {partes}')
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    segundos = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    pasta = tempfile.mkdtemp()
+    try:
+        print(f'{threads} threads, {segundos}s por perfil')
+        for perfil, variaveis in PERFIS.items():
+            banco = os.path.join(pasta, f'{variaveis["BANCO_PERFIL"]}.sqlite3')
+            ambiente = {**os.environ, **variaveis, 'PERFIL': perfil, 'BENCHMARK_BANCO': banco}
+            subprocess.run([sys.executable, __file__, '--preparar'], env=ambiente, check=True)
+            subprocess.run([sys.executable, __file__, '--carga', str(threads), str(segundos)], env=ambiente, check=True)
+    finally:
+        shutil.rmtree(pasta)
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--preparar']:
+        preparar()
+    elif sys.argv[1:2] == ['--carga']:
+        carga(int(sys.argv[2]), int(sys.argv[3]))
+    else:
+        main()
@@ -0,0 +1,75 @@
+"""Benchmark da busca de estudantes ("escola/busca.py")
+
+Intenção :
+    Mede a latência do "?search=" de estudantes (contagem + primeira página de 20, como faz a listagem paginada) com o
+    "SearchFilter" do Django Rest ("LIKE '%termo%'" em toda a tabela) e com o "BuscaIndexadaFilter" (tabela FTS5), para termos
+    digitados aos poucos em uma caixa de busca. Usa um banco SQLite em memória, criado e populado pelo próprio script.
+
+Uso :
+    python benchmarks/busca.py [quantidade]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
+
+import django
+from django.conf import settings
+
+settings.DATABASES['default']['NAME'] = ':memory:'
+settings.DEBUG = False
+django.setup()
+
+from django.core.management import call_command
+from rest_framework import filters
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from escola.busca import BuscaIndexadaFilter
+from escola.models import Estudante
+from escola.views import EstudanteViewSet
+
+NOMES = ['João', 'Maria', 'José', 'Ana', 'Antônio', 'Letícia', 'Lúcia', 'Sebastião', 'Vitória', 'Gustavo', 'Cecília', 'Otávio']
+SOBRENOMES = ['Silva', 'Araújo', 'Conceição', 'Gonçalves', 'Magalhães', 'Pereira', 'Simões', 'Guimarães', 'Lima', 'Brandão']
+TERMOS = ['jo', 'joa', 'joão', 'joão araujo', 'guimarães', 'magal', '123', '1234567', '98765432109', 'xyzw']
+
+def latencia(filtro, termo, repeticoes):
+    request = Request(APIRequestFactory().get('/estudantes/', {'search': termo}))
+    view = EstudanteViewSet()
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        queryset = filtro.filter_queryset(request, Estudante.objects.order_by('id'), view)
+        total = queryset.count()
+        list(queryset.values_list('id', flat=True)[:20])
+        decorrido = time.perf_counter() - inicio
+        melhor = decorrido if melhor is None else min(melhor, decorrido)
+    return melhor * 1000, total
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    aleatorio = random.Random(42)
+    call_command('migrate', verbosity=0)
+    inicio = time.perf_counter()
+    cpfs = aleatorio.sample(range(10**11), quantidade)
+    for bloco in range(0, quantidade, 50_000):
+        Estudante.objects.bulk_create(
+            Estudante(
+                nome=f'{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} {aleatorio.choice(SOBRENOMES)}',
+                email='estudante@gmail.com', cpf=f'{cpf:011d}', data_nascimento='2000-01-01', celular='21970758285',
+            )
+            for cpf in cpfs[bloco:bloco + 50_000]
+        )
+    print(f'{quantidade:,} estudantes gravados em {time.perf_counter() - inicio:.1f}s (com os triggers da busca)\n')
+
+    print(f'{"termo":<16}{"SearchFilter":>22}{"BuscaIndexadaFilter":>28}')
+    for termo in TERMOS:
+        lento, total_lento = latencia(filters.SearchFilter(), termo, 3)
+        rapido, total_rapido = latencia(BuscaIndexadaFilter(), termo, 3)
+        print(f'{termo:<16}{lento:>10.1f} ms {total_lento:>8}{rapido:>16.1f} ms {total_rapido:>8}')
+
+if __name__ == '__main__':
+    main()
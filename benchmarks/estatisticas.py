@@ -0,0 +1,103 @@
+"""Benchmark das estatísticas de matrículas ("escola/estatisticas.py")
+
+Intenção :
+    Compara, para quantidades crescentes de matrículas:
+      - a rota "matriculas/estatisticas/" (tabela de resumo mantida pelos triggers);
+      - o "GROUP BY" sobre todas as matrículas, o que a rota faria sem a tabela;
+      - o que os painéis faziam antes: percorrer todas as páginas de "matriculas/" e contar no cliente (apenas até 20 mil matrículas).
+    Mede também o custo dos triggers na gravação em lote ("bulk_create"). Usa um banco SQLite em memória, criado e populado pelo
+    próprio script, com 200 cursos.
+
+Uso :
+    python benchmarks/estatisticas.py [quantidade máxima]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
+
+import django
+from django.conf import settings
+
+settings.DATABASES['default']['NAME'] = ':memory:'
+settings.DEBUG = False
+settings.ALLOWED_HOSTS = ['*']
+settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = {'anon': '1000000000/day', 'user': '1000000000/day'}
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from rest_framework.test import APIClient
+from escola.estatisticas import remover_estatisticas, instalar_estatisticas
+from escola.models import Curso, Estudante, Matricula
+
+CURSOS = 200
+PAGINAVEL = 20_000
+
+def melhor_tempo(funcao, repeticoes=5):
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        decorrido = time.perf_counter() - inicio
+        melhor = decorrido if melhor is None else min(melhor, decorrido)
+    return melhor * 1000
+
+def gravar(quantidade, aleatorio):
+    inicio = time.perf_counter()
+    for bloco in range(0, quantidade, 50_000):
+        Matricula.objects.bulk_create(
+            Matricula(estudante_id=aleatorio.randint(1, 1000), curso_id=aleatorio.randint(1, CURSOS), periodo=aleatorio.choice('MVN'))
+            for _ in range(min(50_000, quantidade - bloco))
+        )
+    return time.perf_counter() - inicio
+
+def paginar(cliente):
+    url = '/matriculas/'
+    contagem = 0
+    while url:
+        dados = cliente.get(url).data
+        contagem += len(dados['results'])
+        url = dados['next']
+    return contagem
+
+def main():
+    maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    aleatorio = random.Random(42)
+    call_command('migrate', verbosity=0)
+    Curso.objects.bulk_create(Curso(codigo=f'C{i:04d}', descricao=f'Curso {i}', nivel='BIA'[i % 3]) for i in range(1, CURSOS + 1))
+    Estudante.objects.bulk_create(
+        Estudante(nome=f'Estudante {i}', email='e@gmail.com', cpf=f'{i:011d}', data_nascimento='2000-01-01', celular='21970758285')
+        for i in range(1, 1001)
+    )
+    cliente = APIClient()
+    cliente.force_authenticate(User.objects.create_superuser('admin', 'admin@gmail.com', 'admin'))
+
+    remover_estatisticas(connection)
+    sem_triggers = gravar(100_000, aleatorio)
+    Matricula.objects.all().delete()
+    instalar_estatisticas(connection)
+    com_triggers = gravar(100_000, aleatorio)
+    print(f'bulk_create de 100 mil matrículas: {sem_triggers:.2f}s sem os triggers, {com_triggers:.2f}s com os triggers')
+
+    print(f'{"matrículas":>12} {"rota (ms)":>10} {"GROUP BY (ms)":>14} {"paginação (ms)":>15}')
+    Matricula.objects.all().delete()
+    gravadas = 0
+    for quantidade in (1_000, 10_000, 100_000, maximo):
+        if quantidade > maximo or quantidade <= gravadas:
+            continue
+        gravar(quantidade - gravadas, aleatorio)
+        gravadas = quantidade
+        rota = melhor_tempo(lambda: cliente.get('/matriculas/estatisticas/'))
+        agrupamento = melhor_tempo(lambda: list(Matricula.objects.values_list('curso_id', 'periodo').annotate(total=Count('id')).order_by()))
+        paginacao = f'{melhor_tempo(lambda: paginar(cliente), 1):>15.0f}' if quantidade <= PAGINAVEL else f'{"-":>15}'
+        print(f'{quantidade:>12} {rota:>10.1f} {agrupamento:>14.1f} {paginacao}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""Benchmark das exportações em NDJSON e CSV ("escola/exportacao.py")
+
+Intenção :
+    Mede, em um processo novo para cada rota e formato, o tempo até o primeiro byte do corpo (TTFB), o tempo total, o volume enviado
+    e a memória máxima (RSS) do processo ao exportar "estudantes/exportar/" e "matriculas/exportar/" pelas aplicações WSGI
+    ("setup/wsgi.py") e ASGI ("setup/asgi.py"), consumindo a resposta aos poucos como um servidor faria. A memória é mostrada antes
+    da requisição (processo com a aplicação carregada) e no máximo durante a exportação: com o "StreamingHttpResponse" e o
+    "iterator" (no ASGI, o gerador assíncrono) a diferença deve ficar constante, independente da quantidade de linhas.
+
+    A base ("--linhas" estudantes, 1 matrícula por estudante em média) é gerada pelo "python manage.py gerar_dados" e guardada em
+    "benchmarks/dados/", para ser reaproveitada pelas próximas execuções.
+
+Uso :
+    python benchmarks/exportacao.py [--linhas 1000000] [--semente 1] [--recriar]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DADOS = os.path.join(RAIZ, 'benchmarks', 'dados')
+ROTAS = ['estudantes', 'matriculas']
+FORMATOS = ['ndjson', 'csv']
+SERVIDORES = ['wsgi', 'asgi']
+
+def configurar(banco):
+    os.environ['BENCHMARK_BANCO'] = banco
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'benchmarks.settings_carga'
+    sys.path.insert(0, RAIZ)
+
+def popular(banco, linhas, semente):
+# executado em um processo separado: cria a base em um arquivo temporário, que só recebe o nome final quando estiver completa
+
+    configurar(banco)
+    import django
+    django.setup()
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+    call_command('gerar_dados', estudantes=linhas, media_matriculas=1, semente=semente, stdout=sys.stderr)
+    User.objects.create_superuser('exportacao', 'exportacao@escola.com', 'senha-exportacao')
+
+def requisicao_wsgi(application, rota, formato, autorizacao, receber):
+    from io import BytesIO
+
+    ambiente = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': f'/{rota}/exportar/', 'QUERY_STRING': f'formato={formato}',
+        'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost', 'wsgi.input': BytesIO(), 'wsgi.url_scheme': 'http',
+        'HTTP_AUTHORIZATION': autorizacao,
+    }
+    situacao = []
+    resposta = application(ambiente, lambda status, cabecalhos: situacao.append(status))
+    for bloco in resposta:
+        receber(bloco)
+    resposta.close()
+    return situacao == ['200 OK']
+
+def requisicao_asgi(application, rota, formato, autorizacao, receber):
+    import asyncio
+
+    escopo = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http', 'root_path': '',
+        'path': f'/{rota}/exportar/', 'query_string': f'formato={formato}'.encode(), 'server': ('localhost', 80),
+        'client': ('127.0.0.1', 1), 'headers': [(b'host', b'localhost'), (b'authorization', autorizacao.encode())],
+    }
+    situacao = []
+
+    async def receive():
+        if not situacao:
+            situacao.append(None)
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await asyncio.Event().wait()
+
+    async def send(mensagem):
+        if mensagem['type'] == 'http.response.start':
+            situacao.append(mensagem['status'])
+        elif mensagem['type'] == 'http.response.body':
+            receber(mensagem.get('body', b''))
+
+    asyncio.run(application(escopo, receive, send))
+    return situacao[1:] == [200]
+
+def exportar(banco, servidor, rota, formato):
+# executado em um processo novo: carrega a aplicação, faz uma exportação completa e imprime as medidas em JSON
+
+    import resource
+    from importlib import import_module
+
+    configurar(banco)
+    application = import_module(f'setup.{servidor}').application
+    from django.contrib.auth.models import User
+    from escola.authentication import gerar_token
+
+    autorizacao = f'Token {gerar_token(User.objects.get(username="exportacao"))}'
+    requisicao = requisicao_asgi if servidor == 'asgi' else requisicao_wsgi
+    rss_antes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    medidas = {'bytes': 0, 'quebras': 0, 'primeiro': None}
+
+    def receber(bloco):
+        if medidas['primeiro'] is None and bloco:
+            medidas['primeiro'] = time.perf_counter()
+        medidas['bytes'] += len(bloco)
+        medidas['quebras'] += bloco.count(b'\n')
+
+    inicio = time.perf_counter()
+    assert requisicao(application, rota, formato, autorizacao, receber)
+    fim = time.perf_counter()
+
+    print(json.dumps({
+        'linhas': medidas['quebras'] - (formato == 'csv'),
+        'ttfb': (medidas['primeiro'] - inicio) * 1000,
+        'total': fim - inicio,
+        'mb': medidas['bytes'] / 1024 / 1024,
+        'rss_antes': rss_antes,
+        'rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark das exportações NDJSON/CSV')
+    parser.add_argument('--linhas', type=int, default=1_000_000, help='quantidade de estudantes da base')
+    parser.add_argument('--semente', type=int, default=1)
+    parser.add_argument('--recriar', action='store_true', help='gera a base novamente')
+    argumentos = parser.parse_args()
+
+    os.makedirs(DADOS, exist_ok=True)
+    banco = os.path.join(DADOS, f'exportacao-{argumentos.linhas}-{argumentos.semente}.sqlite3')
+    if argumentos.recriar or not os.path.exists(banco):
+        temporario = f'{banco}.tmp'
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, __file__, '--popular', temporario, str(argumentos.linhas), str(argumentos.semente)], check=True)
+        os.replace(temporario, banco)
+        print(f'base gerada em {time.perf_counter() - inicio:.0f}s: {banco}')
+
+    print(f'{"servidor":<9} {"rota":<12} {"formato":<8} {"linhas":>9} {"TTFB":>9} {"total":>8} {"linhas/s":>9} {"volume":>9} {"RSS antes":>10} {"RSS máx.":>10}')
+    for servidor, rota, formato in itertools.product(SERVIDORES, ROTAS, FORMATOS):
+        medida = json.loads(subprocess.run(
+            [sys.executable, __file__, '--exportar', banco, servidor, rota, formato], capture_output=True, text=True, check=True,
+        ).stdout)
+        print(
+            f'{servidor:<9} {rota:<12} {formato:<8} {medida["linhas"]:>9} {medida["ttfb"]:>6.1f} ms {medida["total"]:>6.1f} s '
+            f'{medida["linhas"] / medida["total"]:>9.0f} {medida["mb"]:>6.1f} MB {medida["rss_antes"]:>7.1f} MB {medida["rss"]:>7.1f} MB'
+        )
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--popular']:
+        popular(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+    elif sys.argv[1:2] == ['--exportar']:
+        exportar(sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5])
+    else:
+        main()
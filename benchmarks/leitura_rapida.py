@@ -0,0 +1,64 @@
+"""Benchmark da leitura rápida ("escola/leitura_rapida.py")
+
+Intenção :
+    Mede as linhas por segundo da leitura de uma página de estudantes e de matrículas de um curso, comparando os serializers do
+    Django Rest (instâncias dos models + campos do serializer) com a leitura rápida (".values()" + mapeamento pré-calculado).
+    Usa um banco SQLite em memória, criado e populado pelo próprio script.
+
+Uso :
+    python benchmarks/leitura_rapida.py [quantidade]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
+
+import django
+from django.conf import settings
+
+settings.DATABASES['default']['NAME'] = ':memory:'
+settings.DEBUG = False
+django.setup()
+
+from django.core.management import call_command
+from escola.models import Estudante, Curso, Matricula
+from escola.serializers import EstudanteSerializer, ListaMatriculasCursoSerializer
+from escola.leitura_rapida import serializar_rapido, colunas
+
+def medir(nome, funcao, quantidade, repeticoes=5):
+    melhor = min(_tempo(funcao) for _ in range(repeticoes))
+    print(f'{nome:<48} {quantidade / melhor:>12,.0f} linhas/s')
+
+def _tempo(funcao):
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    call_command('migrate', verbosity=0)
+    curso = Curso.objects.create(codigo='BEN', descricao='Curso de benchmark')
+    Estudante.objects.bulk_create(
+        Estudante(nome='Teste', email='teste@gmail.com', cpf=f'{i:011d}', data_nascimento='2000-01-01', celular='21970758285')
+        for i in range(quantidade)
+    )
+    Matricula.objects.bulk_create(
+        Matricula(estudante_id=estudante, curso=curso, periodo='N')
+        for estudante in Estudante.objects.values_list('id', flat=True)
+    )
+
+    estudantes = Estudante.objects.order_by('id')
+    matriculas = Matricula.objects.filter(curso=curso).select_related('curso').order_by('id')
+
+    medir('EstudanteSerializer', lambda: EstudanteSerializer(list(estudantes), many=True).data, quantidade)
+    medir('EstudanteSerializer (leitura rápida)',
+          lambda: serializar_rapido(EstudanteSerializer, estudantes.values(*colunas(EstudanteSerializer))), quantidade)
+    medir('ListaMatriculasCursoSerializer', lambda: ListaMatriculasCursoSerializer(list(matriculas), many=True).data, quantidade)
+    medir('ListaMatriculasCursoSerializer (leitura rápida)',
+          lambda: serializar_rapido(ListaMatriculasCursoSerializer, matriculas.values(*colunas(ListaMatriculasCursoSerializer))), quantidade)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark do início dos processos ("SOMENTE_API", ver "setup/settings.py" e "escola/carregamento.py")
+
+Intenção :
+    Mede, em um processo novo a cada vez, o tempo para importar a aplicação WSGI ("setup/wsgi.py"), o tempo até a primeira resposta
+    ("GET cursos/", com as rotas e a API já carregadas), a memória máxima (RSS) e a quantidade de módulos importados. Compara o processo
+    completo com o processo "SOMENTE_API=1" (sem o admin e com o drf_yasg carregado apenas na primeira requisição da documentação),
+    pela mediana de várias execuções. Mostra também os pacotes mais caros de importar em cada modo ("python -X importtime", tempo
+    próprio de cada módulo somado pelo pacote raiz). Usa um banco SQLite criado pelo próprio script.
+
+Uso :
+    python benchmarks/partida.py [execuções por modo]
+"""
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODOS = {
+    'completo': {'SOMENTE_API': '0'},
+    'somente API': {'SOMENTE_API': '1'},
+}
+OBSERVADOS = ['drf_yasg', 'pkg_resources', 'escola.admin', 'django.contrib.auth.admin', 'django_filters']
+# o pacote "django.contrib.admin" é importado pelo próprio Django Rest ("rest_framework.schemas" usa o "admindocs"); sem o app
+# instalado não há o "autodiscover" dos "admin.py" nem a rota "admin/"
+
+def preparar():
+    sys.path.insert(0, RAIZ)
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'benchmarks.settings_carga'
+    import django
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+    call_command('loaddata', 'prototipo_banco.json', verbosity=0)
+
+def partida():
+# executado em um processo novo: importa a aplicação, responde a primeira requisição e imprime as medidas em JSON
+
+    import resource
+    from io import BytesIO
+
+    inicio = time.perf_counter()
+    sys.path.insert(0, RAIZ)
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'benchmarks.settings_carga'
+    from setup.wsgi import application
+    importada = time.perf_counter()
+
+    ambiente = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': '/cursos/', 'QUERY_STRING': '', 'SERVER_NAME': 'localhost', 'SERVER_PORT': '80',
+        'HTTP_HOST': 'localhost', 'wsgi.input': BytesIO(), 'wsgi.url_scheme': 'http',
+    }
+    situacao = []
+    b''.join(application(ambiente, lambda status, cabecalhos: situacao.append(status)))
+    respondida = time.perf_counter()
+    assert situacao == ['200 OK'], situacao
+
+    print(json.dumps({
+        'wsgi': (importada - inicio) * 1000,
+        'primeira': (respondida - inicio) * 1000,
+        'rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'modulos': len(sys.modules),
+        'observados': [modulo for modulo in OBSERVADOS if modulo in sys.modules],
+    }))
+
+def importacoes(ambiente):
+# tempo próprio de importação (ms) somado pelo pacote raiz, do "python -X importtime" de uma partida
+
+    saida = subprocess.run(
+        [sys.executable, '-X', 'importtime', __file__, '--partida'], env=ambiente, capture_output=True, text=True, check=True,
+    ).stderr
+    pacotes = Counter()
+    for linha in saida.splitlines():
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        proprio, _, nome = linha[len('import time:'):].split('|')
+        pacotes[nome.strip().split('.')[0]] += int(proprio) / 1000
+    return pacotes
+
+def main():
+    execucoes = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    pasta = tempfile.mkdtemp()
+    try:
+        banco = os.path.join(pasta, 'partida.sqlite3')
+        subprocess.run([sys.executable, __file__, '--preparar'], env={**os.environ, 'BENCHMARK_BANCO': banco}, check=True)
+        print(f'{execucoes} execuções por modo (mediana)')
+        print(f'{"modo":<12} {"import WSGI":>12} {"1ª resposta":>12} {"RSS":>9} {"módulos":>8}   carregados')
+        pacotes = {}
+        for modo, variaveis in MODOS.items():
+            ambiente = {**os.environ, **variaveis, 'BENCHMARK_BANCO': banco}
+            medidas = [
+                json.loads(subprocess.run([sys.executable, __file__, '--partida'], env=ambiente, capture_output=True, text=True, check=True).stdout)
+                for _ in range(execucoes)
+            ]
+            mediana = {chave: statistics.median(medida[chave] for medida in medidas) for chave in ('wsgi', 'primeira', 'rss', 'modulos')}
+            print(
+                f'{modo:<12} {mediana["wsgi"]:>9.0f} ms {mediana["primeira"]:>9.0f} ms {mediana["rss"]:>6.1f} MB {mediana["modulos"]:>8.0f}'
+                f'   {", ".join(medidas[0]["observados"])}'
+            )
+            pacotes[modo] = importacoes(ambiente)
+
+        print('\nimportação por pacote (ms, -X importtime)')
+        nomes = [nome for nome, _ in (pacotes['completo'] + pacotes['somente API']).most_common(10)]
+        print(f'{"pacote":<16}' + ''.join(f'{modo:>14}' for modo in MODOS))
+        for nome in nomes:
+            print(f'{nome:<16}' + ''.join(f'{pacotes[modo][nome]:>14.1f}' for modo in MODOS))
+    finally:
+        shutil.rmtree(pasta)
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--preparar']:
+        preparar()
+    elif sys.argv[1:2] == ['--partida']:
+        partida()
+    else:
+        main()
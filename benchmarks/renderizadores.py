@@ -0,0 +1,67 @@
+"""Benchmark dos renderers ("escola/renderers.py")
+
+Intenção :
+    Para cada rota de leitura, busca uma vez os dados da resposta (página de 20 itens) e mede quantas vezes por segundo eles são
+    renderizados pelo "JSONRenderer" do Django Rest, pelo "JSONRapidoRenderer" (orjson) e pelo "MessagePackRenderer", além do
+    tamanho em bytes de cada formato. Usa um banco SQLite em memória, criado e populado pelo próprio script.
+
+Uso :
+    python benchmarks/renderizadores.py [repeticoes]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
+
+import django
+from django.conf import settings
+
+settings.DATABASES['default']['NAME'] = ':memory:'
+settings.DEBUG = False
+settings.ALLOWED_HOSTS = ['testserver']
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from escola.models import Estudante, Curso, Matricula
+from escola.renderers import JSONRapidoRenderer, MessagePackRenderer, orjson, msgpack
+
+ROTAS = [
+    '/estudantes/', '/estudantes/?version=v2', '/estudantes/1/', '/cursos/', '/matriculas/',
+    '/estudantes/1/matriculas/', '/cursos/1/matriculas/',
+]
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    call_command('migrate', verbosity=0)
+    cursos = Curso.objects.bulk_create(Curso(codigo=f'C{i:03d}', descricao=f'Curso de programação {i}') for i in range(30))
+    estudantes = Estudante.objects.bulk_create(
+        Estudante(nome='João', email='joao@gmail.com', cpf=f'{i:011d}', data_nascimento='2000-01-01', celular='21970758285')
+        for i in range(100)
+    )
+    Matricula.objects.bulk_create(Matricula(estudante=estudantes[i % 2], curso=cursos[i % 2]) for i in range(100))
+
+    cliente = APIClient()
+    cliente.force_authenticate(User.objects.create_superuser('benchmark', password='benchmark'))
+    renderers = [('JSONRenderer', JSONRenderer())]
+    if orjson is not None:
+        renderers.append(('JSONRapidoRenderer', JSONRapidoRenderer()))
+    if msgpack is not None:
+        renderers.append(('MessagePackRenderer', MessagePackRenderer()))
+
+    print(f'{"rota":<28}' + ''.join(f'{nome:>24}' for nome, _ in renderers))
+    for rota in ROTAS:
+        dados = cliente.get(rota).data
+        colunas = []
+        for _, renderer in renderers:
+            tempo = min(timeit.repeat(lambda: renderer.render(dados), number=repeticoes, repeat=3))
+            colunas.append(f'{repeticoes / tempo:>12,.0f}/s {len(renderer.render(dados)):>6} B')
+        print(f'{rota:<28}' + ''.join(f'{coluna:>24}' for coluna in colunas))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""Benchmark das réplicas de leitura ("escola/replicas.py")
+
+Intenção :
+    Carga de leitura pesada pela API, com várias threads sobre o mesmo processo:
+      - leitores (usuário "leitor"): GET "estudantes/?page=N", "estudantes/<pk>/" e "cursos/<pk>/matriculas/";
+      - um escritor (usuário "massoto", fixado no banco principal depois de cada escrita): POST "matriculas/".
+    Compara 0, 1 e 2 réplicas ("BANCO_REPLICAS"), sincronizadas por uma thread a cada "REPLICAS_INTERVALO" segundos
+    ("sincronizar_replicas"), com o perfil padrão do banco e com o perfil de produção ("BANCO_PERFIL=producao"). Cada combinação roda
+    em um processo separado, com um banco criado pelo próprio script (cache de respostas desativado).
+    Obs: as réplicas são arquivos SQLite na mesma máquina; o ganho vem de os leitores não disputarem os bloqueios do arquivo
+    principal com o escritor, não de mais CPU. Com réplicas de verdade (outros servidores) a leitura também escala com o hardware.
+
+Uso :
+    python benchmarks/replicas.py [threads] [segundos]
+"""
+
+import logging
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ESTUDANTES = 2000
+INTERVALO = 1
+
+def configurar():
+    sys.path.insert(0, RAIZ)
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'benchmarks.settings_carga'
+    import django
+    from django.conf import settings
+    django.setup()
+    settings.ALLOWED_HOSTS = ['*']
+    settings.REPLICAS_INTERVALO = INTERVALO
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+
+def preparar():
+    configurar()
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from escola.models import Estudante
+    from escola.replicas import sincronizar_replicas
+    call_command('migrate', verbosity=0)
+    call_command('loaddata', 'prototipo_banco.json', verbosity=0)
+    Estudante.objects.bulk_create(
+        Estudante(nome=f'Carga {i}', email='carga@gmail.com', cpf=f'{i:011d}', data_nascimento='2000-01-01', celular='21970758285')
+        for i in range(ESTUDANTES)
+    )
+    User.objects.create_superuser('leitor', 'leitor@gmail.com', 'leitor')
+    sincronizar_replicas()
+
+def leitura(cliente, sorteio, estudantes, cursos):
+    tipo = sorteio.random()
+    if tipo < 0.5:
+        return cliente.get(f'/estudantes/?page={sorteio.randint(1, len(estudantes) // 20)}')
+    if tipo < 0.8:
+        return cliente.get(f'/estudantes/{sorteio.choice(estudantes)}/')
+    return cliente.get(f'/cursos/{sorteio.choice(cursos)}/matriculas/')
+
+def carga(threads, segundos):
+    configurar()
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from rest_framework.test import APIClient
+    from escola.models import Curso, Estudante
+    from escola.replicas import sincronizar_replicas
+
+    leitor = User.objects.get(username='leitor')
+    escritor = User.objects.get(username='massoto')
+    estudantes = list(Estudante.objects.values_list('id', flat=True))
+    cursos = list(Curso.objects.values_list('id', flat=True))
+    latencias = defaultdict(list)
+    erros = defaultdict(int)
+    fim = time.monotonic() + segundos
+
+    def medir(tipo, requisicao):
+        antes = time.monotonic()
+        response = requisicao()
+        if response.status_code >= 500:
+            erros[tipo] += 1
+        else:
+            latencias[tipo].append(time.monotonic() - antes)
+
+    def ler(semente):
+        cliente = APIClient(raise_request_exception=False)
+        cliente.force_authenticate(user=leitor)
+        sorteio = random.Random(semente)
+        while time.monotonic() < fim:
+            medir('leitura', lambda: leitura(cliente, sorteio, estudantes, cursos))
+        connection.close()
+
+    def escrever():
+        cliente = APIClient(raise_request_exception=False)
+        cliente.force_authenticate(user=escritor)
+        sorteio = random.Random(-1)
+        while time.monotonic() < fim:
+            dados = {'estudante': sorteio.choice(estudantes), 'curso': sorteio.choice(cursos), 'periodo': 'M'}
+            medir('escrita', lambda: cliente.post('/matriculas/', dados, format='json'))
+        connection.close()
+
+    def sincronizar():
+        while time.monotonic() < fim:
+            time.sleep(INTERVALO)
+            sincronizar_replicas()
+        connection.close()
+
+    trabalhadores = [threading.Thread(target=ler, args=(semente,)) for semente in range(threads - 1)]
+    trabalhadores += [threading.Thread(target=escrever), threading.Thread(target=sincronizar)]
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+
+    partes = []
+    for tipo in ('leitura', 'escrita'):
+        valores = sorted(latencias[tipo])
+        p95 = valores[int(len(valores) * 0.95)] * 1000 if valores else float('nan')
+        partes.append(f'{tipo} {len(valores) / segundos:>5.0f}/s p95 {p95:>6.1f} ms ({erros[tipo]} erros)')
+    print(f'{os.environ["BANCO_PERFIL"]:<16} {os.environ["BANCO_REPLICAS"]:>8}   {"   ".join(partes)}')
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    segundos = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    pasta = tempfile.mkdtemp()
+    try:
+        print(f'{threads - 1} leitores + 1 escritor, {segundos}s por medição, réplicas sincronizadas a cada {INTERVALO}s')
+        print(f'{"perfil":<16} {"réplicas":>8}')
+        for perfil in ('desenvolvimento', 'producao'):
+            for quantidade in (0, 1, 2):
+                banco = os.path.join(pasta, f'{perfil}_{quantidade}.sqlite3')
+                ambiente = {**os.environ, 'BANCO_PERFIL': perfil, 'BANCO_REPLICAS': str(quantidade), 'BENCHMARK_BANCO': banco}
+                subprocess.run([sys.executable, __file__, '--preparar'], env=ambiente, check=True)
+                subprocess.run([sys.executable, __file__, '--carga', str(threads), str(segundos)], env=ambiente, check=True)
+    finally:
+        shutil.rmtree(pasta)
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--preparar']:
+        preparar()
+    elif sys.argv[1:2] == ['--carga']:
+        carga(int(sys.argv[2]), int(sys.argv[3]))
+    else:
+        main()
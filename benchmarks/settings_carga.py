@@ -0,0 +1,24 @@
+"""Settings dos benchmarks de carga
+
+Intenção :
+    Mesmo settings do projeto ("setup/settings.py"), com o banco em um arquivo temporário, sem DEBUG e com os limites do throttle
+    altos o suficiente para não interferirem na medição. Usado pelos servidores iniciados pelos benchmarks.
+
+Variáveis de ambiente :
+    BENCHMARK_BANCO : caminho do arquivo SQLite. As réplicas ("BANCO_REPLICAS") ficam ao lado, em "<arquivo>.replica_N".
+    BENCHMARK_CACHE : "1" mantém o cache de respostas; "0" (padrão) desativa, para toda requisição consultar o banco.
+"""
+
+import os
+
+from setup.settings import *  # noqa: F401,F403
+from setup.settings import DATABASES, REST_FRAMEWORK
+
+DEBUG = False
+ALLOWED_HOSTS = ['*']
+DATABASES['default']['NAME'] = os.environ['BENCHMARK_BANCO']
+for alias in DATABASES:
+    if alias != 'default':
+        DATABASES[alias]['NAME'] = f"{os.environ['BENCHMARK_BANCO']}.{alias}"
+REST_FRAMEWORK = {**REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {'anon': '1000000000/day', 'user': '1000000000/day'}}
+CACHE_RESPOSTAS_TIMEOUT = 60 * 60 if os.environ.get('BENCHMARK_CACHE') == '1' else 0
@@ -0,0 +1,70 @@
+"""Benchmark dos throttles ("escola/throttles.py")
+
+Intenção :
+    Compara o "AnonRateThrottle" do Django Rest (lista com o horário de cada requisição por chave) com o "AnonJanelaThrottle"
+    (contador de janela deslizante de tamanho fixo) para 10 mil chaves (IPs), medindo o tempo de cada verificação e o tamanho
+    guardado no cache por chave, com históricos de tamanhos diferentes. Usa o cache em memória do Django ("LocMemCache").
+
+Uso :
+    python benchmarks/throttles.py [chaves]
+"""
+
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
+
+import django
+from django.conf import settings
+
+settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'OPTIONS': {'MAX_ENTRIES': 10**6}}}
+django.setup()
+
+from django.core.cache import cache
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import AnonRateThrottle
+from escola.throttles import AnonJanelaThrottle
+
+def preencher(throttle, chave, historico):
+# grava direto no cache o estado de uma chave que já fez "historico" requisições na última hora
+
+    agora = time.time()
+    if isinstance(throttle, AnonJanelaThrottle):
+        cache.set(chave, (agora - agora % throttle.duration, historico, 0), 7200)
+    else:
+        cache.set(chave, [agora - indice * 3600 / (historico * 2) for indice in range(historico)], 3600)
+
+def medir(classe, requests, historico, repeticoes=3):
+    classe = type(classe.__name__, (classe,), {'rate': f'{historico * 2}/hour'})
+    melhor = None
+    for _ in range(repeticoes):
+        cache.clear()
+        for request in requests:
+            throttle = classe()
+            preencher(throttle, throttle.get_cache_key(request, None), historico)
+        inicio = time.perf_counter()
+        for request in requests:
+            classe().allow_request(request, None)
+        decorrido = time.perf_counter() - inicio
+        melhor = decorrido if melhor is None else min(melhor, decorrido)
+    throttle = classe()
+    tamanho = len(pickle.dumps(cache.get(throttle.get_cache_key(requests[0], None))))
+    return melhor / len(requests) * 1e6, tamanho
+
+def main():
+    chaves = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    fabrica = APIRequestFactory()
+    requests = [Request(fabrica.get('/', REMOTE_ADDR=f'10.{i // 65536}.{i // 256 % 256}.{i % 256}')) for i in range(chaves)]
+    print(f'{chaves:,} chaves, taxa = 2x o histórico por hora')
+    print(f'{"histórico":>10}{"AnonRateThrottle":>28}{"AnonJanelaThrottle":>28}')
+    for historico in (1, 10, 100, 1000, 10000):
+        lento, tamanho_lento = medir(AnonRateThrottle, requests, historico)
+        rapido, tamanho_rapido = medir(AnonJanelaThrottle, requests, historico)
+        print(f'{historico:>10}{lento:>14.1f} µs {tamanho_lento:>7} B{rapido:>14.1f} µs {tamanho_rapido:>7} B')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Microbenchmark dos validadores de "escola/validators.py"
+
+Intenção :
+    Compara o custo por item das versões anteriores dos validadores (uma instância do "validate_docbr" por chamada e o "re.findall"
+    recompilando o padrão) com as versões atuais, de um item e em lote.
+
+Uso :
+    python benchmarks/validadores.py [quantidade]
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from validate_docbr import CPF
+from escola.validators import cpf_invalido, celular_invalido, cpfs_invalidos, celulares_invalidos
+
+def cpf_invalido_anterior(numero_cpf):
+    cpf = CPF()
+    return not cpf.validate(numero_cpf)
+
+def celular_invalido_anterior(celular):
+    return not re.findall('[1-9]{2}[9]{1}[0-9]{8}', celular)
+
+def medir(nome, funcao, quantidade):
+    tempo = min(timeit.repeat(funcao, number=1, repeat=5))
+    print(f'{nome:<32} {tempo / quantidade * 1e9:>10.0f} ns/item')
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    gerador = CPF()
+    cpfs = [gerador.generate() for _ in range(quantidade)]
+    celulares = ['21970758285'] * quantidade
+
+    medir('cpf_invalido (anterior)', lambda: [cpf_invalido_anterior(cpf) for cpf in cpfs], quantidade)
+    medir('cpf_invalido', lambda: [cpf_invalido(cpf) for cpf in cpfs], quantidade)
+    medir('cpfs_invalidos (lote)', lambda: cpfs_invalidos(cpfs), quantidade)
+    medir('celular_invalido (anterior)', lambda: [celular_invalido_anterior(c) for c in celulares], quantidade)
+    medir('celular_invalido', lambda: [celular_invalido(c) for c in celulares], quantidade)
+    medir('celulares_invalidos (lote)', lambda: celulares_invalidos(celulares), quantidade)
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,8 @@
 from django.contrib import admin
+from django.db import connections
+from django.utils.text import smart_split, unescape_string_literal
 from escola.models import Estudante,Curso, Matricula
+from escola.busca import filtrar_busca
 
 
 class Estudantes(admin.ModelAdmin):
@@ -18,14 +21,27 @@ class Estudantes(admin.ModelAdmin):
             list_display_links : nomeação padrão que especifica os campos que vão conter links responsáveis por carregar o link de acesso ao objeto
             list_per_page : " " " " o número de objetos por página dentro do Admin
             search_fields : " " " " os campos pesquisáveis, ou seja, aqueles que poderão ser encontrados a partir de uma busca no Admin
-            ordering  : " " " " os campos que eu poderei ordenar, seja de forma crescente ou descrescente.
+            ordering  : " " " " os campos que eu poderei ordenar, seja de forma crescente ou descrescente. O "id" de desempate usa o
+            mesmo índice (nome, id) do model, sem o "-pk" que o admin acrescentaria.
+            get_search_results : a busca do admin usa a mesma tabela FTS5 da API ("escola/busca.py"), ao invés do "icontains".
     """  
     
     list_display = ('id','nome','email','cpf','data_nascimento','celular')
     list_display_links = ('id','nome',)
     list_per_page = 20
     search_fields = ('nome','cpf',)
-    ordering = ('nome',)
+    ordering = ('nome','id',)
+
+    def get_search_results(self, request, queryset, search_term):
+        if connections[queryset.db].vendor != 'sqlite':
+            return super().get_search_results(request, queryset, search_term)
+        termos = [
+            unescape_string_literal(termo) if termo.startswith(('"', "'")) and termo[0] == termo[-1] else termo
+            for termo in smart_split(search_term)
+        ]
+        if not termos:
+            return queryset, False
+        return filtrar_busca(queryset, termos, self.search_fields), False
 
 admin.site.register(Estudante,Estudantes)
 # Função de registrar os dados recebidos pelo models na respectiva lista do admin.
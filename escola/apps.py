@@ -1,6 +1,26 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def recriar_triggers(sender, using, **kwargs):
+# garante a tabela de busca e os seus triggers depois de cada "migrate" (ver "escola/busca.py"), assim como os triggers da tabela
+# de estatísticas das matrículas (ver "escola/estatisticas.py") e das exclusões (ver "escola/cache.py"), já que o SQLite apaga os
+# triggers de uma tabela quando uma migração a recria
+
+    from django.db import connections
+    from escola.busca import instalar_busca
+    from escola.cache import instalar_exclusoes
+    from escola.estatisticas import instalar_estatisticas
+    instalar_busca(connections[using])
+    instalar_estatisticas(connections[using])
+    instalar_exclusoes(connections[using])
 
 
 class EscolaConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'escola'
+
+    def ready(self):
+        # registra os receivers de "escola/signals.py" e a verificação do banco de "escola/estatisticas.py"
+        from escola import signals, estatisticas
+        post_migrate.connect(recriar_triggers, sender=self)
@@ -0,0 +1,221 @@
+from asyncio import iscoroutinefunction
+from functools import update_wrapper
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponse
+from django.urls import URLPattern, URLResolver
+from rest_framework import exceptions, generics
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+from escola.cache import CacheRespostaMixin, RequisicaoCondicionalMixin
+from escola.leitura_rapida import LeituraRapidaMixin, colunas, serializar_rapido
+
+
+class LeituraAssincronaMixin:
+    """Classe LeituraAssincronaMixin
+
+    Intenção :
+    Leitura assíncrona (GET de listagem e de detalhe) para o servidor ASGI. A requisição é atendida direto no loop de eventos, com o
+    ORM assíncrono do Django ("acount", "aiterator", "aget", "aaggregate"), ao invés de ocupar uma thread do "sync_to_async" do início
+    ao fim. Autenticação, permissões, throttle, negociação de conteúdo, versão, paginação, cache de respostas, ETag e leitura rápida
+    seguem as mesmas regras das views síncronas, reaproveitando os mesmos métodos.
+
+    Argumentos :
+    Deve vir antes dos mixins de cache na herança, ex: "class CursoViewSet(LeituraAssincronaMixin, RequisicaoCondicionalMixin, ...)". Só é usado
+    pelas rotas montadas com "rotas_assincronas"; com as rotas normais a view é a mesma de antes.
+
+    Atributos :
+    "acao_assincrona" : "list" ou "retrieve" quando a requisição pode seguir pelo caminho assíncrono, ou None. Ficam no caminho
+    síncrono os outros métodos e ações, a paginação por cursor, a API navegável e os autenticadores sem "aautenticar"
+    (ex: o "force_authenticate" dos testes).
+    "despachar" : equivalente ao "dispatch" do Django Rest. A resposta já sai renderizada, para o Django não abrir outra thread
+    apenas para chamar o "render".
+    "alist" e "aretrieve" : equivalentes assíncronos do "list" e do "retrieve" com os mixins de "escola/cache.py" e de
+    "escola/leitura_rapida.py".
+    Obs: no Django 5.0 cada consulta do ORM assíncrono (e os signals de início e fim da requisição do "ASGIHandler") ainda é
+    executada na thread da requisição; a diferença é que as demais etapas (e os acertos do cache, que não consultam o banco) ficam
+    no loop de eventos, junto com os middlewares de "escola/middlewares.py".
+    """
+
+    def acao_assincrona(self, request):
+        if request.method != 'GET':
+            return None
+        acao = self.action if hasattr(self, 'action_map') else 'list' if isinstance(self, generics.ListAPIView) else None
+        if acao not in ('list', 'retrieve'):
+            return None
+        if not all(hasattr(autenticador, 'aautenticar') for autenticador in request.authenticators):
+            return None
+        paginador = self.paginator
+        if paginador is not None and not (hasattr(paginador, 'suporta_assincrono') and paginador.suporta_assincrono(request)):
+            return None
+        try:
+            self.format_kwarg = self.get_format_suffix(**self.kwargs)
+            renderer, _ = self.perform_content_negotiation(request)
+        except exceptions.APIException:
+            return None
+        if isinstance(renderer, BrowsableAPIRenderer):
+            return None
+        return acao
+
+    async def autenticar(self, request):
+    # mesmo laço do "Request._authenticate" do Django Rest, com o "aautenticar" de cada autenticador
+
+        for autenticador in request.authenticators:
+            try:
+                resultado = await autenticador.aautenticar(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+            if resultado is not None:
+                request._authenticator = autenticador
+                request.user, request.auth = resultado
+                if request.user.is_active and not request.user.is_superuser:
+                    # as permissões ficam no cache do próprio usuário, usadas pela chave do cache de respostas e pelo ETag
+                    await sync_to_async(request.user.get_all_permissions)()
+                return
+        request._not_authenticated()
+
+    async def despachar(self, request, acao, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.autenticar(request)
+            self.initial(request, *args, **kwargs)
+            handler = self.alist if acao == 'list' else self.aretrieve
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        if not isinstance(self.response, Response):
+            return self.response
+        self.response.render()
+        return HttpResponse(self.response.content, status=self.response.status_code, headers=dict(self.response.items()))
+
+    async def avalidadores(self, request, queryset):
+    # mesmo cálculo do "RequisicaoCondicionalMixin.validadores", com a consulta de agregação assíncrona
+
+        chave, validadores = self.validadores_em_cache(request)
+        if validadores is None:
+            resultado = await queryset.order_by().aaggregate(**self.agregados_validadores())
+            validadores = self.montar_validadores(request, chave, resultado)
+        return validadores
+
+    async def responder(self, request, queryset, gerar_resposta, detalhe=False):
+    # aplica, na mesma ordem das views síncronas, o "RequisicaoCondicionalMixin" e o "CacheRespostaMixin" quando a view os usa
+
+        validadores = None
+        if isinstance(self, RequisicaoCondicionalMixin):
+            validadores = await self.avalidadores(request, queryset)
+            response = self.resposta_nao_modificada(request, validadores, detalhe)
+            if response is not None:
+                return response
+
+        if isinstance(self, CacheRespostaMixin):
+            chave, response = self.resposta_em_cache(request)
+            if response is None:
+                response = self.guardar_resposta(chave, await gerar_resposta())
+        else:
+            response = await gerar_resposta()
+
+        if validadores is not None:
+            response = self.incluir_validadores(response, validadores)
+        return response
+
+    def leitura_rapida(self):
+        return isinstance(self, LeituraRapidaMixin) and self.leitura_rapida_ativa()
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        async def gerar_resposta():
+            serializer_class = self.get_serializer_class()
+            rapida = self.leitura_rapida()
+            consulta = queryset.values(*colunas(serializer_class)) if rapida else queryset
+            pagina = None if self.paginator is None else await self.paginator.apaginate_queryset(consulta, request, view=self)
+            linhas = pagina if pagina is not None else [linha async for linha in consulta.aiterator()]
+            dados = serializar_rapido(serializer_class, linhas) if rapida else self.get_serializer(linhas, many=True).data
+            return self.get_paginated_response(dados) if pagina is not None else Response(dados)
+
+        return await self.responder(request, queryset, gerar_resposta)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+
+        async def gerar_resposta():
+            serializer_class = self.get_serializer_class()
+            if self.leitura_rapida():
+                linha = await queryset.values(*colunas(serializer_class)).afirst()
+                if linha is None:
+                    raise Http404
+                return Response(serializar_rapido(serializer_class, [linha])[0])
+            try:
+                instancia = await queryset.aget()
+            except queryset.model.DoesNotExist:
+                # mesma mensagem do "get_object_or_404"
+                raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+            self.check_object_permissions(request, instancia)
+            return Response(self.get_serializer(instancia).data)
+
+        return await self.responder(request, queryset, gerar_resposta, detalhe=True)
+
+
+def visao_hibrida(visao):
+    """Função visao_hibrida
+
+    Intenção :
+    Transforma a view gerada pelo "as_view" do Django Rest em uma view assíncrona. As leituras aceitas pelo "acao_assincrona" seguem
+    pelo "despachar"; as demais requisições chamam a view original através do "sync_to_async", exatamente como o Django faria.
+
+    Argumentos :
+    "visao" : função retornada pelo "as_view", que guarda a classe ("cls"), os argumentos ("initkwargs") e, nas viewsets, o mapa de
+    métodos para ações ("actions").
+
+    Return :
+    A view assíncrona, com os mesmos atributos da original (usados pelo "csrf_exempt" e pela documentação).
+    """
+
+    cls = visao.cls
+    acoes = getattr(visao, 'actions', None)
+    sincrona = sync_to_async(visao)
+
+    async def view(request, *args, **kwargs):
+        self = cls(**visao.initkwargs)
+        if acoes:
+            # mesmo preparo da view criada pelo "ViewSetMixin.as_view"
+            self.action_map = {'head': acoes['get'], **acoes} if 'get' in acoes else dict(acoes)
+            for metodo, acao in self.action_map.items():
+                setattr(self, metodo, getattr(self, acao))
+        self.request = request
+        self.args = args
+        self.kwargs = kwargs
+
+        drf_request = self.initialize_request(request, *args, **kwargs)
+        acao = self.acao_assincrona(drf_request)
+        if acao is None:
+            return await sincrona(request, *args, **kwargs)
+        return await self.despachar(drf_request, acao, *args, **kwargs)
+
+    return update_wrapper(view, visao)
+
+def rotas_assincronas(urlpatterns):
+# retorna uma cópia das rotas trocando as views que usam o "LeituraAssincronaMixin" pela "visao_hibrida" (uma única vez). As rotas
+# originais não são alteradas, já que as listas do router são compartilhadas
+
+    rotas = []
+    for rota in urlpatterns:
+        if isinstance(rota, URLResolver):
+            internas = rotas_assincronas(rota.url_patterns)
+            if any(nova is not antiga for nova, antiga in zip(internas, rota.url_patterns)):
+                rota = URLResolver(rota.pattern, internas, rota.default_kwargs, rota.app_name, rota.namespace)
+        elif issubclass(getattr(rota.callback, 'cls', object), LeituraAssincronaMixin) and not iscoroutinefunction(rota.callback):
+            rota = URLPattern(rota.pattern, visao_hibrida(rota.callback), rota.default_args, rota.name)
+        rotas.append(rota)
+    return rotas
@@ -0,0 +1,191 @@
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth import aauthenticate, get_user_model
+from django.core import signing
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, BasicAuthentication, get_authorization_header
+
+SAL_TOKEN = 'escola.authentication.token'
+
+CREDENCIAIS_VALIDADAS = OrderedDict()
+# resumo do usuário e senha -> (pk, hash da senha) das credenciais Basic já conferidas com o PBKDF2, da mais antiga para a mais recente
+_trava_credenciais = threading.Lock()
+
+def chave_credenciais(userid, password):
+# resumo (HMAC com a SECRET_KEY) do usuário e da senha, para que a senha em texto não fique guardada na memória
+
+    return salted_hmac('escola.authentication.credenciais', f'{userid}\0{password}', algorithm='sha256').hexdigest()
+
+def credencial_em_cache(chave):
+    with _trava_credenciais:
+        validada = CREDENCIAIS_VALIDADAS.get(chave)
+        if validada is not None:
+            CREDENCIAIS_VALIDADAS.move_to_end(chave)
+        return validada
+
+def guardar_credencial(chave, user):
+# guarda a credencial conferida, descartando as usadas há mais tempo acima de "CREDENCIAIS_CACHE_TAMANHO" (0 desativa o cache)
+
+    with _trava_credenciais:
+        CREDENCIAIS_VALIDADAS[chave] = (user.pk, user.password)
+        CREDENCIAIS_VALIDADAS.move_to_end(chave)
+        while len(CREDENCIAIS_VALIDADAS) > settings.CREDENCIAIS_CACHE_TAMANHO:
+            CREDENCIAIS_VALIDADAS.popitem(last=False)
+
+def esquecer_credencial(chave):
+    with _trava_credenciais:
+        CREDENCIAIS_VALIDADAS.pop(chave, None)
+
+def limpar_credenciais():
+    with _trava_credenciais:
+        CREDENCIAIS_VALIDADAS.clear()
+
+def credencial_vigente(user, userid, password_hash):
+# o usuário da credencial guardada ainda existe, com o mesmo nome, a mesma senha (o hash muda a cada troca de senha) e ativo
+
+    return (
+        user is not None
+        and getattr(user, user.USERNAME_FIELD) == userid
+        and constant_time_compare(user.password, password_hash)
+        and user.is_active
+    )
+
+def gerar_token(user):
+# token assinado com a SECRET_KEY, com o id do usuário e o "get_session_auth_hash" (HMAC do hash da senha), o mesmo valor usado
+# pelo Django para encerrar as sessões depois de uma troca de senha
+
+    return signing.dumps({'id': user.pk, 'sessao': user.get_session_auth_hash()}, salt=SAL_TOKEN)
+
+
+class _CredenciaisBasic(BasicAuthentication):
+    # reaproveita a leitura do cabeçalho "Authorization" do Django Rest, retornando apenas o usuário e a senha sem consultar o banco
+
+    def authenticate_credentials(self, userid, password, request=None):
+        return userid, password
+
+
+class BasicAssincronaAuthentication(BasicAuthentication):
+    """Classe BasicAssincronaAuthentication
+
+    Intenção :
+    A mesma autenticação HTTP Basic do Django Rest, com uma versão assíncrona para a leitura assíncrona ("escola/assincrono.py").
+    A senha é conferida com o PBKDF2 (centenas de milhares de iterações, dezenas de milissegundos de CPU) apenas na primeira
+    requisição de cada usuário e senha; as seguintes usam o cache de credenciais do processo, com uma única consulta pela chave
+    primária do usuário. A credencial deixa de valer assim que a senha muda (o hash guardado é comparado com o do banco), o usuário é
+    desativado, renomeado ou apagado, e nesses casos a requisição volta para a verificação completa, com os mesmos erros de antes.
+
+    Argumentos :
+    "BasicAuthentication" : autenticação padrão do Django Rest por usuário e senha, configurada no "DEFAULT_AUTHENTICATION_CLASSES".
+
+    Atributos :
+    "authenticate_credentials" : caminho síncrono, com o cache de credenciais antes do "authenticate" do Django.
+    "aautenticar" : lê o cabeçalho da mesma forma (e com os mesmos erros) e valida as credenciais com o "aauthenticate" do Django.
+    Retorna (usuário, None) ou None quando a requisição não usa o HTTP Basic.
+    """
+
+    def authenticate_credentials(self, userid, password, request=None):
+        chave = chave_credenciais(userid, password)
+        validada = credencial_em_cache(chave)
+        if validada is not None:
+            pk, password_hash = validada
+            user = get_user_model()._default_manager.filter(pk=pk).first()
+            if credencial_vigente(user, userid, password_hash):
+                return (user, None)
+            esquecer_credencial(chave)
+
+        user, auth = super().authenticate_credentials(userid, password, request)
+        guardar_credencial(chave, user)
+        return (user, auth)
+
+    async def aautenticar(self, request):
+        credenciais = _CredenciaisBasic().authenticate(request)
+        if credenciais is None:
+            return None
+
+        userid, password = credenciais
+        chave = chave_credenciais(userid, password)
+        validada = credencial_em_cache(chave)
+        if validada is not None:
+            pk, password_hash = validada
+            user = await get_user_model()._default_manager.filter(pk=pk).afirst()
+            if credencial_vigente(user, userid, password_hash):
+                return (user, None)
+            esquecer_credencial(chave)
+
+        user = await aauthenticate(request=request, **{get_user_model().USERNAME_FIELD: userid, 'password': password})
+        if user is None:
+            raise exceptions.AuthenticationFailed(_('Invalid username/password.'))
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        guardar_credencial(chave, user)
+        return (user, None)
+
+
+class TokenAssinadoAuthentication(BaseAuthentication):
+    """Classe TokenAssinadoAuthentication
+
+    Intenção :
+    Autenticação pelo cabeçalho "Authorization: Token <token>", com o token da rota "token/" (ver "gerar_token"). O token é conferido
+    com um HMAC, sem o PBKDF2 e sem tabela de tokens: basta a consulta do usuário pela chave primária. Expira depois de
+    "TOKEN_VALIDADE" segundos, quando a senha do usuário muda ou quando ele é desativado.
+
+    Argumentos :
+    "BaseAuthentication" : classe base das autenticações do Django Rest.
+
+    Atributos :
+    "keyword" : palavra do cabeçalho "Authorization".
+    "authenticate" e "aautenticar" : retornam (usuário, token), ou None quando a requisição não usa o token.
+    "authenticate_header" : valor do "WWW-Authenticate" das respostas 401.
+    """
+
+    keyword = 'Token'
+
+    def token_do_cabecalho(self, request):
+    # mesmas validações do cabeçalho que o "TokenAuthentication" do Django Rest
+
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) == 1:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. No credentials provided.'))
+        if len(auth) > 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. Token string should not contain spaces.'))
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. Token string should not contain invalid characters.'))
+
+    def dados_do_token(self, token):
+        try:
+            return signing.loads(token, salt=SAL_TOKEN, max_age=settings.TOKEN_VALIDADE)
+        except signing.BadSignature:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+    def conferir_usuario(self, user, dados):
+        if user is None or not constant_time_compare(dados['sessao'], user.get_session_auth_hash()):
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return user
+
+    def authenticate(self, request):
+        token = self.token_do_cabecalho(request)
+        if token is None:
+            return None
+        dados = self.dados_do_token(token)
+        user = get_user_model()._default_manager.filter(pk=dados['id']).first()
+        return (self.conferir_usuario(user, dados), token)
+
+    async def aautenticar(self, request):
+        token = self.token_do_cabecalho(request)
+        if token is None:
+            return None
+        dados = self.dados_do_token(token)
+        user = await get_user_model()._default_manager.filter(pk=dados['id']).afirst()
+        return (self.conferir_usuario(user, dados), token)
+
+    def authenticate_header(self, request):
+        return self.keyword
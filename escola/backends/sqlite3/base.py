@@ -0,0 +1,50 @@
+from django.db.backends.sqlite3 import base
+
+PRAGMAS_PADRAO = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -64 * 1024,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+# "journal_mode=WAL" : leitores não bloqueiam o escritor (e vice-versa); "synchronous=NORMAL" : no WAL não perde a consistência,
+# apenas as últimas transações em caso de queda de energia; "busy_timeout" : milissegundos esperando o bloqueio de escrita antes do
+# "database is locked"; "cache_size" : negativo em KiB (64 MiB por conexão); "mmap_size" : bytes do arquivo lidos por "mmap";
+# "temp_store" : tabelas e índices temporários em memória
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Classe DatabaseWrapper
+
+    Intenção :
+    Perfil de produção do SQLite ("ENGINE": "escola.backends.sqlite3"). Aplica os PRAGMAs em cada conexão nova e abre as transações
+    ("atomic") com "BEGIN IMMEDIATE", que reserva a escrita logo no início. Com o "BEGIN" padrão (DEFERRED) uma transação que lê e
+    depois escreve, como a matrícula em lote, falha na hora com "database is locked" quando outra conexão escreveu nesse meio tempo,
+    sem respeitar o "busy_timeout".
+
+    Argumentos :
+    "base.DatabaseWrapper" : backend SQLite do Django. As opções abaixo ficam no "OPTIONS" do "DATABASES", junto das opções do
+    "sqlite3.connect".
+
+    Atributos :
+    "pragmas" : OPTIONS["pragmas"], atualiza o "PRAGMAS_PADRAO" (None retira um PRAGMA).
+    "transaction_mode" : OPTIONS["transaction_mode"], "IMMEDIATE" (padrão), "DEFERRED" ou "EXCLUSIVE".
+    """
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        pragmas = {**PRAGMAS_PADRAO, **kwargs.pop('pragmas', {})}
+        self.pragmas = {nome: valor for nome, valor in pragmas.items() if valor is not None}
+        self.transaction_mode = kwargs.pop('transaction_mode', 'IMMEDIATE').upper()
+        if self.transaction_mode not in ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE'):
+            raise ValueError(f'"transaction_mode" inválido: {self.transaction_mode}')
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for nome, valor in self.pragmas.items():
+            conn.execute(f'PRAGMA {nome} = {valor}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f'BEGIN {self.transaction_mode}')
@@ -0,0 +1,146 @@
+import operator
+import unicodedata
+from functools import reduce
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+from rest_framework.filters import search_smart_split
+
+TABELA_BUSCA = 'escola_estudante_busca'
+# tabela virtual FTS5 com uma cópia do "nome" (sem acentos) e do "cpf" de cada estudante, com o mesmo "id" como "rowid"
+
+ACENTOS = dict(zip(
+    'áàâãäéèêëíìîïóòôõöúùûüçñÁÀÂÃÄÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑ',
+    'aaaaaeeeeiiiiooooouuuucnAAAAAEEEEIIIIOOOOOUUUUCN',
+))
+TABELA_ACENTOS = str.maketrans(ACENTOS)
+
+TAMANHO_TRIGRAMA = 3
+# o tokenizador "trigram" só consegue usar o índice para termos de pelo menos 3 caracteres
+
+def sem_acentos(texto):
+# remove os acentos do português, da mesma forma que a expressão SQL usada nos triggers
+
+    return unicodedata.normalize('NFC', texto).translate(TABELA_ACENTOS)
+
+REPLACES_POR_NIVEL = 20
+# o analisador do SQLite não aceita muitas funções aninhadas, então os "replace" são divididos em subconsultas
+
+def expressao_sem_acentos(coluna):
+# versão SQL do "sem_acentos", com "replace" encadeados, para que os triggers não dependam de funções registradas pelo Python
+
+    expressao = f'SELECT {coluna} AS texto'
+    trocas = list(ACENTOS.items())
+    for inicio in range(0, len(trocas), REPLACES_POR_NIVEL):
+        texto = 'texto'
+        for acentuada, simples in trocas[inicio:inicio + REPLACES_POR_NIVEL]:
+            texto = f"replace({texto}, '{acentuada}', '{simples}')"
+        expressao = f'SELECT {texto} AS texto FROM ({expressao})'
+    return f'({expressao})'
+
+def comandos_instalacao():
+# SQL que cria a tabela de busca, os triggers de sincronização e copia os estudantes já existentes. Pode ser executado mais de
+# uma vez: a cópia só acontece quando a tabela acaba de ser criada
+
+    inserir = f"INSERT INTO {TABELA_BUSCA}(rowid, nome, cpf) VALUES (new.id, {expressao_sem_acentos('new.nome')}, new.cpf);"
+    apagar = f'DELETE FROM {TABELA_BUSCA} WHERE rowid = old.id;'
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {TABELA_BUSCA}_insert AFTER INSERT ON escola_estudante BEGIN {inserir} END",
+        f"CREATE TRIGGER IF NOT EXISTS {TABELA_BUSCA}_delete AFTER DELETE ON escola_estudante BEGIN {apagar} END",
+        f"CREATE TRIGGER IF NOT EXISTS {TABELA_BUSCA}_update AFTER UPDATE OF id, nome, cpf ON escola_estudante "
+        f"BEGIN {apagar} {inserir} END",
+    ]
+
+def instalar_busca(connection):
+    """Função instalar_busca
+
+    Intenção :
+    Cria (se ainda não existir) a tabela FTS5 "escola_estudante_busca" e os triggers que a mantém sincronizada com
+    "escola_estudante" em qualquer escrita, inclusive "bulk_create", "update" e o SQL executado fora do Django.
+    É chamada pela migração e também após cada "migrate" (ver "escola/apps.py").
+
+    Argumentos :
+    "connection" : conexão do Django. Em bancos que não são SQLite nada é feito, e a busca continua com o "SearchFilter".
+    """
+
+    if connection.vendor != 'sqlite':
+        return
+    tabelas = connection.introspection.table_names()
+    if 'escola_estudante' not in tabelas:
+        # ex: "migrate escola zero", sem a tabela de estudantes não há o que indexar
+        return
+    with connection.cursor() as cursor:
+        if TABELA_BUSCA not in tabelas:
+            cursor.execute(f"CREATE VIRTUAL TABLE {TABELA_BUSCA} USING fts5(nome, cpf, tokenize = 'trigram')")
+            cursor.execute(
+                f"INSERT INTO {TABELA_BUSCA}(rowid, nome, cpf) "
+                f"SELECT id, {expressao_sem_acentos('nome')}, cpf FROM escola_estudante"
+            )
+        for comando in comandos_instalacao():
+            cursor.execute(comando)
+
+def remover_busca(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for sufixo in ('insert', 'delete', 'update'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS {TABELA_BUSCA}_{sufixo}')
+        cursor.execute(f'DROP TABLE IF EXISTS {TABELA_BUSCA}')
+
+def filtrar_busca(queryset, termos, campos, tabela=TABELA_BUSCA):
+    """Função filtrar_busca
+
+    Intenção :
+    Aplica a busca indexada a um queryset de estudantes: cada termo precisa aparecer (como parte do texto) em algum dos campos.
+    Usada pelo "BuscaIndexadaFilter" da API e pela busca do admin.
+
+    Argumentos :
+    "termos" : termos já separados (ex: pelo "search_smart_split").
+    "campos" : colunas da tabela de busca consultadas, as mesmas do model.
+    "tabela" : tabela FTS5 usada.
+
+    Return :
+    O queryset filtrado, com a mesma ordenação.
+    """
+
+    # termos curtos: o trigrama não tem índice para eles, e percorrer a tabela de estudantes é mais rápido do que a de busca
+    curtos = [termo for termo in termos if len(termo) < TAMANHO_TRIGRAMA]
+    for termo in curtos:
+        queryset = queryset.filter(reduce(operator.or_, (Q(**{f'{campo}__icontains': termo}) for campo in campos)))
+
+    longos = [sem_acentos(termo) for termo in termos if len(termo) >= TAMANHO_TRIGRAMA]
+    if longos:
+        colunas = ' '.join(campos)
+        expressao = ' AND '.join('{%s} : "%s"' % (colunas, termo.replace('"', '""')) for termo in longos)
+        queryset = queryset.filter(pk__in=RawSQL(f'SELECT rowid FROM {tabela} WHERE {tabela} MATCH %s', [expressao]))
+    return queryset
+
+
+class BuscaIndexadaFilter(filters.SearchFilter):
+    """Classe BuscaIndexadaFilter
+
+    Intenção :
+    Mesmo parâmetro "?search=" do "SearchFilter", mas consultando a tabela FTS5 (tokenizador "trigram") ao invés de um
+    "LIKE '%termo%'" sobre toda a tabela de estudantes. Cada termo continua sendo procurado como parte do texto em qualquer um dos
+    "search_fields" e todos os termos precisam ser encontrados, como no "SearchFilter", com duas diferenças que só ampliam o
+    resultado: a partir de 3 caracteres os acentos são ignorados ("joao" encontra "João"), assim como as maiúsculas fora do ASCII.
+    O CPF é encontrado por qualquer trecho, inclusive pelo início enquanto é digitado.
+
+    Argumentos :
+    "filters.SearchFilter" : filtro padrão do Django Rest, usado diretamente quando o banco não é SQLite ou a view não define
+    "busca_tabela".
+
+    Atributos :
+    "filter_queryset" : termos com 3 ou mais caracteres usam o índice ("MATCH"); termos menores, que o trigrama não indexa, seguem
+    com o "icontains" do "SearchFilter". A ordenação e a paginação do queryset não mudam.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        termos = list(search_smart_split(self.get_search_terms(request)))
+        campos = self.get_search_fields(view, request)
+        tabela = getattr(view, 'busca_tabela', None)
+        if not termos or not campos or not tabela or connections[queryset.db].vendor != 'sqlite':
+            return super().filter_queryset(request, queryset, view)
+
+        return filtrar_busca(queryset, termos, campos, tabela)
@@ -0,0 +1,267 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, DateTimeField, Max, Subquery
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+from escola.estatisticas import AGORA
+from escola.models import Curso, Estudante, ExclusaoModelo, Matricula
+from escola.replicas import banco_leitura
+
+PREFIXO = 'escola:resposta'
+CHAVE_ACERTOS = 'escola:cache:acertos'
+CHAVE_FALHAS = 'escola:cache:falhas'
+
+def chave_geracao(modelo):
+# chave da "geração" de um model, número que é incrementado a cada alteração em suas linhas
+
+    return f'{PREFIXO}:geracao:{modelo._meta.label_lower}'
+
+def invalidar_modelo(modelo):
+# incrementa a geração do model, fazendo com que todas as respostas que dependem dele deixem de ser encontradas no cache.
+# Dentro de uma transação o incremento espera o commit: antes dele uma leitura concorrente ainda vê as linhas antigas, e as
+# guardaria sob a nova geração
+
+    transaction.on_commit(lambda: incrementar_geracao(modelo))
+
+def incrementar_geracao(modelo):
+    chave = chave_geracao(modelo)
+    cache.add(chave, 0, timeout=None)
+    try:
+        cache.incr(chave)
+    except ValueError:
+        cache.set(chave, 1, timeout=None)
+
+TABELA_EXCLUSOES = ExclusaoModelo._meta.db_table
+TABELAS_EXCLUSOES = [modelo._meta.db_table for modelo in (Estudante, Curso, Matricula)]
+
+def instalar_exclusoes(connection):
+# cria (se ainda não existirem) os triggers que guardam em "escola_exclusaomodelo" o momento da última exclusão de cada tabela,
+# inclusive das exclusões em cascata e do SQL executado fora do Django. É chamada pela migração e após cada "migrate" (ver
+# "escola/apps.py")
+
+    if connection.vendor != 'sqlite' or TABELA_EXCLUSOES not in connection.introspection.table_names():
+        return
+    with connection.cursor() as cursor:
+        for tabela in TABELAS_EXCLUSOES:
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS {tabela}_exclusao AFTER DELETE ON {tabela} BEGIN '
+                f"INSERT INTO {TABELA_EXCLUSOES}(tabela, momento) VALUES ('{tabela}', {AGORA}) "
+                f'ON CONFLICT(tabela) DO UPDATE SET momento = excluded.momento; END'
+            )
+
+def remover_exclusoes(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for tabela in TABELAS_EXCLUSOES:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {tabela}_exclusao')
+
+def tempo_respostas():
+# tempo (em segundos) de uma resposta no cache. As respostas lidas de uma réplica (ver "escola/replicas.py") ficam no máximo
+# "REPLICAS_INTERVALO" segundos, pois a réplica pode ainda não ter recebido a escrita que invalidou o cache
+
+    tempo = getattr(settings, 'CACHE_RESPOSTAS_TIMEOUT', 300)
+    if banco_leitura.get() is not None:
+        return min(tempo, getattr(settings, 'REPLICAS_INTERVALO', 5))
+    return tempo
+
+def incrementar_contador(chave):
+    cache.add(chave, 0, timeout=None)
+    try:
+        cache.incr(chave)
+    except ValueError:
+        pass
+
+def estatisticas_cache():
+# retorna os contadores de acertos (hits) e falhas (misses) do cache de respostas
+
+    valores = cache.get_many([CHAVE_ACERTOS, CHAVE_FALHAS])
+    return {
+        'acertos': valores.get(CHAVE_ACERTOS, 0),
+        'falhas': valores.get(CHAVE_FALHAS, 0),
+    }
+
+def assinatura_permissoes(user):
+# resume as permissões do usuário em um texto curto, para que usuários com permissões diferentes não compartilhem respostas
+
+    if not user or not user.is_authenticated:
+        return 'anonimo'
+    if user.is_superuser:
+        return 'superusuario'
+    permissoes = ','.join(sorted(user.get_all_permissions()))
+    return hashlib.sha1(permissoes.encode()).hexdigest()
+
+
+class CacheRespostaMixin:
+    """Classe CacheRespostaMixin
+
+    Intenção :
+    Guarda no cache do Django os dados já serializados das requisições GET de listagem ("list") e de detalhe ("retrieve"), evitando
+    consultar o banco e serializar novamente os mesmos objetos a cada leitura. A consulta ao cache só é feita depois da autenticação,
+    das permissões e do throttle, que continuam valendo normalmente.
+
+    Argumentos :
+    Deve vir antes da view do Django Rest na herança, ex: "class CursoViewSet(CacheRespostaMixin, viewsets.ModelViewSet)".
+
+    Atributos :
+    "cache_modelos" : models dos quais a resposta depende. Qualquer "post_save"/"post_delete" em um deles (ver "escola/signals.py")
+    incrementa a sua geração após o commit, e a geração faz parte da chave, invalidando apenas as respostas desses models.
+    "chave_cache" : monta a chave a partir do caminho, dos parâmetros da url, da versão da API, do formato da resposta e das
+    permissões do usuário.
+    A resposta traz o cabeçalho "X-Cache" com "HIT" ou "MISS".
+    """
+
+    cache_modelos = ()
+
+    def chave_cache(self, request):
+        geracoes = cache.get_many([chave_geracao(modelo) for modelo in self.cache_modelos])
+        partes = [
+            request.get_host(),
+            request.path,
+            '&'.join(f'{chave}={valor}' for chave, valor in sorted(request.query_params.lists())),
+            str(request.version),
+            request.accepted_renderer.format,
+            assinatura_permissoes(request.user),
+            *(str(geracoes.get(chave_geracao(modelo), 0)) for modelo in self.cache_modelos),
+        ]
+        return f'{PREFIXO}:' + hashlib.sha1('|'.join(partes).encode()).hexdigest()
+
+    def resposta_em_cache(self, request):
+    # retorna a chave da requisição e a resposta guardada no cache (ou None), contando o acerto ou a falha
+
+        chave = self.chave_cache(request)
+        dados = cache.get(chave)
+        if dados is not None:
+            incrementar_contador(CHAVE_ACERTOS)
+            return chave, Response(dados, headers={'X-Cache': 'HIT'})
+        incrementar_contador(CHAVE_FALHAS)
+        return chave, None
+
+    def guardar_resposta(self, chave, response):
+        if response.status_code == 200:
+            cache.set(chave, response.data, tempo_respostas())
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def responder_com_cache(self, request, gerar_resposta):
+        chave, response = self.resposta_em_cache(request)
+        if response is not None:
+            return response
+        return self.guardar_resposta(chave, gerar_resposta())
+
+    def list(self, request, *args, **kwargs):
+        return self.responder_com_cache(request, lambda: super(CacheRespostaMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.responder_com_cache(request, lambda: super(CacheRespostaMixin, self).retrieve(request, *args, **kwargs))
+
+
+class RequisicaoCondicionalMixin:
+    """Classe RequisicaoCondicionalMixin
+
+    Intenção :
+    Responde as requisições GET de listagem e de detalhe com os cabeçalhos "ETag" e "Last-Modified". Quando o cliente envia
+    "If-None-Match" ou "If-Modified-Since" e nada mudou, retorna "304 Not Modified" depois de apenas uma consulta de agregação
+    (COUNT e MAX de "atualizado_em"), sem buscar nem serializar as linhas.
+
+    Argumentos :
+    Deve vir antes da view do Django Rest na herança (e antes do "CacheRespostaMixin", para que a verificação aconteça primeiro).
+
+    Atributos :
+    "condicional_campos" : campos de data de alteração considerados, inclusive de models relacionados que aparecem na resposta
+    (ex: "curso__atualizado_em").
+    "cache_modelos" : os mesmos models do "CacheRespostaMixin", usados aqui para considerar a última exclusão de cada um (tabela
+    "escola_exclusaomodelo", lida na mesma consulta de agregação).
+    """
+
+    condicional_campos = ('atualizado_em',)
+    cache_modelos = ()
+
+    def validadores_em_cache(self, request):
+    # quando a view também usa o "CacheRespostaMixin", o ETag e o Last-Modified ficam no cache junto das respostas e são invalidados
+    # da mesma forma, então uma leitura repetida não chega a consultar o banco
+
+        chave = self.chave_cache(request) + ':validadores' if hasattr(self, 'chave_cache') else None
+        return chave, cache.get(chave) if chave else None
+
+    def agregados_validadores(self):
+        agregados = {f'ultima_{indice}': Max(campo) for indice, campo in enumerate(self.condicional_campos)}
+        exclusoes = {
+            f'exclusao_{indice}': Max(Subquery(
+                ExclusaoModelo.objects.filter(tabela=modelo._meta.db_table).values('momento')[:1], output_field=DateTimeField(),
+            ))
+            for indice, modelo in enumerate(self.cache_modelos)
+        }
+        return {'total': Count('pk'), **agregados, **exclusoes}
+
+    def montar_validadores(self, request, chave, resultado):
+    # calcula o ETag e o Last-Modified a partir do resultado da consulta de agregação (inclusive das últimas exclusões)
+
+        datas = [data for chave_agregado, data in resultado.items() if chave_agregado != 'total' and data]
+        ultima = max(datas) if datas else None
+
+        partes = [
+            request.get_host(),
+            request.get_full_path(),
+            str(request.version),
+            request.accepted_renderer.format,
+            assinatura_permissoes(request.user),
+            str(resultado['total']),
+            ultima.isoformat() if ultima else '',
+        ]
+        etag = '"%s"' % hashlib.sha1('|'.join(partes).encode()).hexdigest()
+        validadores = (resultado['total'], etag, int(ultima.timestamp()) if ultima else None)
+        if chave:
+            cache.set(chave, validadores, tempo_respostas())
+        return validadores
+
+    def validadores(self, request, queryset):
+    # calcula o ETag e o Last-Modified da resposta a partir de uma única consulta de agregação sobre o queryset já filtrado
+
+        chave, validadores = self.validadores_em_cache(request)
+        if validadores is None:
+            resultado = queryset.order_by().aggregate(**self.agregados_validadores())
+            validadores = self.montar_validadores(request, chave, resultado)
+        return validadores
+
+    def resposta_nao_modificada(self, request, validadores, detalhe=False):
+    # retorna o "304 Not Modified" quando o cliente já tem a versão atual, ou None
+
+        total, etag, last_modified = validadores
+        if total or not detalhe:
+            # no detalhe, um objeto inexistente segue para a view normal, que responde 404
+            return get_conditional_response(request, etag=etag, last_modified=last_modified)
+        return None
+
+    def incluir_validadores(self, response, validadores):
+        _, etag, last_modified = validadores
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def responder_condicional(self, request, queryset, gerar_resposta, detalhe=False):
+        validadores = self.validadores(request, queryset)
+        response = self.resposta_nao_modificada(request, validadores, detalhe)
+        if response is not None:
+            return response
+        return self.incluir_validadores(gerar_resposta(), validadores)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.responder_condicional(request, queryset, lambda: super(RequisicaoCondicionalMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        gerar_resposta = lambda: super(RequisicaoCondicionalMixin, self).retrieve(request, *args, **kwargs)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (TypeError, ValueError, ValidationError):
+            # id em formato inválido: a view normal responde 404
+            return gerar_resposta()
+        return self.responder_condicional(request, queryset, gerar_resposta, detalhe=True)
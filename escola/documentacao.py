@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+from functools import lru_cache
+from importlib import import_module
+from pathlib import Path
+import drf_yasg
+import rest_framework
+from django.apps import apps
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.urls import URLResolver, get_resolver
+from django.utils.cache import get_conditional_response, patch_cache_control
+from drf_yasg.renderers import _SpecRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+_esquemas = None
+# (view, versão, formato) -> (conteúdo, ETag), lidos do arquivo do "gerar_documentacao" ou gerados na primeira requisição
+
+def arquivos_codigo():
+# arquivos ".py" das apps do projeto (as que ficam dentro do BASE_DIR) e do pacote do URLconf, em ordem fixa
+
+    pastas = {Path(app.path) for app in apps.get_app_configs() if Path(app.path).is_relative_to(settings.BASE_DIR)}
+    pastas.add(Path(import_module(settings.ROOT_URLCONF).__file__).parent)
+    return sorted(arquivo for pasta in pastas for arquivo in pasta.rglob('*.py'))
+
+@lru_cache(maxsize=None)
+def assinatura_codigo():
+# resumo do código que define a documentação (rotas, views, serializers, models), das versões do drf_yasg e do Django Rest e dos
+# renderers e parsers configurados. Calculado uma vez por processo, já que o código só muda com um novo deploy
+
+    resumo = hashlib.sha256('|'.join([
+        drf_yasg.__version__,
+        rest_framework.VERSION,
+        repr(api_settings.DEFAULT_RENDERER_CLASSES),
+        repr(api_settings.DEFAULT_PARSER_CLASSES),
+        repr(settings.DOCUMENTACAO_VERSOES),
+    ]).encode())
+    for arquivo in arquivos_codigo():
+        resumo.update(str(arquivo.relative_to(settings.BASE_DIR)).encode())
+        resumo.update(arquivo.read_bytes())
+    return resumo.hexdigest()
+
+def chave_esquema(view_class, versao, formato):
+    return f'{view_class.__module__}.{view_class.__qualname__}|{versao}|{formato}'
+
+def etag_esquema(chave, conteudo):
+# ETag forte: o mesmo conteúdo (byte a byte) na mesma versão e formato sempre tem o mesmo ETag, em qualquer processo
+
+    return '"%s"' % hashlib.sha256(chave.encode() + conteudo).hexdigest()
+
+def requisicao_documentacao(versao):
+# requisição usada apenas para gerar o esquema, com a versão da API (as views escolhem o serializer por "request.version")
+
+    http_request = HttpRequest()
+    http_request.method = 'GET'
+    http_request.META = {'SERVER_NAME': 'localhost', 'SERVER_PORT': '80'}
+    request = Request(http_request)
+    request.version, request.versioning_scheme = versao, api_settings.DEFAULT_VERSIONING_CLASS()
+    return request
+
+def gerar_esquemas(view_class, versao):
+    """Função gerar_esquemas
+
+    Intenção :
+    Gera o esquema OpenAPI de uma versão da API (a parte cara, que percorre todas as views e serializers) uma única vez e o renderiza
+    em todos os formatos de especificação da view (JSON, "openapi" e YAML).
+    O esquema é gerado sem "host" e "schemes" (url vazia), ficando igual para qualquer domínio; o Swagger UI e o ReDoc usam então o
+    mesmo endereço da página da documentação.
+
+    Argumentos :
+    "view_class" : view da documentação, com o "DocumentacaoPrecalculadaMixin".
+    "versao" : versão da API, ex: "v1".
+
+    Return :
+    Dicionário com a chave de cada formato ("chave_esquema") e o conteúdo já renderizado (bytes).
+    """
+
+    gerador = view_class.generator_class(view_class.documentacao_info, versao, '')
+    esquema = gerador.get_schema(requisicao_documentacao(versao), view_class.public)
+    return {
+        chave_esquema(view_class, versao, renderer.format): renderer().render(esquema)
+        for renderer in view_class.renderer_classes
+        if issubclass(renderer, _SpecRenderer)
+    }
+
+def carregar_artefato():
+# lê os esquemas gravados pelo "gerar_documentacao"; um arquivo inexistente ou gerado por outro código é ignorado
+
+    try:
+        with open(settings.DOCUMENTACAO_ARQUIVO, encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+    except (TypeError, OSError, ValueError):
+        return {}
+    if dados.get('assinatura') != assinatura_codigo():
+        return {}
+    return {chave: conteudo.encode() for chave, conteudo in dados['esquemas'].items()}
+
+def esquemas_carregados():
+    global _esquemas
+    if _esquemas is None:
+        _esquemas = {chave: (conteudo, etag_esquema(chave, conteudo)) for chave, conteudo in carregar_artefato().items()}
+    return _esquemas
+
+def limpar_esquemas():
+# descarta os esquemas do processo, que serão lidos do arquivo (ou gerados) novamente na próxima requisição
+
+    global _esquemas
+    _esquemas = None
+
+def esquema_precalculado(view_class, versao, formato):
+# retorna o conteúdo e o ETag do esquema, gerando todos os formatos da versão na primeira vez que ela é pedida
+
+    esquemas = esquemas_carregados()
+    chave = chave_esquema(view_class, versao, formato)
+    if chave not in esquemas:
+        for chave_gerada, conteudo in gerar_esquemas(view_class, versao).items():
+            esquemas[chave_gerada] = (conteudo, etag_esquema(chave_gerada, conteudo))
+    return esquemas[chave]
+
+def views_documentacao(rotas=None):
+# views com o "DocumentacaoPrecalculadaMixin" nas rotas do projeto (o Swagger e o ReDoc usam a mesma view), sem repetição
+
+    views = []
+    for rota in get_resolver().url_patterns if rotas is None else rotas:
+        if isinstance(rota, URLResolver):
+            views += [view for view in views_documentacao(rota.url_patterns) if view not in views]
+            continue
+        callback = rota.callback.carregar() if hasattr(rota.callback, 'carregar') else rota.callback
+        # as views carregadas sob demanda ("escola/carregamento.py") são importadas aqui
+        if issubclass(getattr(callback, 'cls', object), DocumentacaoPrecalculadaMixin) and callback.cls not in views:
+            views.append(callback.cls)
+    return views
+
+def gravar_artefato(caminho):
+# gera os esquemas de todas as versões em "DOCUMENTACAO_VERSOES" e grava no arquivo, substituindo o anterior de uma só vez (os
+# processos em execução nunca leem um arquivo pela metade). Retorna a quantidade de esquemas
+
+    esquemas = {}
+    for view_class in views_documentacao():
+        for versao in settings.DOCUMENTACAO_VERSOES:
+            esquemas.update({chave: conteudo.decode() for chave, conteudo in gerar_esquemas(view_class, versao).items()})
+    temporario = f'{caminho}.tmp'
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump({'assinatura': assinatura_codigo(), 'esquemas': esquemas}, arquivo, ensure_ascii=False)
+    os.replace(temporario, caminho)
+    return len(esquemas)
+
+
+class DocumentacaoPrecalculadaMixin:
+    """Classe DocumentacaoPrecalculadaMixin
+
+    Intenção :
+    Serve o esquema OpenAPI da view do drf_yasg ("get_schema_view") a partir de um conteúdo já gerado e renderizado, ao invés de
+    percorrer todas as views e serializers a cada requisição. O esquema de cada versão é gerado uma vez por processo (ou lido do
+    arquivo do comando "gerar_documentacao", quando ele foi gerado pelo mesmo código) e respondido com um ETag forte; um cliente que
+    envia "If-None-Match" recebe "304 Not Modified" sem o corpo.
+    A página do Swagger UI e do ReDoc (HTML) continua com a view do drf_yasg, que não gera o esquema para ela.
+
+    Argumentos :
+    Deve vir antes da view do drf_yasg na herança, ex: "class DocumentacaoView(DocumentacaoPrecalculadaMixin, schema_view)".
+
+    Atributos :
+    "documentacao_info" : o mesmo "openapi.Info" passado para o "get_schema_view".
+    "get" : sem "?version=" usa a primeira versão de "DOCUMENTACAO_VERSOES". Versões fora da lista continuam sendo geradas a cada
+    requisição, para que um "?version=" qualquer não aumente os esquemas guardados na memória.
+    """
+
+    documentacao_info = None
+
+    def get(self, request, version='', format=None):
+        versao = request.version or settings.DOCUMENTACAO_VERSOES[0]
+        if not isinstance(request.accepted_renderer, _SpecRenderer) or versao not in settings.DOCUMENTACAO_VERSOES:
+            return super().get(request, version, format)
+
+        conteudo, etag = esquema_precalculado(type(self), versao, request.accepted_renderer.format)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(conteudo, content_type=f'{request.accepted_renderer.media_type}; charset=utf-8')
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        # o navegador guarda o esquema, mas confirma com o "If-None-Match" antes de usar; "private" por exigir autenticação
+        return response
@@ -0,0 +1,150 @@
+from django.core.checks import Error, register
+from django.db import connections, transaction
+from escola.models import Curso, EstatisticaMatricula, Matricula
+
+TABELA_ESTATISTICAS = EstatisticaMatricula._meta.db_table
+# uma linha por (curso, período) com a quantidade de matrículas; combinações sem matrículas não têm linha
+
+AGORA = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+# mesmo formato (UTC) em que o Django grava o "atualizado_em" no SQLite
+
+SUFIXOS_TRIGGERS = ('insert', 'delete', 'update')
+
+def comandos_instalacao():
+# SQL dos triggers que atualizam a tabela de estatísticas e o "Curso.total_matriculas" em cada escrita em "escola_matricula",
+# dentro da mesma transação. O "atualizado_em" do curso também muda, já que o total faz parte da resposta de "cursos/" (ETag e
+# Last-Modified). Pode ser executado mais de uma vez ("IF NOT EXISTS")
+
+    somar = (
+        f'INSERT INTO {TABELA_ESTATISTICAS}(curso_id, periodo, total) VALUES (new.curso_id, new.periodo, 1) '
+        f'ON CONFLICT(curso_id, periodo) DO UPDATE SET total = total + 1; '
+        f'UPDATE escola_curso SET total_matriculas = total_matriculas + 1, atualizado_em = {AGORA} WHERE id = new.curso_id;'
+    )
+    subtrair = (
+        f'UPDATE {TABELA_ESTATISTICAS} SET total = total - 1 WHERE curso_id = old.curso_id AND periodo = old.periodo; '
+        f'DELETE FROM {TABELA_ESTATISTICAS} WHERE curso_id = old.curso_id AND periodo = old.periodo AND total <= 0; '
+        f'UPDATE escola_curso SET total_matriculas = total_matriculas - 1, atualizado_em = {AGORA} WHERE id = old.curso_id;'
+    )
+    return [
+        f'CREATE TRIGGER IF NOT EXISTS {TABELA_ESTATISTICAS}_insert AFTER INSERT ON escola_matricula BEGIN {somar} END',
+        f'CREATE TRIGGER IF NOT EXISTS {TABELA_ESTATISTICAS}_delete AFTER DELETE ON escola_matricula BEGIN {subtrair} END',
+        f'CREATE TRIGGER IF NOT EXISTS {TABELA_ESTATISTICAS}_update AFTER UPDATE OF curso_id, periodo ON escola_matricula '
+        f'WHEN old.curso_id IS NOT new.curso_id OR old.periodo IS NOT new.periodo BEGIN {subtrair} {somar} END',
+    ]
+
+def recalcular_estatisticas(connection):
+# apaga a tabela de estatísticas e conta novamente todas as matrículas, em uma única transação, corrigindo também o
+# "total_matriculas" dos cursos (apenas os que estiverem diferentes mudam o "atualizado_em"). Retorna a quantidade de linhas
+
+    contagem = 'SELECT COUNT(*) FROM escola_matricula WHERE curso_id = escola_curso.id'
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABELA_ESTATISTICAS}')
+        cursor.execute(
+            f'INSERT INTO {TABELA_ESTATISTICAS}(curso_id, periodo, total) '
+            f'SELECT curso_id, periodo, COUNT(*) FROM escola_matricula GROUP BY curso_id, periodo'
+        )
+        linhas = cursor.rowcount
+        cursor.execute(
+            f'UPDATE escola_curso SET total_matriculas = ({contagem}), atualizado_em = {AGORA} '
+            f'WHERE total_matriculas != ({contagem})'
+        )
+        return linhas
+
+def instalar_estatisticas(connection):
+    """Função instalar_estatisticas
+
+    Intenção :
+    Cria (se ainda não existirem) os triggers que mantêm a tabela "escola_estatisticamatricula" e o "Curso.total_matriculas"
+    atualizados em qualquer escrita de matrícula, inclusive o "bulk_create" da matrícula em lote, as exclusões em cascata de
+    estudantes e cursos e o SQL executado fora do Django. Na primeira instalação a tabela e os totais dos cursos são preenchidos com
+    as matrículas existentes.
+    É chamada pela migração e também após cada "migrate" (ver "escola/apps.py").
+
+    Argumentos :
+    "connection" : conexão do Django. Em bancos que não são SQLite nada é feito (ver "verificar_banco").
+    """
+
+    if connection.vendor != 'sqlite':
+        return
+    tabelas = connection.introspection.table_names()
+    if 'escola_matricula' not in tabelas or TABELA_ESTATISTICAS not in tabelas:
+        return
+    with connection.cursor() as cursor:
+        if 'total_matriculas' not in [coluna.name for coluna in connection.introspection.get_table_description(cursor, 'escola_curso')]:
+            # ex: "migrate escola 0008", antes do contador dos cursos; a migração 0009 instala os triggers
+            return
+        cursor.execute(f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name = '{TABELA_ESTATISTICAS}_insert'")
+        instalada = cursor.fetchone()[0]
+        for comando in comandos_instalacao():
+            cursor.execute(comando)
+    if not instalada:
+        recalcular_estatisticas(connection)
+
+def remover_estatisticas(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for sufixo in SUFIXOS_TRIGGERS:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {TABELA_ESTATISTICAS}_{sufixo}')
+
+@register()
+def verificar_banco(app_configs, **kwargs):
+# sem os triggers a tabela de estatísticas e o "Curso.total_matriculas" (exposto e ordenável em "cursos/") ficariam sempre em 0,
+# então outro banco é recusado pelo "manage.py check" (executado também pelo "migrate", "runserver" e "test")
+
+    return [
+        Error(
+            f'O banco "{alias}" ({connections[alias].vendor}) não é suportado.',
+            hint='A tabela de estatísticas e o "Curso.total_matriculas" são mantidos por triggers do SQLite (ver "escola/estatisticas.py").',
+            id='escola.E001',
+        )
+        for alias in connections
+        if connections[alias].vendor != 'sqlite'
+    ]
+
+def contagens(using):
+# (curso_id, periodo, total) da tabela de estatísticas
+
+    return EstatisticaMatricula.objects.using(using).values_list('curso_id', 'periodo', 'total')
+
+def estatisticas_matriculas(using='default'):
+    """Função estatisticas_matriculas
+
+    Intenção :
+    Monta as quantidades de matrículas por curso, por período e por nível a partir da tabela de estatísticas, com duas consultas
+    cujo tamanho depende apenas da quantidade de cursos, e não da quantidade de matrículas.
+
+    Argumentos :
+    "using" : alias do banco.
+
+    Return :
+    Dicionário com o "total", o "por_periodo" e o "por_nivel" (todos os períodos e níveis, inclusive com 0) e o "por_curso", com
+    todos os cursos em ordem de "id".
+    """
+
+    periodos = [periodo for periodo, _ in Matricula.PERIODO]
+    por_curso = {
+        curso['id']: {**curso, 'total': 0, 'por_periodo': dict.fromkeys(periodos, 0)}
+        for curso in Curso.objects.using(using).order_by('id').values('id', 'codigo', 'nivel')
+    }
+    por_periodo = dict.fromkeys(periodos, 0)
+    por_nivel = dict.fromkeys((nivel for nivel, _ in Curso.NIVEL), 0)
+
+    for curso_id, periodo, total in contagens(using):
+        curso = por_curso.get(curso_id)
+        if curso is None:
+            continue
+        curso['total'] += total
+        curso['por_periodo'][periodo] = curso['por_periodo'].get(periodo, 0) + total
+        por_periodo[periodo] = por_periodo.get(periodo, 0) + total
+        por_nivel[curso['nivel']] = por_nivel.get(curso['nivel'], 0) + total
+
+    return {
+        'total': sum(por_periodo.values()),
+        'por_periodo': por_periodo,
+        'por_nivel': por_nivel,
+        'por_curso': [
+            {'curso': curso['id'], 'codigo': curso['codigo'], 'nivel': curso['nivel'], 'total': curso['total'], 'por_periodo': curso['por_periodo']}
+            for curso in por_curso.values()
+        ],
+    }
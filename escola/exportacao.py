@@ -0,0 +1,87 @@
+import csv
+from itertools import islice
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+TAMANHO_BLOCO = 2000
+# quantidade de linhas lidas do banco por vez pelo "iterator", mantendo a memória constante independente do tamanho da tabela
+
+FORMATOS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+class Eco:
+# "arquivo" que apenas devolve o que é escrito, para o "csv.writer" gerar cada linha sem acumular nada em memória
+
+    def write(self, valor):
+        return valor
+
+def linhas(queryset, colunas):
+# percorre o queryset em blocos de "TAMANHO_BLOCO" linhas, buscando apenas as colunas exportadas
+
+    return queryset.values_list(*colunas).iterator(chunk_size=TAMANHO_BLOCO)
+
+def gerar_ndjson(queryset, campos, colunas):
+    codificador = DjangoJSONEncoder(ensure_ascii=False)
+    for linha in linhas(queryset, colunas):
+        yield codificador.encode(dict(zip(campos, linha))) + '\n'
+
+def gerar_csv(queryset, campos, colunas):
+    escritor = csv.writer(Eco())
+    yield escritor.writerow(campos)
+    for linha in linhas(queryset, colunas):
+        yield escritor.writerow(linha)
+
+async def blocos(queryset, colunas):
+# versão assíncrona do "linhas" para o servidor ASGI: cada bloco de "TAMANHO_BLOCO" linhas é lido do mesmo "iterator" em uma única
+# ida à thread do ORM e enviado de uma vez, ao invés de uma mensagem do ASGI por linha
+# obs: o "aiterator" do Django 5.0 executa a consulta do "values_list" ainda no loop de eventos e falha com "SynchronousOnlyOperation"
+
+    iterador = linhas(queryset, colunas)
+    proximo_bloco = sync_to_async(lambda: list(islice(iterador, TAMANHO_BLOCO)))
+    while bloco := await proximo_bloco():
+        yield bloco
+
+async def agerar_ndjson(queryset, campos, colunas):
+    codificador = DjangoJSONEncoder(ensure_ascii=False)
+    async for bloco in blocos(queryset, colunas):
+        yield ''.join(codificador.encode(dict(zip(campos, linha))) + '\n' for linha in bloco)
+
+async def agerar_csv(queryset, campos, colunas):
+    escritor = csv.writer(Eco())
+    yield escritor.writerow(campos)
+    async for bloco in blocos(queryset, colunas):
+        yield ''.join(escritor.writerow(linha) for linha in bloco)
+
+def resposta_exportacao(queryset, campos, formato, nome_arquivo, colunas=None, assincrono=False):
+    """Função resposta_exportacao
+
+    Intenção :
+    Monta a resposta de exportação em NDJSON (um objeto JSON por linha) ou CSV, enviada aos poucos ao cliente através do
+    "StreamingHttpResponse", sem paginação e sem carregar a tabela inteira em memória.
+
+    Argumentos :
+    "queryset" : linhas a exportar, já filtradas e ordenadas pela view.
+    "campos" : nomes dos campos na saída (cabeçalho do CSV e chaves do NDJSON).
+    "formato" : "ndjson" ou "csv".
+    "nome_arquivo" : nome sugerido para o download, sem a extensão.
+    "colunas" : colunas do banco correspondentes a cada campo, por padrão os próprios "campos".
+    "assincrono" : usa os geradores assíncronos, para o servidor ASGI. Com um gerador síncrono o ASGI do Django lê a exportação
+    inteira para uma lista antes de enviá-la.
+
+    Return :
+    "StreamingHttpResponse" com o conteúdo, ou "None" se o formato não for suportado.
+    """
+
+    if formato not in FORMATOS:
+        return None
+    colunas = colunas or campos
+    if assincrono:
+        gerador = agerar_csv if formato == 'csv' else agerar_ndjson
+    else:
+        gerador = gerar_csv if formato == 'csv' else gerar_ndjson
+    response = StreamingHttpResponse(gerador(queryset, campos, colunas), content_type=f'{FORMATOS[formato]}; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{nome_arquivo}.{formato}"'
+    return response
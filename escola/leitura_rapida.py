@@ -0,0 +1,117 @@
+from functools import lru_cache
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from rest_framework import serializers
+from rest_framework.response import Response
+
+def identidade(valor):
+    return valor
+
+def data_iso(valor):
+    return valor if isinstance(valor, str) else valor.isoformat()
+
+def conversor_campo(campo):
+# conversor equivalente ao "to_representation" de cada tipo de campo do Django Rest, para os valores vindos do ".values()"
+
+    if isinstance(campo, serializers.DateField):
+        return data_iso
+    if isinstance(campo, (serializers.IntegerField, serializers.PrimaryKeyRelatedField)):
+        return int
+    if isinstance(campo, (serializers.CharField, serializers.ChoiceField, serializers.ReadOnlyField)):
+        return identidade
+    raise TypeError(f'O campo "{campo.field_name}" ({type(campo).__name__}) não tem leitura rápida; use "campos_leitura_rapida".')
+
+@lru_cache(maxsize=None)
+def mapeamento(serializer_class):
+    """Função mapeamento
+
+    Intenção :
+    Monta uma única vez, para cada serializer, a lista de (nome do campo na resposta, coluna do ".values()", conversor) na mesma ordem
+    dos campos do serializer, para que a saída seja idêntica à dele.
+
+    Argumentos :
+    "serializer_class" : classe do serializer. Campos que não podem ser deduzidos (ex: "SerializerMethodField") são definidos no
+    atributo "campos_leitura_rapida" do serializer, no formato {nome: (coluna, conversor)}.
+
+    Return :
+    Tupla de (nome, coluna, conversor).
+    """
+
+    especiais = getattr(serializer_class, 'campos_leitura_rapida', {})
+    campos = []
+    for nome, campo in serializer_class().fields.items():
+        if campo.write_only:
+            continue
+        if nome in especiais:
+            coluna, conversor = especiais[nome]
+        else:
+            coluna = '__'.join(campo.source_attrs)
+            if isinstance(campo, serializers.PrimaryKeyRelatedField):
+                coluna += '_id'
+            conversor = conversor_campo(campo)
+        campos.append((nome, coluna, conversor))
+    return tuple(campos)
+
+def serializar_rapido(serializer_class, linhas):
+# converte os dicionários do ".values()" nos mesmos dados que o serializer geraria
+
+    campos = mapeamento(serializer_class)
+    return [
+        {nome: None if linha[coluna] is None else conversor(linha[coluna]) for nome, coluna, conversor in campos}
+        for linha in linhas
+    ]
+
+def colunas(serializer_class):
+    return list(dict.fromkeys(['id'] + [coluna for _, coluna, _ in mapeamento(serializer_class)]))
+
+
+class LeituraRapidaMixin:
+    """Classe LeituraRapidaMixin
+
+    Intenção :
+    Caminho rápido e opcional para as requisições GET de listagem e de detalhe, ativado com "LEITURA_RAPIDA = True" no settings.
+    Ao invés de montar as instâncias dos models e passar por cada campo do serializer, busca apenas as colunas necessárias com
+    ".values()" e monta a resposta com o "mapeamento" pré-calculado do serializer. O resultado é o mesmo do serializer.
+
+    Argumentos :
+    Deve vir antes da view do Django Rest na herança (e depois dos mixins de cache de "escola/cache.py").
+
+    Atributos :
+    "leitura_rapida_ativa" : verifica o settings.
+    "list" e "retrieve" : seguem o mesmo fluxo do Django Rest (filtros, paginação, 404), trocando apenas a serialização.
+    Obs: as permissões por objeto não são verificadas nesse caminho, pois nenhuma das views atuais as usa.
+    """
+
+    def leitura_rapida_ativa(self):
+        return getattr(settings, 'LEITURA_RAPIDA', False)
+
+    def list(self, request, *args, **kwargs):
+        if not self.leitura_rapida_ativa():
+            return super().list(request, *args, **kwargs)
+
+        serializer_class = self.get_serializer_class()
+        queryset = self.filter_queryset(self.get_queryset()).values(*colunas(serializer_class))
+        pagina = self.paginate_queryset(queryset)
+        if pagina is not None:
+            return self.get_paginated_response(serializar_rapido(serializer_class, pagina))
+        return Response(serializar_rapido(serializer_class, queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.leitura_rapida_ativa():
+            return super().retrieve(request, *args, **kwargs)
+
+        serializer_class = self.get_serializer_class()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            linha = (
+                self.filter_queryset(self.get_queryset())
+                .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+                .values(*colunas(serializer_class))
+                .first()
+            )
+        except (TypeError, ValueError, ValidationError):
+            linha = None
+        if linha is None:
+            raise Http404
+        return Response(serializar_rapido(serializer_class, [linha])[0])
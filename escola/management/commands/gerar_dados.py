@@ -0,0 +1,226 @@
+import itertools
+import math
+import os
+import random
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from escola.validators import cpf_digitos_validos
+
+# obs: assim como o "importar", este módulo só importa os models dentro do "handle", para que os processos de geração não precisem
+# carregar o Django
+
+NOMES = [
+    'Ana', 'Maria', 'Júlia', 'Beatriz', 'Letícia', 'Camila', 'Fernanda', 'Juliana', 'Patrícia', 'Aline', 'Larissa', 'Gabriela',
+    'Mariana', 'Vitória', 'Cecília', 'Lúcia', 'Helena', 'Alice', 'Laura', 'Manuela', 'Isabela', 'Sofia', 'Luana', 'Bruna',
+    'João', 'José', 'Antônio', 'Francisco', 'Carlos', 'Paulo', 'Pedro', 'Lucas', 'Luiz', 'Marcos', 'Gabriel', 'Rafael',
+    'Daniel', 'Marcelo', 'Bruno', 'Eduardo', 'Felipe', 'Rodrigo', 'Gustavo', 'Otávio', 'Sebastião', 'Miguel', 'Arthur', 'Heitor',
+]
+DOMINIOS = ['gmail.com', 'hotmail.com', 'outlook.com', 'yahoo.com.br', 'uol.com.br', 'bol.com.br']
+DDDS = [
+    11, 12, 13, 14, 15, 16, 17, 18, 19, 21, 22, 24, 27, 28, 31, 32, 33, 34, 35, 37, 38, 41, 42, 43, 44, 45, 46, 47, 48, 49, 51,
+    53, 54, 55, 61, 62, 63, 64, 65, 66, 67, 68, 69, 71, 73, 74, 75, 77, 79, 81, 82, 83, 84, 85, 86, 87, 88, 89, 91, 92, 93, 94,
+    95, 96, 97, 98, 99,
+]
+# DDDs do Brasil: nenhum tem o dígito zero, por isso todos passam pelo "celular_invalido"
+AREAS = [
+    'Python', 'Django', 'Java', 'JavaScript', 'SQL', 'Dados', 'Redes', 'Segurança', 'Cloud', 'Design', 'Inglês', 'Gestão',
+]
+NIVEIS = (('B', 50), ('I', 30), ('A', 20))
+PERIODOS = (('M', 40), ('V', 25), ('N', 35))
+# pesos (%) dos níveis dos cursos e dos períodos das matrículas
+
+MULTIPLICADOR_CPF = 387_420_489
+# 3^18: primo com 10^9, então "numero * MULTIPLICADOR_CPF % 10^9" é uma permutação das bases de 9 dígitos (CPFs distintos, sem
+# a sequência 000.000.001, 000.000.002, ...)
+REFERENCIA = date(2024, 1, 1)
+# as datas de nascimento são calculadas a partir de uma data fixa, e não da data atual, para a mesma semente gerar as mesmas linhas
+
+def sorteio_shard(semente, shard):
+# gerador próprio de cada shard: o resultado não depende da quantidade de processos nem da ordem em que os shards são gerados
+
+    return random.Random(f'{semente}:{shard}')
+
+def cpf_sintetico(numero, semente):
+# CPF (com os dígitos verificadores) do estudante de número "numero", ou None nas poucas bases de dígitos repetidos
+
+    base = (numero * MULTIPLICADOR_CPF + semente * 7_919) % 10 ** 9
+    digitos = [int(digito) for digito in f'{base:09d}']
+    for peso_inicial in (10, 11):
+        soma = sum(peso * digito for peso, digito in zip(range(peso_inicial, 1, -1), digitos))
+        digitos.append(soma * 10 % 11 % 10)
+    cpf = ''.join(map(str, digitos))
+    return cpf if cpf_digitos_validos(cpf) else None
+
+def email_sintetico(nome, numero, dominio):
+# até 8 letras do nome sem acentos, o número do estudante e o domínio: no máximo 30 caracteres até 10^8 estudantes
+
+    letras = unicodedata.normalize('NFKD', nome).encode('ascii', 'ignore').decode().lower()[:8]
+    return f'{letras}{numero}@{dominio}'
+
+def quantidade_matriculas(sorteio, media):
+# distribuição de Poisson (algoritmo de Knuth): a maioria dos estudantes perto da média, alguns sem matrícula e poucos com muitas
+
+    limite, quantidade, produto = math.exp(-media), 0, sorteio.random()
+    while produto > limite:
+        quantidade += 1
+        produto *= sorteio.random()
+    return quantidade
+
+def gerar_cursos(semente, quantidade, prefixo):
+# (codigo, descricao, nivel) dos cursos, com o próprio gerador da semente
+
+    sorteio = random.Random(f'{semente}:cursos')
+    niveis, pesos = zip(*NIVEIS)
+    digitos = len(str(quantidade))
+    return [
+        (f'{prefixo}{numero:0{digitos}d}', f'{sorteio.choice(AREAS)} {numero}', sorteio.choices(niveis, pesos)[0])
+        for numero in range(1, quantidade + 1)
+    ]
+
+def gerar_shard(semente, shard, tamanho, estudantes, cursos, media):
+# executado nos processos de geração: estudantes de número [shard * tamanho, ...) e as suas matrículas. Retorna as linhas como
+# tuplas, com o número do estudante (a chave primária é calculada na gravação) e a posição do curso (começando em 0)
+
+    sorteio = sorteio_shard(semente, shard)
+    acumulados = list(itertools.accumulate(1 / posicao ** 1.1 for posicao in range(1, cursos + 1)))
+    # popularidade dos cursos em lei de Zipf: os primeiros cursos concentram a maior parte das matrículas
+    periodos, pesos_periodos = zip(*PERIODOS)
+    linhas_estudantes, linhas_matriculas = [], []
+    for numero in range(shard * tamanho, min((shard + 1) * tamanho, estudantes)):
+        nome = sorteio.choice(NOMES)
+        idade = 16 + int(sorteio.expovariate(1 / 8))
+        nascimento = REFERENCIA - timedelta(days=365 * min(idade, 70) + sorteio.randrange(365))
+        celular = f'{sorteio.choice(DDDS)}9{sorteio.randint(6, 9)}{sorteio.randrange(10 ** 7):07d}'
+        email = email_sintetico(nome, numero, sorteio.choice(DOMINIOS))
+        cursos_estudante = set()
+        for _ in range(min(quantidade_matriculas(sorteio, media), cursos)):
+            while (curso := sorteio.choices(range(cursos), cum_weights=acumulados)[0]) in cursos_estudante:
+                pass
+            cursos_estudante.add(curso)
+            linhas_matriculas.append((numero, curso, sorteio.choices(periodos, pesos_periodos)[0]))
+        cpf = cpf_sintetico(numero, semente)
+        if cpf is not None:
+            linhas_estudantes.append((numero, nome, email, cpf, nascimento, celular))
+    return linhas_estudantes, linhas_matriculas
+
+
+class Command(BaseCommand):
+    """Classe Command
+
+    Intenção :
+    Comando "python manage.py gerar_dados" que gera uma base sintética de estudantes, cursos e matrículas em qualquer escala (milhões
+    de linhas), para testes de carga e benchmarks. Os scripts "popular_banco_*.py" apenas o chamam (ver "README.md"). Os dados
+    passam pelos mesmos validadores da API: CPFs com dígitos verificadores corretos, nomes só com letras e celulares com DDD
+    válido. As matrículas seguem uma distribuição realista: quantidade por estudante de Poisson em torno de "--media-matriculas"
+    e cursos com popularidade em lei de Zipf.
+
+    Os estudantes são divididos em shards de "--tamanho-shard" linhas, cada um com o próprio gerador (semente + número do shard),
+    gerados em paralelo por "--processos" processos e gravados na ordem dos shards com "bulk_create", um shard por transação. A
+    mesma semente, sobre a mesma base inicial, grava sempre as mesmas linhas (com as mesmas chaves primárias), com qualquer
+    quantidade de processos.
+
+    Argumentos :
+    "BaseCommand" : classe padrão do Django para os comandos do "manage.py".
+
+    Atributos :
+    "add_arguments" : opções do comando ("--estudantes", "--cursos", "--media-matriculas", "--semente", "--prefixo-cursos",
+    "--tamanho-shard", "--tamanho-lote" e "--processos").
+    "handle" : grava os cursos e depois os shards de estudantes e matrículas, mostrando o progresso em linhas por segundo. Os
+    estudantes com CPF já cadastrado são ignorados, junto com as suas matrículas.
+    """
+
+    help = 'Gera estudantes, cursos e matrículas sintéticos e reprodutíveis'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--estudantes', type=int, default=1000)
+        parser.add_argument('--cursos', type=int, help='por padrão, um curso a cada 1.000 estudantes (no mínimo 12)')
+        parser.add_argument('--media-matriculas', type=float, default=3.0, help='média de matrículas por estudante')
+        parser.add_argument('--semente', type=int, default=1)
+        parser.add_argument('--prefixo-cursos', default='G', help='início do código dos cursos gerados')
+        parser.add_argument('--tamanho-shard', type=int, default=10_000)
+        parser.add_argument('--tamanho-lote', type=int, default=5000, help='linhas por INSERT do "bulk_create"')
+        parser.add_argument('--processos', type=int, default=os.cpu_count(), help='0 gera no próprio processo')
+
+    def handle(self, *args, **options):
+        from django.db import transaction
+        from django.db.models import Max
+        from escola.cache import invalidar_modelo
+        from escola.models import Curso, Estudante, Matricula
+
+        estudantes, semente, tamanho = options['estudantes'], options['semente'], options['tamanho_shard']
+        quantidade_cursos = options['cursos'] or max(12, estudantes // 1000)
+        if estudantes < 0 or quantidade_cursos < 1 or tamanho < 1 or options['media_matriculas'] < 0:
+            raise CommandError('Use quantidades positivas.')
+        cursos = gerar_cursos(semente, quantidade_cursos, options['prefixo_cursos'])
+        if len(cursos[-1][0]) > 10 or len(cursos[0][0]) < 3:
+            raise CommandError('O código dos cursos (prefixo + número) deve ter entre 3 e 10 caracteres.')
+        if Curso.objects.filter(codigo__in=[codigo for codigo, _, _ in cursos]).exists():
+            raise CommandError(f'Já existem cursos com o prefixo "{options["prefixo_cursos"]}"; use outro "--prefixo-cursos".')
+
+        comeco = time.perf_counter()
+        with transaction.atomic():
+            inicio_curso = Curso.objects.aggregate(Max('id'))['id__max'] or 0
+            Curso.objects.bulk_create(
+                [Curso(id=inicio_curso + posicao + 1, codigo=codigo, descricao=descricao, nivel=nivel)
+                 for posicao, (codigo, descricao, nivel) in enumerate(cursos)],
+                batch_size=options['tamanho_lote'],
+            )
+        inicio_estudante = (Estudante.objects.aggregate(Max('id'))['id__max'] or 0) + 1
+        # chaves primárias calculadas a partir do número do estudante, para as matrículas não dependerem da ordem de gravação
+
+        executor = ProcessPoolExecutor(options['processos']) if options['processos'] else None
+        gravados = {'estudantes': 0, 'matriculas': 0, 'ignorados': 0}
+
+        def gerar(shard):
+            argumentos = (semente, shard, tamanho, estudantes, quantidade_cursos, options['media_matriculas'])
+            return executor.submit(gerar_shard, *argumentos) if executor else gerar_shard(*argumentos)
+
+        def gravar(resultado):
+            linhas_estudantes, linhas_matriculas = resultado.result() if executor else resultado
+            with transaction.atomic():
+                cpfs = [linha[3] for linha in linhas_estudantes]
+                existentes = set(Estudante.objects.filter(cpf__in=cpfs).values_list('cpf', flat=True)) if cpfs else set()
+                numeros = {linha[0] for linha in linhas_estudantes if linha[3] not in existentes}
+                Estudante.objects.bulk_create(
+                    [Estudante(id=inicio_estudante + numero, nome=nome, email=email, cpf=cpf, data_nascimento=nascimento, celular=celular)
+                     for numero, nome, email, cpf, nascimento, celular in linhas_estudantes if numero in numeros],
+                    batch_size=options['tamanho_lote'],
+                )
+                matriculas = [
+                    Matricula(estudante_id=inicio_estudante + numero, curso_id=inicio_curso + curso + 1, periodo=periodo)
+                    for numero, curso, periodo in linhas_matriculas if numero in numeros
+                ]
+                Matricula.objects.bulk_create(matriculas, batch_size=options['tamanho_lote'])
+            gravados['estudantes'] += len(numeros)
+            gravados['matriculas'] += len(matriculas)
+            gravados['ignorados'] += len(linhas_estudantes) - len(numeros)
+            decorrido = time.perf_counter() - comeco
+            linhas = gravados['estudantes'] + gravados['matriculas']
+            self.stdout.write(f'{gravados["estudantes"]} estudantes, {gravados["matriculas"]} matrículas ({linhas / decorrido:.0f} linhas/s)')
+
+        try:
+            # mantém no máximo 2 shards por processo em geração, para a memória não crescer com a quantidade de estudantes
+            pendentes = deque()
+            limite = max(1, 2 * (options['processos'] or 0))
+            for shard in range(-(-estudantes // tamanho)):
+                pendentes.append(gerar(shard))
+                if len(pendentes) >= limite:
+                    gravar(pendentes.popleft())
+            while pendentes:
+                gravar(pendentes.popleft())
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+            for modelo in (Curso, Estudante, Matricula):
+                invalidar_modelo(modelo)
+            # o "bulk_create" não dispara os signals que invalidam o cache de respostas
+
+        decorrido = time.perf_counter() - comeco
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(cursos)} cursos, {gravados["estudantes"]} estudantes ({gravados["ignorados"]} CPFs já existentes) e '
+            f'{gravados["matriculas"]} matrículas gravados em {decorrido:.1f}s'
+        ))
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from escola.documentacao import gravar_artefato, views_documentacao
+
+
+class Command(BaseCommand):
+    """Classe Command
+
+    Intenção :
+    Comando "python manage.py gerar_documentacao", executado no deploy, que gera os esquemas OpenAPI de todas as versões da API e os
+    grava em um arquivo. Os processos da API servem "swagger/" e "redoc/" direto desse arquivo, sem gerar o esquema; se o código
+    mudar e o comando não for executado novamente, o arquivo é ignorado e cada processo gera o esquema na primeira requisição.
+
+    Argumentos :
+    "BaseCommand" : classe padrão do Django para os comandos do "manage.py".
+
+    Atributos :
+    "add_arguments" : "--arquivo" escolhe o caminho do arquivo (padrão "DOCUMENTACAO_ARQUIVO").
+    "handle" : gera e grava os esquemas (ver "gravar_artefato" em "escola/documentacao.py").
+    """
+
+    help = 'Gera os esquemas OpenAPI da documentação em um arquivo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--arquivo', default=settings.DOCUMENTACAO_ARQUIVO)
+
+    def handle(self, *args, **options):
+        if not views_documentacao():
+            raise CommandError('Nenhuma rota de documentação com o "DocumentacaoPrecalculadaMixin" foi encontrada.')
+        quantidade = gravar_artefato(options['arquivo'])
+        self.stdout.write(f'{quantidade} esquema(s) gravado(s) em {options["arquivo"]}.')
@@ -0,0 +1,240 @@
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import islice
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from escola.validators import cpfs_invalidos, nomes_invalidos, celulares_invalidos
+
+# obs: este módulo só importa os models dentro do "handle", para que os processos de validação não precisem carregar o Django
+
+NIVEIS = ('B', 'I', 'A')
+
+def erro_campos_estudante(dados):
+# confere a presença, o tamanho e o formato dos campos de uma linha, antes das regras do "EstudanteSerializer"
+
+    for campo, tamanho in (('nome', 100), ('email', 30), ('cpf', 11), ('data_nascimento', 10), ('celular', 14)):
+        valor = dados.get(campo)
+        if not isinstance(valor, str) or not valor:
+            return f'{campo}: Este campo é obrigatório.'
+        if len(valor) > tamanho:
+            return f'{campo}: Certifique-se de que este campo não tenha mais de {tamanho} caracteres.'
+    try:
+        validate_email(dados['email'])
+    except ValidationError:
+        return 'email: Insira um endereço de email válido.'
+    try:
+        date.fromisoformat(dados['data_nascimento'])
+    except ValueError:
+        return 'data_nascimento: Formato inválido para data. Use AAAA-MM-DD.'
+    return None
+
+def erros_estudantes(linhas):
+# aplica as mesmas regras do "EstudanteSerializer" a um lote de linhas, validando as colunas de cpf, nome e celular de uma vez
+# com as versões em lote de "escola.validators". Retorna a mensagem de erro (ou None) de cada linha
+
+    erros = [erro_campos_estudante(dados) for dados in linhas]
+    completas = [dados for dados, erro in zip(linhas, erros) if erro is None]
+    verificacoes = zip(
+        cpfs_invalidos([dados['cpf'] for dados in completas]),
+        nomes_invalidos([dados['nome'] for dados in completas]),
+        celulares_invalidos([dados['celular'] for dados in completas]),
+    )
+    for indice, erro in enumerate(erros):
+        if erro is not None:
+            continue
+        cpf, nome, celular = next(verificacoes)
+        if cpf:
+            erros[indice] = 'cpf: CPF inválido!'
+        elif nome:
+            erros[indice] = 'nome: O nome só pode ter letras'
+        elif celular:
+            erros[indice] = 'celular: O celular inválido. ex:11901234567'
+    return erros
+
+def erro_curso(dados):
+# aplica as regras do model "Curso" a uma linha do arquivo
+
+    codigo = dados.get('codigo')
+    if not isinstance(codigo, str) or not 3 <= len(codigo) <= 10:
+        return 'codigo: deve ter entre 3 e 10 caracteres.'
+    descricao = dados.get('descricao')
+    if not isinstance(descricao, str) or not descricao or len(descricao) > 100:
+        return 'descricao: deve ter entre 1 e 100 caracteres.'
+    if dados.get('nivel', 'B') not in NIVEIS:
+        return f'nivel: escolha entre {", ".join(NIVEIS)}.'
+    return None
+
+def erros_cursos(linhas):
+    return [erro_curso(dados) for dados in linhas]
+
+VALIDADORES = {
+    'estudantes': erros_estudantes,
+    'cursos': erros_cursos,
+}
+
+def decodificar(linha):
+# as linhas do CSV já chegam como dicionário; as do NDJSON chegam como texto e são convertidas aqui, nos processos de validação.
+# Retorna (dados, erro)
+
+    if not isinstance(linha, str):
+        return linha, None
+    try:
+        dados = json.loads(linha)
+    except ValueError as erro:
+        return None, f'JSON inválido ({erro}).'
+    if not isinstance(dados, dict):
+        return None, 'a linha deve ser um objeto JSON.'
+    return dados, None
+
+def validar_lote(modelo, lote):
+# executado nos processos de validação: separa as linhas válidas das inválidas de um lote de (número da linha, linha)
+
+    decodificadas, invalidas = [], []
+    for numero, linha in lote:
+        dados, erro = decodificar(linha)
+        if erro:
+            invalidas.append((numero, erro))
+        else:
+            decodificadas.append((numero, dados))
+    erros = VALIDADORES[modelo]([dados for _, dados in decodificadas])
+    validas = []
+    for (numero, dados), erro in zip(decodificadas, erros):
+        if erro:
+            invalidas.append((numero, erro))
+        else:
+            validas.append((numero, dados))
+    invalidas.sort()
+    return validas, invalidas
+
+def ler_linhas(caminho, formato):
+# lê o arquivo linha a linha (CSV com cabeçalho ou NDJSON), numerando as linhas de dados do CSV a partir de 1 e as do NDJSON pela
+# posição no arquivo (contando as linhas em branco, que são puladas). As linhas do NDJSON seguem como texto, para que uma linha
+# mal formada seja reportada como inválida sem interromper a importação
+
+    with open(caminho, encoding='utf-8', newline='') as arquivo:
+        if formato == 'csv':
+            yield from enumerate(csv.DictReader(arquivo), start=1)
+        else:
+            for numero, texto in enumerate(arquivo, start=1):
+                if texto.strip():
+                    yield numero, texto
+
+def lotes(linhas, tamanho):
+    while True:
+        lote = list(islice(linhas, tamanho))
+        if not lote:
+            return
+        yield lote
+
+
+class Command(BaseCommand):
+    """Classe Command
+
+    Intenção :
+    Comando "python manage.py importar <arquivo>" para a carga de estudantes ou cursos a partir de um arquivo CSV ou NDJSON. Substitui
+    os scripts "popular_banco_*.py" para cargas grandes: o arquivo é lido aos poucos, a validação (o CPF é o mais custoso) é feita em
+    paralelo por vários processos e a gravação usa "bulk_create" em lotes, cada lote em sua própria transação.
+
+    Argumentos :
+    "BaseCommand" : classe padrão do Django para os comandos do "manage.py".
+
+    Atributos :
+    "add_arguments" : opções do comando ("--modelo", "--formato", "--tamanho-lote", "--processos" e "--retomar").
+    "handle" : executa a importação. Após cada lote gravado salva o número da última linha em "<arquivo>.progresso", e com
+    "--retomar" continua a partir dele depois de uma falha. O progresso é mostrado em linhas por segundo.
+    """
+
+    help = 'Importa estudantes ou cursos de um arquivo CSV ou NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo')
+        parser.add_argument('--modelo', choices=sorted(VALIDADORES), default='estudantes')
+        parser.add_argument('--formato', choices=['csv', 'ndjson'], help='por padrão, a extensão do arquivo')
+        parser.add_argument('--tamanho-lote', type=int, default=5000)
+        parser.add_argument('--processos', type=int, default=os.cpu_count(), help='0 valida no próprio processo')
+        parser.add_argument('--retomar', action='store_true', help='continua do ponto salvo em "<arquivo>.progresso"')
+
+    def handle(self, *args, **options):
+        from django.db import transaction
+        from escola.models import Estudante, Curso
+        from escola.cache import invalidar_modelo
+
+        caminho = options['arquivo']
+        if not os.path.exists(caminho):
+            raise CommandError(f'Arquivo "{caminho}" não encontrado.')
+        formato = options['formato'] or ('csv' if caminho.endswith('.csv') else 'ndjson')
+        modelo = options['modelo']
+        classe, chave = {'estudantes': (Estudante, 'cpf'), 'cursos': (Curso, 'codigo')}[modelo]
+
+        arquivo_progresso = caminho + '.progresso'
+        inicio = 0
+        if options['retomar'] and os.path.exists(arquivo_progresso):
+            with open(arquivo_progresso) as progresso:
+                inicio = json.load(progresso)['linha']
+            self.stdout.write(f'Retomando após a linha {inicio}.')
+
+        linhas = ((numero, dados) for numero, dados in ler_linhas(caminho, formato) if numero > inicio)
+        executor = ProcessPoolExecutor(options['processos']) if options['processos'] else None
+        gravados = ignorados = invalidos = 0
+        comeco = time.perf_counter()
+
+        def validar(lote):
+            if executor:
+                return executor.submit(validar_lote, modelo, lote)
+            return validar_lote(modelo, lote)
+
+        def gravar(resultado):
+            nonlocal gravados, ignorados, invalidos
+            validas, invalidas = resultado.result() if executor else resultado
+            for numero, erro in invalidas:
+                self.stderr.write(f'linha {numero}: {erro}')
+            invalidos += len(invalidas)
+
+            with transaction.atomic():
+                chaves = {dados[chave] for _, dados in validas}
+                existentes = set(classe.objects.filter(**{f'{chave}__in': chaves}).values_list(chave, flat=True)) if chaves else set()
+                novos = []
+                for _, dados in validas:
+                    if dados[chave] in existentes:
+                        ignorados += 1
+                        continue
+                    existentes.add(dados[chave])
+                    novos.append(classe(**{campo.name: dados[campo.name] for campo in classe._meta.concrete_fields if campo.name in dados and not campo.primary_key}))
+                classe.objects.bulk_create(novos, batch_size=options['tamanho_lote'])
+            gravados += len(novos)
+
+            ultima = max([numero for numero, _ in validas] + [numero for numero, _ in invalidas])
+            with open(arquivo_progresso, 'w') as progresso:
+                json.dump({'linha': ultima}, progresso)
+            decorrido = time.perf_counter() - comeco
+            processados = gravados + ignorados + invalidos
+            self.stdout.write(f'{processados} linhas processadas ({processados / decorrido:.0f} linhas/s)')
+
+        try:
+            # mantém no máximo 2 lotes por processo em validação, para a memória não crescer com o tamanho do arquivo
+            pendentes = deque()
+            limite = max(1, 2 * (options['processos'] or 0))
+            for lote in lotes(linhas, options['tamanho_lote']):
+                pendentes.append(validar(lote))
+                if len(pendentes) >= limite:
+                    gravar(pendentes.popleft())
+            while pendentes:
+                gravar(pendentes.popleft())
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+            if gravados:
+                invalidar_modelo(classe)
+
+        if os.path.exists(arquivo_progresso):
+            os.remove(arquivo_progresso)
+        decorrido = time.perf_counter() - comeco
+        self.stdout.write(self.style.SUCCESS(
+            f'{gravados} gravados, {ignorados} já existentes, {invalidos} inválidos em {decorrido:.1f}s'
+        ))
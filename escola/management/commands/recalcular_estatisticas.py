@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from escola.estatisticas import instalar_estatisticas, recalcular_estatisticas
+
+
+class Command(BaseCommand):
+    """Classe Command
+
+    Intenção :
+    Comando "python manage.py recalcular_estatisticas" que refaz do zero a tabela de estatísticas das matrículas
+    ("EstatisticaMatricula"), contando novamente todas as matrículas. Os triggers já mantêm a tabela atualizada; o comando serve para
+    corrigir a tabela depois de uma alteração feita com os triggers desativados (ex: restauração de um backup parcial).
+
+    Argumentos :
+    "BaseCommand" : classe padrão do Django para os comandos do "manage.py".
+
+    Atributos :
+    "add_arguments" : "--database" escolhe o banco (padrão "default").
+    "handle" : reinstala os triggers que estiverem faltando e recalcula a tabela em uma única transação.
+    """
+
+    help = 'Recalcula a tabela de estatísticas das matrículas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError('As estatísticas só usam a tabela de resumo no SQLite; nos outros bancos são calculadas na consulta.')
+        instalar_estatisticas(connection)
+        linhas = recalcular_estatisticas(connection)
+        self.stdout.write(f'{linhas} linha(s) de estatísticas recalculada(s).')
@@ -0,0 +1,38 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from escola.replicas import replicas, sincronizar_replicas
+
+
+class Command(BaseCommand):
+    """Classe Command
+
+    Intenção :
+    Comando "python manage.py sincronizar_replicas" que copia o banco principal para as réplicas de leitura ("BANCO_REPLICAS" no
+    settings) com a API de backup do SQLite. Faz o papel da replicação de um banco de produção no ambiente local: as réplicas ficam
+    atrasadas em relação ao principal no máximo pelo intervalo entre as cópias.
+
+    Argumentos :
+    "BaseCommand" : classe padrão do Django para os comandos do "manage.py".
+
+    Atributos :
+    "add_arguments" : "--intervalo" repete a cópia a cada N segundos até o comando ser interrompido (padrão: uma única cópia).
+    "handle" : copia para cada réplica, mostrando o tempo de cada sincronização.
+    """
+
+    help = 'Copia o banco principal para as réplicas de leitura'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--intervalo', type=float, help='segundos entre as cópias (ex: o "REPLICAS_INTERVALO" do settings)')
+
+    def handle(self, *args, **options):
+        if not replicas():
+            raise CommandError('Nenhuma réplica configurada (defina "BANCO_REPLICAS").')
+
+        intervalo = options['intervalo']
+        while True:
+            inicio = time.monotonic()
+            sincronizadas = sincronizar_replicas()
+            self.stdout.write(f'{", ".join(sincronizadas) or "nenhuma réplica"} sincronizada(s) em {time.monotonic() - inicio:.3f}s')
+            if intervalo is None:
+                return
+            time.sleep(max(0, intervalo - (time.monotonic() - inicio)))
@@ -0,0 +1,71 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.middleware import clickjacking, common, csrf, security
+
+class SemThreadMixin:
+    """Classe SemThreadMixin
+
+    Intenção :
+    No servidor ASGI o "MiddlewareMixin" do Django executa cada "process_request" e "process_response" em uma thread, através do
+    "sync_to_async", mesmo quando eles apenas leem a requisição e acrescentam cabeçalhos na resposta. Com os middlewares do
+    projeto são mais de 10 trocas de thread por requisição, o que anula a leitura assíncrona ("escola/assincrono.py"). Este mixin
+    executa esses métodos direto no loop de eventos, voltando para a thread apenas quando "precisa_thread" indicar que o
+    "process_response" pode acessar o banco.
+
+    Argumentos :
+    Deve vir antes do middleware do Django na herança. Só deve ser usado no servidor ASGI (ver "LEITURA_ASSINCRONA" no settings),
+    pois no WSGI o "process_view" assíncrono passaria a ser executado pelo "async_to_sync".
+
+    Atributos :
+    "precisa_thread" : por padrão False, para os middlewares que nunca acessam o banco.
+    """
+
+    def precisa_thread(self, request):
+        return False
+
+    async def __acall__(self, request):
+        response = None
+        if hasattr(self, 'process_request'):
+            response = self.process_request(request)
+        response = response or await self.get_response(request)
+        if hasattr(self, 'process_response'):
+            if self.precisa_thread(request):
+                response = await sync_to_async(self.process_response, thread_sensitive=True)(request, response)
+            else:
+                response = self.process_response(request, response)
+        return response
+
+
+class SecurityMiddleware(SemThreadMixin, security.SecurityMiddleware):
+    pass
+
+class SessionMiddleware(SemThreadMixin, sessions.SessionMiddleware):
+    # a sessão só é carregada (e gravada) quando a view a usa, como no admin; a API não usa a sessão
+
+    def precisa_thread(self, request):
+        return getattr(request, 'session', None) is not None and request.session.accessed
+
+class CommonMiddleware(SemThreadMixin, common.CommonMiddleware):
+    pass
+
+class CsrfViewMiddleware(SemThreadMixin, csrf.CsrfViewMiddleware):
+    # com o token no cookie (o padrão, "CSRF_USE_SESSIONS = False") a verificação não acessa o banco
+
+    async def process_view(self, request, callback, callback_args, callback_kwargs):
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+class AuthenticationMiddleware(SemThreadMixin, auth.AuthenticationMiddleware):
+    # o "request.user" continua sendo carregado apenas quando usado
+    pass
+
+class MessageMiddleware(SemThreadMixin, messages.MessageMiddleware):
+    # as mensagens só são gravadas (na sessão ou no cookie) quando a view as usa, como no admin
+
+    def precisa_thread(self, request):
+        armazenamento = getattr(request, '_messages', None)
+        return armazenamento is not None and (armazenamento.used or armazenamento.added_new)
+
+class XFrameOptionsMiddleware(SemThreadMixin, clickjacking.XFrameOptionsMiddleware):
+    pass
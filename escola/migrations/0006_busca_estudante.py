@@ -0,0 +1,21 @@
+from django.db import migrations
+from escola.busca import instalar_busca, remover_busca
+
+
+def instalar(apps, schema_editor):
+    instalar_busca(schema_editor.connection)
+
+
+def remover(apps, schema_editor):
+    remover_busca(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('escola', '0005_atualizado_em'),
+    ]
+
+    operations = [
+        migrations.RunPython(instalar, remover),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.3 on 2026-10-18 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('escola', '0006_busca_estudante'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='matricula',
+            name='curso',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='escola.curso'),
+        ),
+        migrations.AlterField(
+            model_name='matricula',
+            name='estudante',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='escola.estudante'),
+        ),
+        migrations.AddIndex(
+            model_name='estudante',
+            index=models.Index(fields=['nome', 'id'], name='estudante_nome_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matricula',
+            index=models.Index(fields=['estudante', 'id', 'curso', 'periodo', 'atualizado_em'], name='matricula_estudante_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matricula',
+            index=models.Index(fields=['curso', 'id', 'estudante', 'periodo', 'atualizado_em'], name='matricula_curso_idx'),
+        ),
+    ]
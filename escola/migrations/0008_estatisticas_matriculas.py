@@ -0,0 +1,37 @@
+# Generated by Django 5.0.3 on 2026-10-18 12:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+from escola.estatisticas import instalar_estatisticas, remover_estatisticas
+
+
+def instalar(apps, schema_editor):
+    instalar_estatisticas(schema_editor.connection)
+
+
+def remover(apps, schema_editor):
+    remover_estatisticas(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('escola', '0007_indices_consultas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstatisticaMatricula',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('periodo', models.CharField(choices=[('M', 'Matutino'), ('V', 'Vespertino'), ('N', 'Noturno')], max_length=1)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('curso', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='escola.curso')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='estatisticamatricula',
+            constraint=models.UniqueConstraint(fields=('curso', 'periodo'), name='estatistica_curso_periodo_unica'),
+        ),
+        migrations.RunPython(instalar, remover),
+    ]
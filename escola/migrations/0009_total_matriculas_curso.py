@@ -0,0 +1,34 @@
+# Generated by Django 5.0.3 on 2026-10-18 13:05
+
+from django.db import migrations, models
+from escola.estatisticas import instalar_estatisticas, remover_estatisticas
+
+
+def reinstalar(apps, schema_editor):
+    # troca os triggers da 0008 pelos que também mantêm o "total_matriculas", preenchido com as matrículas existentes
+    remover_estatisticas(schema_editor.connection)
+    instalar_estatisticas(schema_editor.connection)
+
+
+def remover(apps, schema_editor):
+    remover_estatisticas(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('escola', '0008_estatisticas_matriculas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='curso',
+            name='total_matriculas',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='curso',
+            index=models.Index(fields=['total_matriculas', 'id'], name='curso_total_matriculas_idx'),
+        ),
+        migrations.RunPython(reinstalar, remover),
+    ]
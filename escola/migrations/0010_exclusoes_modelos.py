@@ -0,0 +1,30 @@
+# Generated by Django 5.0.3 on 2026-10-18 14:03
+
+from django.db import migrations, models
+from escola.cache import instalar_exclusoes, remover_exclusoes
+
+
+def instalar(apps, schema_editor):
+    instalar_exclusoes(schema_editor.connection)
+
+
+def remover(apps, schema_editor):
+    remover_exclusoes(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('escola', '0009_total_matriculas_curso'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExclusaoModelo',
+            fields=[
+                ('tabela', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('momento', models.DateTimeField()),
+            ],
+        ),
+        migrations.RunPython(instalar, remover),
+    ]
@@ -19,6 +19,8 @@ class Estudante(models.Model):
         cpf (str) : Cpf do Estudante, de até 11 caracteres e único na Tabela 
         data_nascimento (date): Data de nascimento do Estudante
         celular (str) : Número de celular do Estudante e de até 14 caracteres
+        atualizado_em (datetime) : Data e hora da última alteração, preenchida automaticamente a cada "save" (usada nos cabeçalhos ETag/Last-Modified)
+        Meta.indexes : índice (nome, id) para a ordenação por nome da API ("?ordering=nome") e do admin, já com o "id" de desempate
 
     Return: Retorno o "nome" do meu "Estudante" quando instanciado à minha classe
     """
@@ -28,6 +30,12 @@ class Estudante(models.Model):
     cpf = models.CharField(max_length = 11, unique=True)
     data_nascimento = models.DateField()
     celular = models.CharField(max_length = 14)
+    atualizado_em = models.DateTimeField(auto_now = True, db_index = True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields = ['nome', 'id'], name = 'estudante_nome_id_idx'),
+        ]
 
     def __str__(self):
         return self.nome
@@ -46,6 +54,10 @@ class Curso(models.Model):
         codigo (str): Abreviação do curso, de até 10 caracteres, valor único na tabela e  mínimo de 3 caracteres. 
         descição (str) : Resumo do curso, de até 100 caracteres e preenchimento obrigatório 
         nível : Nível do curso, de apenas 1 caracter, escolhas na tupla "NIVEL", preenchimento obrigatório e por padrão "B" ("Básico")
+        atualizado_em (datetime) : Data e hora da última alteração, preenchida automaticamente a cada "save"
+        total_matriculas (int) : Quantidade de matrículas do curso, mantida pelos triggers de "escola/estatisticas.py" na mesma
+        transação de cada matrícula criada (inclusive em lote), alterada ou apagada (inclusive em cascata). Não é alterada pelo Django.
+        Meta.indexes : índice (total_matriculas, id) para a ordenação "cursos/?ordering=-total_matriculas"
 
     Return: 
         Retorno o "codigo" do meu "Curso" quando instanciada à minha classe
@@ -60,6 +72,26 @@ class Curso(models.Model):
     codigo = models.CharField(max_length = 10, unique = True, validators=[MinLengthValidator(3)])
     descricao = models.CharField(max_length = 100, blank = False)
     nivel = models.CharField(max_length = 1, choices = NIVEL, blank = False, null = False, default = 'B')
+    atualizado_em = models.DateTimeField(auto_now = True, db_index = True)
+    total_matriculas = models.PositiveIntegerField(default = 0, editable = False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields = ['total_matriculas', 'id'], name = 'curso_total_matriculas_idx'),
+        ]
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        # o UPDATE de um curso já existente não grava o "total_matriculas" lido antes, que sobrescreveria as matrículas gravadas
+        # pelos triggers nesse meio tempo (ex: o PUT de "cursos/<pk>/"). Quando a linha não existe o Django segue para o INSERT,
+        # que grava todos os campos
+        values = [valor for valor in values if valor[0].name != 'total_matriculas']
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
+    def _do_insert(self, manager, using, fields, returning_fields, raw):
+        # uma linha nova ainda não tem matrículas, mesmo quando é a cópia de outro curso ("pk = None"); as fixtures ("raw") não mudam
+        if not raw:
+            self.total_matriculas = 0
+        return super()._do_insert(manager, using, fields, returning_fields, raw)
 
     def __str__(self):
         return self.codigo
@@ -78,6 +110,10 @@ class Matricula(models.Model):
             curso : Chave estrangeira de "Curso".
             observação: Se curso ou estudante instanciado deixe de existir, será apagado também a matricula.
             periodo : Horário que o estudante escolheu, de apenas 1 caracter, escolhas na tupla "PERIODO", preenchimento obrigatório e por padrão "M" (matutino)
+            atualizado_em : Data e hora da última alteração, preenchida automaticamente a cada "save"
+            Meta.indexes : um índice para cada lado da matrícula, começando pela chave estrangeira e seguido pelo "id" (a ordem das
+            rotas "estudantes/<pk>/matriculas/" e "cursos/<pk>/matriculas/"). As demais colunas fazem o índice "cobrir" a consulta,
+            que não precisa ler a tabela. Eles substituem os índices simples das chaves estrangeiras ("db_index = False").
 
         Return: Retorno o "codigo" do meu "Curso" quando instanciada à minha classe
     """    
@@ -89,6 +125,60 @@ class Matricula(models.Model):
         ('N','Noturno'),
     )
 
-    estudante = models.ForeignKey(Estudante,on_delete = models.CASCADE)
-    curso = models.ForeignKey(Curso,on_delete = models.CASCADE)
-    periodo = models.CharField(max_length = 1, choices = PERIODO, blank = False, null = False, default = 'M')
\ No newline at end of file
+    estudante = models.ForeignKey(Estudante,on_delete = models.CASCADE, db_index = False)
+    curso = models.ForeignKey(Curso,on_delete = models.CASCADE, db_index = False)
+    periodo = models.CharField(max_length = 1, choices = PERIODO, blank = False, null = False, default = 'M')
+    atualizado_em = models.DateTimeField(auto_now = True, db_index = True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields = ['estudante', 'id', 'curso', 'periodo', 'atualizado_em'], name = 'matricula_estudante_idx'),
+            models.Index(fields = ['curso', 'id', 'estudante', 'periodo', 'atualizado_em'], name = 'matricula_curso_idx'),
+        ]
+
+class EstatisticaMatricula(models.Model):
+    """Classe EstatisticaMatricula
+
+        Intenção:
+            Tabela de resumo com a quantidade de matrículas de cada curso em cada período, usada pela rota
+            "matriculas/estatisticas/". Não é alterada pelo Django: os triggers de "escola/estatisticas.py" a atualizam na mesma
+            transação de cada matrícula criada, alterada ou apagada, e o comando "recalcular_estatisticas" a refaz do zero.
+
+        Argumentos:
+           Por padrão o uso do "models.Model"
+
+        Atributos:
+            curso : Curso contado, sem chave estrangeira no banco ("db_constraint = False") para que a exclusão de um curso não
+            precise apagar as suas linhas; elas somem quando as matrículas do curso são apagadas e o total chega a 0.
+            periodo : Período das matrículas contadas, as mesmas escolhas de "Matricula.PERIODO".
+            total : Quantidade de matrículas do curso no período.
+            Meta.constraints : uma linha por (curso, período), também usada pelo "ON CONFLICT" dos triggers.
+    """
+
+    curso = models.ForeignKey(Curso, on_delete = models.DO_NOTHING, db_constraint = False, db_index = False, related_name = '+')
+    periodo = models.CharField(max_length = 1, choices = Matricula.PERIODO)
+    total = models.PositiveIntegerField(default = 0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields = ['curso', 'periodo'], name = 'estatistica_curso_periodo_unica'),
+        ]
+
+class ExclusaoModelo(models.Model):
+    """Classe ExclusaoModelo
+
+        Intenção:
+            Momento da última exclusão em cada tabela, usado no "Last-Modified" das listagens (ver "RequisicaoCondicionalMixin"), já
+            que uma linha apagada não deixa "atualizado_em" para ser consultado. Fica no banco, e não no cache local de cada processo,
+            para valer para todos os workers; é atualizada pelos triggers de "escola/cache.py", na mesma transação da exclusão.
+
+        Argumentos:
+           Por padrão o uso do "models.Model"
+
+        Atributos:
+            tabela : Nome da tabela ("db_table") do model, uma linha por tabela.
+            momento : Data e hora da última exclusão.
+    """
+
+    tabela = models.CharField(max_length = 100, primary_key = True)
+    momento = models.DateTimeField()
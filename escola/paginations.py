@@ -0,0 +1,209 @@
+import json
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination, CursorPagination, _reverse_ordering
+
+class EscolaCursorPagination(CursorPagination):
+    # paginação por cursor (keyset): navega pela posição da última linha vista ao invés de "OFFSET", sem o "COUNT(*)" de cada página.
+    # os links "next"/"previous" trazem o cursor codificado, opaco para o cliente.
+    # o cursor do Django Rest guarda apenas o valor do primeiro campo da ordenação e pula os empates com um "OFFSET" (limitado a
+    # 1000 linhas pelo "offset_cutoff"); aqui a posição guarda todos os campos da ordenação (ex: nome e id), e a página seguinte é
+    # filtrada por "nome > x OR (nome = x AND id > y)", sem "OFFSET" mesmo com muitos nomes repetidos.
+    ordering = 'id'
+
+    def get_ordering(self, request, queryset, view):
+    # respeita o "OrderingFilter" da view (ex: "?ordering=nome") e acrescenta o "id" como desempate para a ordem ser sempre a mesma
+
+        ordering = super().get_ordering(request, queryset, view)
+        if not {'id', '-id', 'pk', '-pk'} & set(ordering):
+            ordering += ('-id',) if ordering[0].startswith('-') else ('id',)
+        return ordering
+
+    def _get_position_from_instance(self, instance, ordering):
+    # posição da linha: os valores de todos os campos da ordenação, em JSON (só com caracteres ASCII, como o cursor exige)
+
+        campos = [campo.lstrip('-') for campo in ordering]
+        if isinstance(instance, dict):
+            valores = [instance[campo] for campo in campos]
+        else:
+            valores = [getattr(instance, campo) for campo in campos]
+        return json.dumps(valores, cls=DjangoJSONEncoder)
+
+    def filtro_posicao(self, posicao, reverse):
+    # linhas depois da posição na ordem pedida: "a > x OR (a = x AND b > y) OR ...", com "<" nos campos decrescentes (invertido
+    # quando o cursor volta para a página anterior). A condição "a >= x" à frente deixa o banco usar o índice do primeiro campo
+
+        try:
+            valores = json.loads(posicao)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(valores, list) or len(valores) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        filtro, iguais = Q(), Q()
+        for campo, valor in zip(self.ordering, valores):
+            operador = 'lt' if campo.startswith('-') != reverse else 'gt'
+            filtro |= iguais & Q(**{f'{campo.lstrip("-")}__{operador}': valor})
+            iguais &= Q(**{campo.lstrip('-'): valor})
+        primeiro = self.ordering[0]
+        operador = 'lte' if primeiro.startswith('-') != reverse else 'gte'
+        return Q(**{f'{primeiro.lstrip("-")}__{operador}': valores[0]}) & filtro
+
+    def paginate_queryset(self, queryset, request, view=None):
+    # mesmo fluxo do "CursorPagination.paginate_queryset" do Django Rest, trocando o filtro pelo primeiro campo pelo "filtro_posicao"
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            try:
+                queryset = queryset.filter(self.filtro_posicao(current_position, reverse))
+            except (TypeError, ValueError, ValidationError):
+                # valores que não correspondem aos campos (cursor alterado pelo cliente)
+                raise NotFound(self.invalid_cursor_message)
+
+        # a linha a mais indica se existe uma próxima página
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+class EscolaPagination(PageNumberPagination):
+    """Classe EscolaPagination
+
+    Intenção :
+    Paginação padrão da API. Por padrão continua sendo a paginação por número de página ("?page=2"), mas o cliente pode optar pela
+    paginação por cursor enviando "?paginacao=cursor". A partir daí as próximas páginas são seguidas pelos links "next"/"previous",
+    que já trazem o parâmetro "cursor".
+
+    Argumentos :
+    "PageNumberPagination" : paginação por número de página do Django Rest, usada quando o modo cursor não é pedido.
+
+    Atributos :
+    "modo_query_param" : nome do parâmetro que escolhe o modo de paginação.
+    "cursor_pagination_class" : classe usada no modo cursor.
+    "apaginate_queryset" : versão assíncrona da paginação por número de página, usada pela leitura assíncrona ("escola/assincrono.py").
+    "suporta_assincrono" : o modo cursor continua apenas no caminho síncrono.
+    Os demais métodos apenas repassam a chamada para o paginador por cursor quando ele estiver em uso.
+    """
+
+    modo_query_param = 'paginacao'
+    cursor_pagination_class = EscolaCursorPagination
+    cursor_paginator = None
+
+    def usar_cursor(self, request):
+        return (
+            request.query_params.get(self.modo_query_param) == 'cursor'
+            or self.cursor_pagination_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.usar_cursor(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def suporta_assincrono(self, request):
+        return not self.usar_cursor(request)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+    # mesmo resultado do "paginate_queryset" por número de página, com o COUNT e a leitura da página feitos pelo ORM assíncrono
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            numero = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+        inicio = (numero - 1) * paginator.per_page
+        fim = inicio + paginator.per_page
+        if fim + paginator.orphans >= paginator.count:
+            fim = paginator.count
+        linhas = [linha async for linha in queryset[inicio:fim].aiterator()]
+        self.page = paginator._get_page(linhas, numero, paginator)
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return linhas
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
+
+    def get_schema_operation_parameters(self, view):
+        parametros = super().get_schema_operation_parameters(view)
+        parametros += [
+            {
+                'name': self.modo_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Use "cursor" para a paginação por cursor.',
+                'schema': {'type': 'string', 'enum': ['cursor']},
+            },
+            {
+                'name': self.cursor_pagination_class.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': self.cursor_pagination_class.cursor_query_description,
+                'schema': {'type': 'string'},
+            },
+        ]
+        return parametros
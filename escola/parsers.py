@@ -0,0 +1,47 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from escola.renderers import JSONRapidoRenderer, MessagePackRenderer, orjson, msgpack
+
+class JSONRapidoParser(JSONParser):
+    """Classe JSONRapidoParser
+
+    Intenção :
+    Parser JSON das requisições usando o "orjson". Assim como o "JSONParser" do Django Rest, não aceita NaN/Infinity e responde
+    400 ("ParseError") para um JSON inválido.
+
+    Argumentos :
+    "JSONParser" : parser JSON padrão do Django Rest, usado quando o "orjson" não está instalado ou a codificação não é UTF-8.
+    """
+
+    renderer_class = JSONRapidoRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+class MessagePackParser(BaseParser):
+    """Classe MessagePackParser
+
+    Intenção :
+    Parser das requisições enviadas em MessagePack ("Content-Type: application/msgpack"), para os clientes internos entre serviços.
+
+    Argumentos :
+    "BaseParser" : classe base dos parsers do Django Rest. Precisa do pacote "msgpack" instalado.
+    """
+
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
@@ -0,0 +1,91 @@
+import threading
+import time
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+CHAVE_VERSAO = 'escola:permissoes:versao'
+# versão geral, incrementada quando grupos, permissões ou as permissões de um grupo mudam
+
+PERMISSOES_GUARDADAS = {}
+# (pk do usuário, "user" ou "group") -> (versões, expira em, permissões), separado por processo
+_trava_permissoes = threading.Lock()
+
+def chave_versao_usuario(pk):
+    return f'{CHAVE_VERSAO}:usuario:{pk}'
+
+def incrementar_versao(chave):
+    cache.add(chave, 0, timeout=None)
+    try:
+        cache.incr(chave)
+    except ValueError:
+        cache.set(chave, 1, timeout=None)
+
+def invalidar_permissoes(pk=None):
+# com o pk invalida apenas as permissões guardadas daquele usuário, sem ele as de todos os usuários
+
+    incrementar_versao(CHAVE_VERSAO if pk is None else chave_versao_usuario(pk))
+
+def versoes_permissoes(user):
+# versão geral e versão do usuário, lidas uma vez por requisição (o usuário é carregado a cada requisição pela autenticação)
+
+    if not hasattr(user, '_versoes_permissoes'):
+        chaves = [CHAVE_VERSAO, chave_versao_usuario(user.pk)]
+        valores = cache.get_many(chaves)
+        user._versoes_permissoes = tuple(valores.get(chave, 0) for chave in chaves)
+    return user._versoes_permissoes
+
+def permissoes_guardadas(user, origem):
+    with _trava_permissoes:
+        guardadas = PERMISSOES_GUARDADAS.get((user.pk, origem))
+    if guardadas is None:
+        return None
+    versoes, expira_em, permissoes = guardadas
+    if versoes != versoes_permissoes(user) or expira_em < time.monotonic():
+        return None
+    return permissoes
+
+def guardar_permissoes(user, origem, versoes, permissoes):
+    with _trava_permissoes:
+        PERMISSOES_GUARDADAS[(user.pk, origem)] = (versoes, time.monotonic() + settings.PERMISSOES_CACHE_TEMPO, frozenset(permissoes))
+
+def limpar_permissoes():
+    with _trava_permissoes:
+        PERMISSOES_GUARDADAS.clear()
+
+
+class PermissoesCacheBackend(ModelBackend):
+    """Classe PermissoesCacheBackend
+
+    Intenção :
+    O mesmo "ModelBackend" do Django (login, "has_perm", "get_all_permissions"), com as permissões de cada usuário guardadas no
+    processo. Sem o cache, o "DjangoModelPermissions" (e a chave do cache de respostas, ver "assinatura_permissoes") consulta as
+    permissões do usuário e dos seus grupos a cada requisição, já que o usuário é carregado novamente em todas elas.
+    As decisões são as mesmas: o backend guarda exatamente os conjuntos calculados pelo "ModelBackend", e as verificações de usuário
+    ativo, anônimo e superusuário continuam sendo feitas com o usuário atual.
+
+    Argumentos :
+    "ModelBackend" : backend padrão do Django, configurado no "AUTHENTICATION_BACKENDS".
+
+    Atributos :
+    "_get_permissions" : permissões do próprio usuário ("user") ou dos grupos ("group"), do cache enquanto as versões não mudarem e
+    por até "PERMISSOES_CACHE_TEMPO" segundos. As versões são incrementadas pelos signals de usuários, grupos e permissões (ver
+    "escola/signals.py"); o tempo cobre as alterações que não disparam signals (ex: "bulk_create" na tabela de grupos do usuário)
+    e os outros processos, quando o "CACHES" não é compartilhado.
+    """
+
+    def _get_permissions(self, user_obj, obj, from_name):
+        nome_cache = f'_{from_name}_perm_cache'
+        if obj is not None or not user_obj.is_active or user_obj.is_anonymous or hasattr(user_obj, nome_cache):
+            return super()._get_permissions(user_obj, obj, from_name)
+
+        guardadas = permissoes_guardadas(user_obj, from_name)
+        if guardadas is not None:
+            setattr(user_obj, nome_cache, set(guardadas))
+            return getattr(user_obj, nome_cache)
+
+        versoes = versoes_permissoes(user_obj)
+        # lidas antes da consulta: uma alteração feita durante a consulta incrementa a versão e descarta o que for guardado
+        permissoes = super()._get_permissions(user_obj, obj, from_name)
+        guardar_permissoes(user_obj, from_name, versoes, permissoes)
+        return permissoes
@@ -0,0 +1,64 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+# "orjson" e "msgpack" estão no "requirements.txt" (o "test_formatos_rapidos_em_uso" falha sem eles); em um ambiente sem o orjson o
+# "JSONRapidoRenderer" usa o json padrão do Django Rest
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+valor_padrao = encoders.JSONEncoder().default
+# converte os tipos que o orjson/msgpack não conhecem (datas, Decimal, textos traduzidos...) da mesma forma que o Django Rest
+
+class JSONRapidoRenderer(JSONRenderer):
+    """Classe JSONRapidoRenderer
+
+    Intenção :
+    Renderer JSON da API usando o "orjson", bem mais rápido que o json padrão, e gerando os mesmos bytes que o "JSONRenderer" do
+    Django Rest: sem espaços, com os acentos em UTF-8, as datas pelo mesmo encoder e os caracteres \\u2028/\\u2029 escapados.
+
+    Argumentos :
+    "JSONRenderer" : renderer JSON padrão do Django Rest, usado quando o "orjson" não está instalado, quando a resposta é pedida
+    indentada (ex: navegador da API ou "Accept: application/json; indent=4") ou quando o orjson não consegue codificar os dados.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None or data is None or not self.compact or self.ensure_ascii or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=valor_padrao, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+class MessagePackRenderer(BaseRenderer):
+    """Classe MessagePackRenderer
+
+    Intenção :
+    Renderer MessagePack (formato binário e compacto) para os clientes internos entre serviços, escolhido pelo cabeçalho
+    "Accept: application/msgpack" ou por "?format=msgpack". Os dados são os mesmos do JSON (as datas seguem como texto ISO 8601).
+
+    Argumentos :
+    "BaseRenderer" : classe base dos renderers do Django Rest. Precisa do pacote "msgpack" instalado.
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=valor_padrao, use_bin_type=True)
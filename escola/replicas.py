@@ -0,0 +1,142 @@
+import itertools
+import sqlite3
+from contextlib import closing
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+PREFIXO = 'escola:replica'
+
+banco_leitura = ContextVar('banco_leitura', default=None)
+# réplica usada pelas leituras da requisição atual (definida pelo "LeituraReplicaMixin"), ou None para o banco principal.
+# Por ser uma "ContextVar" vale tanto para a thread da requisição quanto para a leitura assíncrona ("escola/assincrono.py"), já que o
+# "sync_to_async" copia o contexto para a thread das consultas
+
+_rodizio = itertools.count()
+
+def replicas():
+    return list(getattr(settings, 'REPLICAS_LEITURA', ()))
+
+def escolher_replica():
+# próxima réplica em rodízio (round-robin), distribuindo as leituras entre todas elas; None sem réplicas configuradas
+
+    aliases = replicas()
+    return aliases[next(_rodizio) % len(aliases)] if aliases else None
+
+def chave_fixacao(request):
+# identifica o cliente pelo usuário autenticado ou, para anônimos, pelo IP (o mesmo "get_ident" do throttle)
+
+    if request.user and request.user.is_authenticated:
+        cliente = f'usuario:{request.user.pk}'
+    else:
+        cliente = BaseThrottle().get_ident(request)
+    return f'{PREFIXO}:fixacao:{cliente}'
+
+def copiar_banco(origem, destino):
+# copia o banco inteiro da conexão "origem" (Django) para o arquivo "destino" com a API de backup do SQLite. A cópia é feita em
+# um único passo, sobre um retrato consistente da origem, e as conexões abertas na réplica passam a ler o novo conteúdo
+
+    origem.ensure_connection()
+    with closing(sqlite3.connect(destino)) as conexao:
+        origem.connection.backup(conexao)
+
+def sincronizar_replicas(aliases=None):
+# atualiza cada réplica com o conteúdo atual do banco principal. Nos testes as réplicas apontam para o próprio banco principal
+# ("TEST": {"MIRROR": "default"}) e não há o que copiar
+
+    origem = connections[DEFAULT_DB_ALIAS]
+    sincronizadas = []
+    for alias in aliases or replicas():
+        destino = connections[alias].settings_dict['NAME']
+        if str(destino) != str(origem.settings_dict['NAME']):
+            copiar_banco(origem, str(destino))
+            sincronizadas.append(alias)
+    return sincronizadas
+
+
+class RoteadorLeituraEscrita:
+    """Classe RoteadorLeituraEscrita
+
+    Intenção :
+    Roteador de banco ("DATABASE_ROUTERS") que separa as leituras das escritas: as leituras vão para a réplica escolhida pela view
+    (ver "LeituraReplicaMixin") e todas as escritas vão para o banco principal ("default"). Fora das views com réplica, ou sem
+    réplicas configuradas ("REPLICAS_LEITURA" vazio), tudo continua no banco principal.
+
+    Argumentos :
+    Não recebe argumentos, é instanciado pelo Django a partir do "DATABASE_ROUTERS" do settings.
+
+    Atributos :
+    "db_for_read" : a réplica da requisição atual ("banco_leitura"), ou None para o Django seguir com o banco padrão.
+    "db_for_write" : sempre o banco principal, inclusive para um objeto lido de uma réplica e depois alterado.
+    "allow_relation" : permite relacionar objetos do banco principal com os das réplicas, que têm o mesmo conteúdo.
+    "allow_migrate" : as réplicas não recebem migrações (nem as fixtures do "loaddata"); o esquema chega junto com a cópia
+    ("sincronizar_replicas").
+    """
+
+    def db_for_read(self, model, **hints):
+        return banco_leitura.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        bancos = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in bancos and obj2._state.db in bancos:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db != DEFAULT_DB_ALIAS and db in replicas() else None
+
+
+class LeituraReplicaMixin:
+    """Classe LeituraReplicaMixin
+
+    Intenção :
+    Envia as leituras (GET e HEAD) da view para uma das réplicas, em rodízio, e mantém no banco principal as leituras de um cliente
+    logo depois de uma escrita dele, para que ele sempre leia o que acabou de gravar mesmo com as réplicas atrasadas.
+
+    Argumentos :
+    Deve vir antes da view do Django Rest na herança. A réplica é escolhida no "initial", depois da autenticação, das permissões e
+    do throttle (que consultam o banco principal), e vale até o "finalize_response".
+
+    Atributos :
+    "leitura_replica" : False mantém as leituras da view no banco principal, apenas registrando as escritas do cliente.
+    "initial" : escolhe a réplica, a menos que o cliente esteja fixado no banco principal.
+    "usar_principal" : volta as leituras para o banco principal, no "finalize_response" ou no "handle_exception".
+    "finalize_response" : volta para o banco principal e, depois de uma escrita bem sucedida, fixa o cliente no banco principal
+    por "REPLICAS_FIXACAO" segundos (tempo que as réplicas levam para receber a escrita, ver "REPLICAS_INTERVALO").
+    """
+
+    leitura_replica = True
+    replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not self.leitura_replica or request.method not in ('GET', 'HEAD') or not replicas():
+            return
+        if cache.get(chave_fixacao(request)):
+            return
+        replica = escolher_replica()
+        if replica is not None:
+            self.replica_token = banco_leitura.set(replica)
+
+    def usar_principal(self):
+        if self.replica_token is not None:
+            banco_leitura.reset(self.replica_token)
+            self.replica_token = None
+
+    def handle_exception(self, exc):
+        # os erros que o Django Rest não trata são relançados sem passar pelo "finalize_response"; a réplica não pode continuar
+        # valendo para a próxima requisição da mesma thread
+        self.usar_principal()
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        self.usar_principal()
+        if request.method not in SAFE_METHODS and response.status_code < 400 and replicas():
+            cache.set(chave_fixacao(request), True, getattr(settings, 'REPLICAS_FIXACAO', 15))
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -1,6 +1,10 @@
+from django.db import transaction
 from rest_framework import serializers
 from escola.models import Estudante,Curso, Matricula
 from escola.validators import cpf_invalido, nome_invalido, celular_invalido
+from escola.cache import invalidar_modelo
+
+PERIODOS = dict(Matricula.PERIODO)
 
 
 class EstudanteSerializer(serializers.ModelSerializer):
@@ -45,12 +49,13 @@ class CursoSerializer(serializers.ModelSerializer):
 
     Atributos : 
     "Classe Meta" : Recebe Meta por padrão de uso e recebe esse nome e o model base "Curso" e os campos(Fields) que serão recebidos,
-    nesse caso todos (__all__)
+    nesse caso todos, menos o controle interno "atualizado_em". O "total_matriculas" é apenas de leitura (mantido pelo banco, ver
+    "escola/estatisticas.py")
     """
 
     class Meta:
         model = Curso
-        fields = '__all__'
+        fields = ['id','codigo','descricao','nivel','total_matriculas']
 
 class MatriculaSerializer(serializers.ModelSerializer):
     """classe MatriculaSerializer
@@ -63,12 +68,12 @@ class MatriculaSerializer(serializers.ModelSerializer):
 
     Atributos : 
     "Classe Meta" : Recebe Meta por padrão de uso e recebe esse nome e o model base "Matricula" e os campos(Fields) que serão recebidos,
-    nesse caso todos, ou não exluiu nenhum ("exclude = []")
+    nesse caso todos, menos o controle interno "atualizado_em" ("exclude = ['atualizado_em']")
     """
 
     class Meta:
         model = Matricula
-        exclude = []
+        exclude = ['atualizado_em']
 
 class ListaMatriculasEstudanteSerializer(serializers.ModelSerializer):
     """classe ListaMatriculasEstudanteSerializer
@@ -108,10 +113,12 @@ class ListaMatriculasCursoSerializer(serializers.ModelSerializer):
     "periodo = serializers.SerializerMethodField()" função de espeficiar a fonte posteriormente através do get
     "Classe Meta" : Recebe "Meta" por padrão de uso e recebe esse nome e o model base "Matricula" e os campos(Fields) que serão recebidos
     nesse caso referente ao curso.
+    "campos_leitura_rapida" : equivalente do "get_periodo" para a leitura rápida ("escola/leitura_rapida.py"), a partir da coluna "periodo".
     """
 
     curso = serializers.ReadOnlyField(source='curso.descricao')
     periodo = serializers.SerializerMethodField()
+    campos_leitura_rapida = {'periodo': ('periodo', lambda periodo: PERIODOS.get(periodo, periodo))}
     
     class Meta:
         model = Matricula
@@ -139,4 +146,211 @@ class EstudanteSerializerV2(serializers.ModelSerializer):
     
     class Meta:
         model = Estudante
-        fields = ['id','nome','email','celular']
\ No newline at end of file
+        fields = ['id','nome','email','celular']
+
+class EstudanteLoteListSerializer(serializers.ListSerializer):
+    """classe EstudanteLoteListSerializer
+
+    Intenção :
+    Serializer de lista usado no cadastro de estudantes em lote. Valida todas as linhas de uma vez, verifica a unicidade dos CPFs com
+    consultas por conjunto ("cpf__in") ao invés de uma consulta por linha, e grava tudo com "bulk_create" em uma única transação.
+
+    Argumentos :
+    "serializers.ListSerializer" : serializer padrão do Django Rest para listas ("many=True").
+
+    Atributos :
+    "tamanho_lote" : quantidade de linhas por consulta de CPF e por INSERT do "bulk_create".
+    "to_internal_value" : junta os erros de cada linha (validadores de "escola.validators") com os erros de CPF repetido, sempre na
+    mesma posição da linha enviada.
+    "create" : grava as linhas validadas e invalida o cache de respostas de "Estudante", já que o "bulk_create" não dispara signals.
+    """
+
+    tamanho_lote = 1000
+
+    def cpfs_repetidos(self, data):
+    # retorna o erro de CPF de cada linha, seja por repetir uma linha anterior do lote ou por já existir no banco
+
+        cpfs = [linha.get('cpf') if isinstance(linha, dict) else None for linha in data]
+        existentes = set()
+        validos = list({cpf for cpf in cpfs if isinstance(cpf, str)})
+        for inicio in range(0, len(validos), self.tamanho_lote):
+            existentes.update(Estudante.objects.filter(cpf__in=validos[inicio:inicio + self.tamanho_lote]).values_list('cpf', flat=True))
+
+        vistos = set()
+        erros = []
+        for cpf in cpfs:
+            if cpf in existentes:
+                erros.append({'cpf': ['estudante com este cpf já existe.']})
+            elif cpf in vistos:
+                erros.append({'cpf': ['CPF repetido no lote.']})
+            else:
+                erros.append({})
+            if isinstance(cpf, str):
+                vistos.add(cpf)
+        return erros
+
+    def to_internal_value(self, data):
+        try:
+            validados = super().to_internal_value(data)
+            erros = [{} for _ in data]
+        except serializers.ValidationError as exc:
+            if not isinstance(exc.detail, list):
+                raise
+            validados = None
+            erros = exc.detail
+
+        for erro, erro_cpf in zip(erros, self.cpfs_repetidos(data)):
+            if erro_cpf and 'cpf' not in erro:
+                erro.update(erro_cpf)
+        if any(erros):
+            raise serializers.ValidationError(erros)
+        return validados
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            estudantes = Estudante.objects.bulk_create(
+                [Estudante(**dados) for dados in validated_data],
+                batch_size=self.tamanho_lote,
+            )
+        invalidar_modelo(Estudante)
+        return estudantes
+
+class EstudanteLoteSerializer(EstudanteSerializer):
+    """classe EstudanteLoteSerializer
+
+    Intenção :
+    Mesma validação do "EstudanteSerializer" para cada linha do cadastro em lote, mas sem o "UniqueValidator" do CPF, que faria uma
+    consulta por linha. A unicidade é verificada de uma só vez pelo "EstudanteLoteListSerializer".
+
+    Argumentos :
+    Herda o "EstudanteSerializer", com seus campos e o "validate".
+
+    Atributos :
+    "Classe Meta" : repete o model e os campos, retira os validadores do "cpf" e define o "list_serializer_class" usado com "many=True".
+    """
+
+    class Meta(EstudanteSerializer.Meta):
+        extra_kwargs = {'cpf': {'validators': []}}
+        list_serializer_class = EstudanteLoteListSerializer
+
+class MatriculaLoteListSerializer(serializers.ListSerializer):
+    """classe MatriculaLoteListSerializer
+
+    Intenção :
+    Serializer de lista usado na matrícula em lote. Confere a existência dos estudantes e cursos com consultas por conjunto ("pk__in"),
+    ignora as matrículas que já existem (ou que se repetem no lote) e grava as novas com "bulk_create" em uma única transação.
+
+    Argumentos :
+    "serializers.ListSerializer" : serializer padrão do Django Rest para listas ("many=True").
+
+    Atributos :
+    "tamanho_lote" : quantidade de ids por consulta e de linhas por INSERT do "bulk_create".
+    "ignoradas" : depois do "save", quantidade de matrículas que não foram gravadas por já existirem.
+    """
+
+    tamanho_lote = 1000
+    ignoradas = 0
+
+    def ids_existentes(self, modelo, ids):
+        ids = list(ids)
+        existentes = set()
+        for inicio in range(0, len(ids), self.tamanho_lote):
+            existentes.update(modelo.objects.filter(pk__in=ids[inicio:inicio + self.tamanho_lote]).values_list('pk', flat=True))
+        return existentes
+
+    def to_internal_value(self, data):
+        attrs = super().to_internal_value(data)
+        estudantes = self.ids_existentes(Estudante, {linha['estudante_id'] for linha in attrs})
+        cursos = self.ids_existentes(Curso, {linha['curso_id'] for linha in attrs})
+
+        erros = []
+        for linha in attrs:
+            erro = {}
+            if linha['estudante_id'] not in estudantes:
+                erro['estudante'] = [f'Pk inválido "{linha["estudante_id"]}" - objeto não existe.']
+            if linha['curso_id'] not in cursos:
+                erro['curso'] = [f'Pk inválido "{linha["curso_id"]}" - objeto não existe.']
+            erros.append(erro)
+        if any(erros):
+            raise serializers.ValidationError(erros)
+        return attrs
+
+    def pares_existentes(self, validated_data):
+    # busca as matrículas (estudante, curso) já gravadas, consultando os estudantes do lote em blocos de "tamanho_lote"
+
+        estudantes = list({linha['estudante_id'] for linha in validated_data})
+        cursos = list({linha['curso_id'] for linha in validated_data})
+        pares = set()
+        for inicio in range(0, len(estudantes), self.tamanho_lote):
+            pares.update(Matricula.objects.filter(
+                estudante_id__in=estudantes[inicio:inicio + self.tamanho_lote],
+                curso_id__in=cursos,
+            ).values_list('estudante_id', 'curso_id'))
+        return pares
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            pares = self.pares_existentes(validated_data)
+            novas = []
+            for linha in validated_data:
+                par = (linha['estudante_id'], linha['curso_id'])
+                if par not in pares:
+                    pares.add(par)
+                    novas.append(Matricula(**linha))
+            matriculas = Matricula.objects.bulk_create(novas, batch_size=self.tamanho_lote)
+        self.ignoradas = len(validated_data) - len(matriculas)
+        invalidar_modelo(Matricula)
+        return matriculas
+
+class MatriculaLoteSerializer(serializers.ModelSerializer):
+    """classe MatriculaLoteSerializer
+
+    Intenção :
+    Cada linha da matrícula em lote. Diferente do "MatriculaSerializer", recebe "estudante" e "curso" como números inteiros, sem buscar
+    cada objeto no banco. A existência deles é conferida de uma só vez pelo "MatriculaLoteListSerializer".
+
+    Argumentos :
+    Adota o padrão "serializers.ModelSerializer".
+
+    Atributos :
+    "estudante" e "curso" : ids gravados direto em "estudante_id" e "curso_id".
+    "Classe Meta" : model "Matricula", os campos recebidos e o "list_serializer_class" usado com "many=True".
+    """
+
+    estudante = serializers.IntegerField(source='estudante_id')
+    curso = serializers.IntegerField(source='curso_id')
+
+    class Meta:
+        model = Matricula
+        fields = ['estudante','curso','periodo']
+        list_serializer_class = MatriculaLoteListSerializer
+
+class MatriculaTurmaSerializer(serializers.Serializer):
+    """classe MatriculaTurmaSerializer
+
+    Intenção :
+    Forma resumida da matrícula em lote: matricula no "curso" todos os estudantes que já estão matriculados no "curso_origem".
+
+    Argumentos :
+    "serializers.Serializer" : serializer simples, sem model.
+
+    Atributos :
+    "curso_origem" e "curso" : cursos de origem e de destino, ambos precisam existir.
+    "periodo" : período das novas matrículas, escolhas na tupla "Matricula.PERIODO".
+    "linhas" : monta as linhas no formato do "MatriculaLoteSerializer".
+    """
+
+    curso_origem = serializers.PrimaryKeyRelatedField(queryset=Curso.objects.all())
+    curso = serializers.PrimaryKeyRelatedField(queryset=Curso.objects.all())
+    periodo = serializers.ChoiceField(choices=Matricula.PERIODO, default='M')
+
+    def linhas(self):
+        # percorre o índice (curso, id) do curso de origem e remove os estudantes repetidos em Python, sem ordenação no banco
+        estudantes = dict.fromkeys(
+            Matricula.objects.filter(curso=self.validated_data['curso_origem'])
+            .order_by('id').values_list('estudante_id', flat=True)
+        )
+        return [
+            {'estudante': estudante, 'curso': self.validated_data['curso'].pk, 'periodo': self.validated_data['periodo']}
+            for estudante in estudantes
+        ]
@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+from escola.models import Estudante, Curso, Matricula
+from escola.cache import invalidar_modelo
+from escola.permissoes import invalidar_permissoes
+
+User = get_user_model()
+
+@receiver(post_save, sender=Estudante)
+@receiver(post_save, sender=Curso)
+@receiver(post_save, sender=Matricula)
+@receiver(post_delete, sender=Estudante)
+@receiver(post_delete, sender=Curso)
+@receiver(post_delete, sender=Matricula)
+def invalidar_cache_respostas(sender, **kwargs):
+# a cada criação, alteração ou exclusão invalida as respostas em cache que dependem do model alterado (ver "escola/cache.py")
+# obs: o "post_delete" também é disparado para as matrículas apagadas em cascata junto do estudante ou do curso
+
+    invalidar_modelo(sender)
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidar_permissoes_usuario(sender, instance, **kwargs):
+# qualquer alteração ou exclusão do usuário descarta apenas as permissões guardadas dele (ver "escola/permissoes.py")
+
+    invalidar_permissoes(instance.pk)
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def invalidar_permissoes_todos(sender, **kwargs):
+    invalidar_permissoes()
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidar_permissoes_relacoes(sender, instance, action, **kwargs):
+# grupos e permissões de um usuário ("user.groups.add(...)") descartam as permissões dele; pelo outro lado da relação
+# ("group.user_set.add(...)") ou nas permissões de um grupo, as de todos os usuários
+
+    if action.startswith('post_'):
+        invalidar_permissoes(instance.pk if isinstance(instance, User) else None)
@@ -0,0 +1,156 @@
+import base64
+import json
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import AsyncClient
+from django.test.utils import override_settings
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APITestCase
+from escola.assincrono import rotas_assincronas
+from escola.models import Curso, Estudante, Matricula
+from setup.urls import urlpatterns as rotas_sincronas
+
+urlpatterns = rotas_assincronas(rotas_sincronas)
+# as mesmas rotas do "setup/urls.py" com a leitura assíncrona, como no servidor ASGI
+
+MIDDLEWARES_ASGI = [
+    'escola.middlewares.SecurityMiddleware',
+    'escola.middlewares.SessionMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'escola.middlewares.CommonMiddleware',
+    'escola.middlewares.CsrfViewMiddleware',
+    'escola.middlewares.AuthenticationMiddleware',
+    'escola.middlewares.MessageMiddleware',
+    'escola.middlewares.XFrameOptionsMiddleware',
+]
+# a lista de middlewares do settings com "LEITURA_ASSINCRONA" (ver "escola/middlewares.py")
+
+def basic(username, password):
+    return {'Authorization': 'Basic ' + base64.b64encode(f'{username}:{password}'.encode()).decode()}
+
+
+class LeituraAssincronaTestCase(APITestCase):
+    """classe LeituraAssincronaTestCase
+
+    Intenção :
+    Se trata do teste da leitura assíncrona ("escola/assincrono.py"). Cada requisição é feita pelo "async_client" do Django nas rotas
+    assíncronas deste módulo e comparada com a mesma requisição feita na view síncrona.
+
+    Argumentos :
+    "APITestCase" é a biblioteca responsável pelos testes dentro do Django Rest, dedicado exclusicamente aos testes de funcionalidade da API.
+
+    Atributos :
+    "setUp" : limpa o cache, cria matrículas e um superusuário com senha, já que o "force_authenticate" segue pelo caminho síncrono.
+    "get_assincrono" : requisição "get" nas rotas assíncronas, verificando que ela não passou pela view síncrona.
+    "test_mesmos_dados_da_view_sincrona" : listagens, detalhes, filtros, versões e paginação, com e sem a leitura rápida.
+    "test_autenticacao_e_permissoes" : 401 sem credenciais ou com senha errada e leitura anônima permitida em "cursos/".
+    "test_throttle" : o limite de requisições anônimas é o mesmo, contado junto com as requisições síncronas.
+    "test_erros_404" : página inexistente, objeto inexistente e id em formato inválido.
+    "test_cache_e_requisicao_condicional" : "X-Cache" (o acerto faz apenas a consulta da autenticação) e "304 Not Modified" com o ETag.
+    "test_demais_requisicoes_seguem_sincronas" : "post", paginação por cursor e API navegável continuam na view síncrona.
+    "test_middlewares_sem_thread" : com os middlewares de "escola/middlewares.py" a resposta traz os mesmos cabeçalhos e o login do
+    admin continua gravando a sessão.
+    """
+
+    fixtures = ['prototipo_banco.json']
+
+    def setUp(self):
+        cache.clear()
+        User.objects.create_superuser(username='assincrono', password='senha')
+        self.credenciais = basic('assincrono', 'senha')
+        for estudante in Estudante.objects.order_by('id')[:5]:
+            for curso in Curso.objects.order_by('id')[:3]:
+                Matricula.objects.create(estudante=estudante, curso=curso)
+
+    def get_assincrono(self, rota, headers=None):
+        with override_settings(ROOT_URLCONF=__name__):
+            response = async_to_sync(self.async_client.get)(rota, headers=headers)
+        self.assertNotIsInstance(response, Response, rota)
+        return response
+
+    def test_mesmos_dados_da_view_sincrona(self):
+        rotas = [
+            '/estudantes/', '/estudantes/?page=3', '/estudantes/?page=last', '/estudantes/?ordering=-nome', '/estudantes/?search=pedro',
+            '/estudantes/?version=v2', '/estudantes/1/', '/cursos/', '/cursos/1/', '/matriculas/', '/matriculas/1/',
+            '/estudantes/1/matriculas/', '/cursos/1/matriculas/',
+        ]
+        for leitura_rapida in (False, True):
+            for rota in rotas:
+                with self.subTest(rota=rota, leitura_rapida=leitura_rapida), override_settings(LEITURA_RAPIDA=leitura_rapida):
+                    cache.clear()
+                    sincrona = self.client.get(rota, headers=self.credenciais)
+                    cache.clear()
+                    assincrona = self.get_assincrono(rota, self.credenciais)
+                    self.assertEqual(assincrona.status_code, status.HTTP_200_OK)
+                    self.assertEqual(json.loads(assincrona.content), json.loads(sincrona.content))
+                    self.assertEqual(assincrona['Content-Type'], sincrona['Content-Type'])
+
+    def test_autenticacao_e_permissoes(self):
+        response = self.get_assincrono('/estudantes/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response['WWW-Authenticate'], 'Basic realm="api"')
+        sincrona = self.client.get('/estudantes/', headers=basic('assincrono', 'errada'))
+        response = self.get_assincrono('/estudantes/', basic('assincrono', 'errada'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(json.loads(response.content), json.loads(sincrona.content))
+        self.assertEqual(self.get_assincrono('/cursos/').status_code, status.HTTP_200_OK)
+
+    def test_throttle(self):
+        for _ in range(10):
+            self.assertEqual(self.client.get('/cursos/').status_code, status.HTTP_200_OK)
+        for _ in range(10):
+            self.assertEqual(self.get_assincrono('/cursos/').status_code, status.HTTP_200_OK)
+        response = self.get_assincrono('/cursos/')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+    def test_erros_404(self):
+        for rota in ['/estudantes/?page=99', '/estudantes/999/', '/estudantes/abc/', '/matriculas/999/']:
+            with self.subTest(rota=rota):
+                sincrona = self.client.get(rota, headers=self.credenciais)
+                assincrona = self.get_assincrono(rota, self.credenciais)
+                self.assertEqual(assincrona.status_code, status.HTTP_404_NOT_FOUND)
+                self.assertEqual(json.loads(assincrona.content), json.loads(sincrona.content))
+
+    def test_cache_e_requisicao_condicional(self):
+        primeira = self.get_assincrono('/cursos/1/', self.credenciais)
+        self.assertEqual(primeira['X-Cache'], 'MISS')
+        with self.assertNumQueries(1):
+            # apenas a consulta do usuário na autenticação
+            segunda = self.get_assincrono('/cursos/1/', self.credenciais)
+        self.assertEqual(segunda['X-Cache'], 'HIT')
+        self.assertEqual(segunda['ETag'], primeira['ETag'])
+        response = self.get_assincrono('/cursos/1/', {**self.credenciais, 'If-None-Match': primeira['ETag']})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(self.get_assincrono('/matriculas/', {**self.credenciais, 'If-None-Match': '"antigo"'}).status_code, 200)
+
+    def test_demais_requisicoes_seguem_sincronas(self):
+        with override_settings(ROOT_URLCONF=__name__):
+            response = async_to_sync(self.async_client.post)(
+                '/cursos/', {'codigo': 'ASY', 'descricao': 'Curso assíncrono', 'nivel': 'B'},
+                content_type='application/json', headers=self.credenciais,
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.content)
+            cursor = async_to_sync(self.async_client.get)('/estudantes/?paginacao=cursor', headers=self.credenciais)
+            navegavel = async_to_sync(self.async_client.get)('/cursos/', headers={'Accept': 'text/html'})
+        self.assertIsInstance(cursor, Response)
+        self.assertEqual(len(cursor.data['results']), 20)
+        self.assertIsInstance(navegavel, Response)
+        self.assertEqual(navegavel.status_code, status.HTTP_200_OK)
+
+    def test_middlewares_sem_thread(self):
+        sincrona = self.client.get('/cursos/', headers={'Origin': 'http://localhost:8042'})
+        with override_settings(ROOT_URLCONF=__name__, MIDDLEWARE=MIDDLEWARES_ASGI):
+            cliente = AsyncClient()
+            response = async_to_sync(cliente.get)('/cursos/', headers={'Origin': 'http://localhost:8042'})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            for cabecalho in ('X-Frame-Options', 'X-Content-Type-Options', 'Referrer-Policy', 'Cross-Origin-Opener-Policy',
+                              'Access-Control-Allow-Origin', 'Vary', 'Allow'):
+                self.assertEqual(response.get(cabecalho), sincrona.get(cabecalho), cabecalho)
+
+            login = async_to_sync(cliente.post)('/admin/login/?next=/admin/', {'username': 'assincrono', 'password': 'senha'})
+            self.assertEqual(login.status_code, 302)
+            self.assertIn('sessionid', login.cookies)
+            self.assertEqual(async_to_sync(cliente.get)('/admin/escola/curso/').status_code, status.HTTP_200_OK)
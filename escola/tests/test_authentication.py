@@ -1,5 +1,12 @@
+import base64
+from unittest import mock
+from asgiref.sync import async_to_sync
 from django.contrib.auth.models import User
-from rest_framework.test import APITestCase
+from django.core.cache import cache
+from django.test.utils import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from escola.authentication import TokenAssinadoAuthentication, limpar_credenciais
 from django.contrib.auth import authenticate
 from django.urls import reverse
 from rest_framework import status
@@ -44,3 +51,96 @@ class AutheticantionUserTestCase(APITestCase):
         self.client.force_authenticate(self.usuario)
         response = self.client.get (self.url)
         self.assertEqual(response.status_code,status.HTTP_200_OK)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class AutenticacaoRapidaTestCase(APITestCase):
+    """classe AutenticacaoRapidaTestCase
+
+    Intenção :
+    Se trata do teste do cache de credenciais do HTTP Basic e do token assinado ("escola/authentication.py"). O "check_password" é
+    observado para saber quando a senha foi conferida com o hasher (o PBKDF2, fora dos testes).
+
+    Argumentos :
+    "APITestCase" : biblioteca de testes do Django Rest.
+
+    Atributos :
+    "setUp" : limpa o cache (throttles) e as credenciais guardadas e cria um usuário com a permissão de ver estudantes.
+    "basic" e "token" : cabeçalho "Authorization" de cada autenticação.
+    "test_basic_confere_a_senha_uma_vez" : a segunda requisição não confere a senha novamente e uma senha errada continua com 401.
+    "test_basic_depois_de_trocar_a_senha" : a senha antiga deixa de valer e a nova é conferida.
+    "test_basic_usuario_desativado_ou_renomeado" : a credencial guardada não vale para um usuário desativado ou com outro nome.
+    "test_token" : o token da rota "token/" autentica sem conferir a senha, e não vale mais depois da troca de senha, da desativação,
+    do prazo de validade ou de uma alteração no próprio token.
+    "test_token_assincrono" : o "aautenticar" da leitura assíncrona retorna o mesmo usuário.
+    """
+
+    url = '/estudantes/'
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        limpar_credenciais()
+        self.addCleanup(limpar_credenciais)
+        self.usuario = User.objects.create_user(username='leitor', password='senha-leitor', is_staff=True, is_superuser=True)
+        self.conferir = self.enterContext(mock.patch.object(User, 'check_password', autospec=True, side_effect=User.check_password))
+
+    def basic(self, username='leitor', password='senha-leitor'):
+        return {'Authorization': 'Basic ' + base64.b64encode(f'{username}:{password}'.encode()).decode()}
+
+    def token(self):
+        response = self.client.post('/token/', headers=self.basic())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {'Authorization': f'Token {response.data["token"]}'}
+
+    def test_basic_confere_a_senha_uma_vez(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get(self.url, headers=self.basic()).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.conferir.call_count, 1)
+        response = self.client.get(self.url, headers=self.basic(password='errada'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_basic_depois_de_trocar_a_senha(self):
+        self.client.get(self.url, headers=self.basic())
+        self.usuario.set_password('senha-nova')
+        self.usuario.save()
+        self.assertEqual(self.client.get(self.url, headers=self.basic()).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.client.get(self.url, headers=self.basic(password='senha-nova')).status_code, status.HTTP_200_OK)
+
+    def test_basic_usuario_desativado_ou_renomeado(self):
+        self.client.get(self.url, headers=self.basic())
+        User.objects.filter(pk=self.usuario.pk).update(is_active=False)
+        self.assertEqual(self.client.get(self.url, headers=self.basic()).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        User.objects.filter(pk=self.usuario.pk).update(is_active=True)
+        self.client.get(self.url, headers=self.basic())
+        User.objects.filter(pk=self.usuario.pk).update(username='outro')
+        self.assertEqual(self.client.get(self.url, headers=self.basic()).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token(self):
+        token = self.token()
+        self.conferir.reset_mock()
+        response = self.client.get(self.url, headers=token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.conferir.call_count, 0)
+        self.assertEqual(self.client.post('/token/', headers=token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        alterado = {'Authorization': token['Authorization'][:-2] + 'xx'}
+        self.assertEqual(self.client.get(self.url, headers=alterado).status_code, status.HTTP_401_UNAUTHORIZED)
+        with override_settings(TOKEN_VALIDADE=-1):
+            self.assertEqual(self.client.get(self.url, headers=token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        User.objects.filter(pk=self.usuario.pk).update(is_active=False)
+        self.assertEqual(self.client.get(self.url, headers=token).status_code, status.HTTP_401_UNAUTHORIZED)
+        User.objects.filter(pk=self.usuario.pk).update(is_active=True)
+        self.assertEqual(self.client.get(self.url, headers=token).status_code, status.HTTP_200_OK)
+
+        self.usuario.set_password('senha-nova')
+        self.usuario.save()
+        self.assertEqual(self.client.get(self.url, headers=token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_assincrono(self):
+        token = self.token()['Authorization']
+        request = Request(APIRequestFactory().get(self.url, HTTP_AUTHORIZATION=token))
+        user, _ = async_to_sync(TokenAssinadoAuthentication().aautenticar)(request)
+        self.assertEqual(user, self.usuario)
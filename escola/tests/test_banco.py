@@ -0,0 +1,117 @@
+import os
+import sqlite3
+import tempfile
+from unittest import mock
+from django.db import OperationalError, transaction
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase, TransactionTestCase
+from django.test.utils import override_settings
+from escola.transacoes import atomic_com_repeticao
+
+
+class PerfilProducaoTestCase(SimpleTestCase):
+    """classe PerfilProducaoTestCase
+
+    Intenção :
+    Se trata do teste do backend de produção do SQLite ("escola/backends/sqlite3/base.py"), com um banco em arquivo temporário.
+
+    Argumentos :
+    "SimpleTestCase" : teste do Django sem o banco de testes, a conexão é criada pelo próprio teste.
+
+    Atributos :
+    "setUp" : cria a pasta temporária do arquivo do banco.
+    "conexao" : cria uma conexão separada das conexões do Django, pelo "ConnectionHandler", com o "OPTIONS" recebido.
+    "test_pragmas_em_cada_conexao" : WAL, synchronous=NORMAL, busy_timeout, cache e mmap aplicados a cada conexão nova.
+    "test_pragmas_do_settings" : o "OPTIONS['pragmas']" sobrescreve ou retira os PRAGMAs padrão.
+    "test_begin_immediate" : o "atomic" reserva a escrita já no início, bloqueando outra conexão que tente escrever.
+    """
+
+    def setUp(self):
+        pasta = self.enterContext(tempfile.TemporaryDirectory())
+        self.caminho = os.path.join(pasta, 'producao.sqlite3')
+
+    def conexao(self, **opcoes):
+        conexoes = ConnectionHandler({'default': {'ENGINE': 'escola.backends.sqlite3', 'NAME': self.caminho, 'OPTIONS': opcoes}})
+        conexao = conexoes['default']
+        self.addCleanup(conexao.close)
+        return conexao
+
+    def pragma(self, conexao, nome):
+        with conexao.cursor() as cursor:
+            cursor.execute(f'PRAGMA {nome}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_em_cada_conexao(self):
+        for _ in range(2):
+            conexao = self.conexao()
+            self.assertEqual(self.pragma(conexao, 'journal_mode'), 'wal')
+            self.assertEqual(self.pragma(conexao, 'synchronous'), 1)
+            self.assertEqual(self.pragma(conexao, 'busy_timeout'), 5000)
+            self.assertEqual(self.pragma(conexao, 'cache_size'), -65536)
+            self.assertEqual(self.pragma(conexao, 'mmap_size'), 256 * 1024 * 1024)
+            conexao.close()
+
+    def test_pragmas_do_settings(self):
+        conexao = self.conexao(pragmas={'busy_timeout': 100, 'mmap_size': None})
+        self.assertEqual(self.pragma(conexao, 'busy_timeout'), 100)
+        self.assertEqual(self.pragma(conexao, 'mmap_size'), 0)
+
+    def test_begin_immediate(self):
+        conexao = self.conexao()
+        conexao.set_autocommit(False, force_begin_transaction_with_broken_autocommit=True)
+        self.addCleanup(conexao.set_autocommit, True)
+        self.addCleanup(conexao.rollback)
+        outra = sqlite3.connect(self.caminho, timeout=0)
+        self.addCleanup(outra.close)
+        with self.assertRaisesRegex(sqlite3.OperationalError, 'locked'):
+            outra.execute('BEGIN IMMEDIATE')
+
+
+class RepeticaoTransacaoTestCase(TransactionTestCase):
+    """classe RepeticaoTransacaoTestCase
+
+    Intenção :
+    Se trata do teste do "atomic_com_repeticao" ("escola/transacoes.py"), com uma função que falha por bloqueio nas primeiras vezes.
+
+    Argumentos :
+    "TransactionTestCase" : teste do Django sem o "atomic" em volta de cada teste, que impediria a repetição da transação.
+
+    Atributos :
+    "gravar" : função de teste que falha com o erro recebido enquanto houver falhas na lista.
+    "test_repete_transacao_bloqueada" : executa de novo até dar certo, sempre dentro de uma transação.
+    "test_outros_erros_nao_repetem" : outros "OperationalError" seguem na primeira vez.
+    "test_limite_de_tentativas" : depois de "TRANSACAO_TENTATIVAS" o erro de bloqueio segue para quem chamou.
+    "test_dentro_de_outro_atomic" : apenas a transação mais externa é repetida.
+    """
+
+    def setUp(self):
+        self.chamadas = 0
+        self.enterContext(mock.patch('escola.transacoes.time.sleep'))
+
+    def gravar(self, falhas):
+        self.chamadas += 1
+        self.assertTrue(transaction.get_connection().in_atomic_block)
+        if falhas:
+            raise falhas.pop()
+        return 'ok'
+
+    def test_repete_transacao_bloqueada(self):
+        falhas = [OperationalError('database is locked'), OperationalError('database table is locked')]
+        self.assertEqual(atomic_com_repeticao(self.gravar)(falhas), 'ok')
+        self.assertEqual(self.chamadas, 3)
+
+    def test_outros_erros_nao_repetem(self):
+        with self.assertRaisesRegex(OperationalError, 'no such table'):
+            atomic_com_repeticao(self.gravar)([OperationalError('no such table: x')])
+        self.assertEqual(self.chamadas, 1)
+
+    @override_settings(TRANSACAO_TENTATIVAS=3)
+    def test_limite_de_tentativas(self):
+        with self.assertRaisesRegex(OperationalError, 'locked'):
+            atomic_com_repeticao(self.gravar)([OperationalError('database is locked')] * 4)
+        self.assertEqual(self.chamadas, 3)
+
+    def test_dentro_de_outro_atomic(self):
+        with self.assertRaisesRegex(OperationalError, 'locked'), transaction.atomic():
+            atomic_com_repeticao(self.gravar)([OperationalError('database is locked')])
+        self.assertEqual(self.chamadas, 1)
@@ -0,0 +1,74 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Q
+from django.urls import reverse
+from rest_framework import filters, status
+from rest_framework.request import Request
+from rest_framework.test import APITestCase, APIRequestFactory
+from escola.busca import BuscaIndexadaFilter, TABELA_BUSCA
+from escola.models import Estudante
+from escola.views import EstudanteViewSet
+
+class BuscaIndexadaTestCase(APITestCase):
+    """classe BuscaIndexadaTestCase
+
+    Intenção :
+    Se trata do teste da busca indexada de estudantes ("escola/busca.py"), que troca o "SearchFilter" pela tabela FTS5 mantendo os
+    mesmos resultados do "?search=".
+
+    Argumentos :
+    "APITestCase" é a biblioteca responsável pelos testes dentro do Django Rest, dedicado exclusicamente aos testes de funcionalidade da API.
+
+    Atributos :
+    "buscar" : aplica um filtro ao queryset da view de estudantes e retorna o conjunto de ids.
+    "test_mesmo_resultado_do_search_filter" : para termos de vários tamanhos, nomes e CPFs o resultado é o mesmo do "SearchFilter".
+    "test_busca_ignora_acentos" : "joao araujo" encontra "João Araújo", e o contrário também.
+    "test_triggers_mantem_a_busca_sincronizada" : "bulk_create", "update" e "delete" refletem na busca sem nenhum signal.
+    "test_consulta_usa_o_indice" : o plano da consulta usa a tabela virtual ao invés de percorrer a tabela de estudantes.
+    "test_rota_de_listagem" : "estudantes/?search=" continua com a mesma resposta paginada.
+    """
+
+    fixtures = ['prototipo_banco.json']
+
+    def buscar(self, filtro, termo):
+        request = Request(APIRequestFactory().get('/estudantes/', {'search': termo}))
+        return set(filtro.filter_queryset(request, Estudante.objects.all(), EstudanteViewSet()).values_list('id', flat=True))
+
+    def test_mesmo_resultado_do_search_filter(self):
+        for termo in ['ana', 'Ana', 'MAR', 'ma', 'a', 'da Costa', 'pedro lucas', '"Pedro Lucas"', '99', '9972', '35496090784', 'xyz', '50%', 'a_b']:
+            with self.subTest(termo=termo):
+                self.assertEqual(self.buscar(BuscaIndexadaFilter(), termo), self.buscar(filters.SearchFilter(), termo))
+
+    def test_busca_ignora_acentos(self):
+        estudante = Estudante.objects.create(nome='João Araújo', email='joao@gmail.com', cpf='12345678909', data_nascimento='2000-01-01', celular='21970758285')
+        self.assertIn(estudante.id, self.buscar(BuscaIndexadaFilter(), 'joao araujo'))
+        self.assertIn(estudante.id, self.buscar(BuscaIndexadaFilter(), 'JOÃO'))
+        self.assertIn(estudante.id, self.buscar(BuscaIndexadaFilter(), 'ão'))
+        self.assertIn(estudante.id, self.buscar(BuscaIndexadaFilter(), '123'))
+
+    def test_triggers_mantem_a_busca_sincronizada(self):
+        Estudante.objects.bulk_create([Estudante(nome='Zuleica', email='z@gmail.com', cpf='52998224725', data_nascimento='2000-01-01', celular='21970758285')])
+        [novo] = self.buscar(BuscaIndexadaFilter(), 'zuleica')
+        Estudante.objects.filter(id=novo).update(nome='Zenaide', cpf='11144477735')
+        self.assertEqual(self.buscar(BuscaIndexadaFilter(), 'zuleica'), set())
+        self.assertEqual(self.buscar(BuscaIndexadaFilter(), '111444'), {novo})
+        Estudante.objects.filter(id=novo).delete()
+        self.assertEqual(self.buscar(BuscaIndexadaFilter(), 'zenaide'), set())
+
+    def test_consulta_usa_o_indice(self):
+        request = Request(APIRequestFactory().get('/estudantes/', {'search': 'pedro'}))
+        queryset = BuscaIndexadaFilter().filter_queryset(request, Estudante.objects.all(), EstudanteViewSet())
+        sql, parametros = queryset.values('id').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, parametros)
+            plano = ' '.join(str(linha[-1]) for linha in cursor.fetchall())
+        self.assertIn(f'{TABELA_BUSCA} VIRTUAL TABLE', plano)
+        self.assertIn('SEARCH escola_estudante USING INTEGER PRIMARY KEY', plano)
+
+    def test_rota_de_listagem(self):
+        self.client.force_authenticate(user=User.objects.get(username='massoto'))
+        response = self.client.get(reverse('Estudantes-list'), {'search': 'ana'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        esperados = Estudante.objects.filter(Q(nome__icontains='ana') | Q(cpf__icontains='ana')).order_by('id')
+        self.assertEqual(response.data['count'], esperados.count())
+        self.assertEqual([item['id'] for item in response.data['results']], list(esperados.values_list('id', flat=True)[:20]))
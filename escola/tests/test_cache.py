@@ -0,0 +1,168 @@
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from escola.cache import chave_geracao
+from escola.models import Curso, Estudante, Matricula
+
+class CacheRespostasTestCase(APITestCase):
+    """classe CacheRespostasTestCase
+
+    Intenção : 
+    Se trata do teste do cache de respostas ("escola/cache.py"), verificando que a segunda leitura vem do cache sem consultar o banco e
+    que as alterações nos models invalidam as respostas que dependem deles.
+
+    Argumentos : 
+    "APITestCase" é a biblioteca responsável pelos testes dentro do Django Rest, dedicado exclusicamente aos testes de funcionalidade da API.
+
+    Atributos : 
+    "setUp" : limpa o cache e cria o contexto com 1 superusuário das fixtures.
+    "test_segunda_leitura_vem_do_cache" : a segunda requisição "get" traz "X-Cache: HIT" e não faz nenhuma consulta.
+    "test_alteracao_invalida_o_cache" : após um "put" no curso a listagem volta a ser gerada com o dado novo.
+    "test_versao_da_api_faz_parte_da_chave" : "?version=v2" não reaproveita a resposta da versão 1.
+    "test_nova_matricula_invalida_lista_do_curso" : criar uma matrícula invalida a rota "cursos/<pk>/matriculas/".
+    "test_estatisticas_do_cache" : a rota de estatísticas traz os contadores de acertos e falhas.
+    "test_geracao_incrementada_apos_commit" : a geração só muda no commit, então a leitura feita antes dele fica guardada sob a
+    geração antiga e não é servida depois.
+    """
+
+    fixtures = ['prototipo_banco.json']
+    def setUp(self):
+        cache.clear()
+        self.usuario = User.objects.get(username='massoto')
+        self.client.force_authenticate(user=self.usuario)
+
+    def test_segunda_leitura_vem_do_cache(self):
+        url = reverse('Cursos-list')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_alteracao_invalida_o_cache(self):
+        url = reverse('Cursos-detail', args=[1])
+        self.client.get(url)
+        dados = {'codigo': 'OTT', 'descricao': 'Outro teste', 'nivel': 'A'}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(url, dados)
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['codigo'], 'OTT')
+
+    def test_versao_da_api_faz_parte_da_chave(self):
+        url = reverse('Estudantes-list')
+        self.client.get(url)
+        response = self.client.get(url + '?version=v2')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertNotIn('cpf', response.data['results'][0])
+
+    def test_nova_matricula_invalida_lista_do_curso(self):
+        url = '/cursos/3/matriculas/'
+        self.assertEqual(self.client.get(url).data['count'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Matricula.objects.create(estudante=Estudante.objects.get(pk=12), curso=Curso.objects.get(pk=3), periodo='V')
+        self.assertEqual(self.client.get(url).data['count'], 1)
+
+    def test_estatisticas_do_cache(self):
+        url = reverse('Cursos-list')
+        self.client.get(url)
+        self.client.get(url)
+        response = self.client.get(reverse('estatisticas-cache'))
+        self.assertEqual(response.data, {'acertos': 1, 'falhas': 1})
+
+    def test_geracao_incrementada_apos_commit(self):
+        url = reverse('Cursos-list')
+        geracao = cache.get(chave_geracao(Curso), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Curso.objects.create(codigo='NOV', descricao='Novo', nivel='B')
+                self.assertEqual(cache.get(chave_geracao(Curso), 0), geracao)
+                self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+            self.assertEqual(cache.get(chave_geracao(Curso), 0), geracao)
+        self.assertEqual(cache.get(chave_geracao(Curso)), geracao + 1)
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+
+
+class RequisicaoCondicionalTestCase(APITestCase):
+    """classe RequisicaoCondicionalTestCase
+
+    Intenção : 
+    Se trata do teste dos cabeçalhos "ETag" e "Last-Modified" ("RequisicaoCondicionalMixin" em "escola/cache.py"). Quando nada mudou o 
+    cliente recebe "304" com apenas a consulta de agregação, e qualquer alteração volta a gerar a resposta completa.
+
+    Argumentos : 
+    "APITestCase" é a biblioteca responsável pelos testes dentro do Django Rest, dedicado exclusicamente aos testes de funcionalidade da API.
+
+    Atributos : 
+    "setUp" : limpa o cache e cria o contexto com 1 superusuário das fixtures.
+    "test_if_none_match_retorna_304" : repetir o ETag recebido retorna "304" fazendo no máximo 1 consulta.
+    "test_if_modified_since_retorna_304" : repetir o Last-Modified recebido retorna "304".
+    "test_alteracao_muda_o_etag" : após alterar um estudante o ETag antigo não vale mais.
+    "test_exclusao_muda_o_etag" : após excluir uma matrícula o ETag antigo da lista não vale mais.
+    "test_exclusao_vale_para_outros_processos" : após excluir um estudante o Last-Modified antigo da lista não vale mais, mesmo
+    para um processo com outro cache local (simulado limpando o cache).
+    "test_id_invalido_retorna_404" : um id em formato inválido no detalhe retorna "404", sem cabeçalhos de validação.
+    """
+
+    fixtures = ['prototipo_banco.json']
+    def setUp(self):
+        cache.clear()
+        self.usuario = User.objects.get(username='massoto')
+        self.client.force_authenticate(user=self.usuario)
+
+    def test_if_none_match_retorna_304(self):
+        url = reverse('Matriculas-list')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_if_modified_since_retorna_304(self):
+        url = reverse('Cursos-detail', args=[1])
+        last_modified = self.client.get(url)['Last-Modified']
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_alteracao_muda_o_etag(self):
+        url = reverse('Estudantes-detail', args=[1])
+        etag = self.client.get(url)['ETag']
+        estudante = Estudante.objects.get(pk=1)
+        estudante.celular = '21970758285'
+        with self.captureOnCommitCallbacks(execute=True):
+            estudante.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_exclusao_muda_o_etag(self):
+        estudante = Estudante.objects.get(pk=12)
+        Matricula.objects.create(estudante=estudante, curso=Curso.objects.get(pk=3), periodo='V')
+        matricula = Matricula.objects.create(estudante=estudante, curso=Curso.objects.get(pk=4), periodo='N')
+        url = '/estudantes/12/matriculas/'
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            matricula.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+
+    def test_exclusao_vale_para_outros_processos(self):
+        Estudante.objects.update(atualizado_em=timezone.now() - timedelta(days=1))
+        url = reverse('Estudantes-list')
+        last_modified = self.client.get(url)['Last-Modified']
+        with self.captureOnCommitCallbacks(execute=True):
+            Estudante.objects.get(pk=12).delete()
+        cache.clear()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['Last-Modified'], last_modified)
+
+    def test_id_invalido_retorna_404(self):
+        response = self.client.get('/estudantes/abc/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(response.has_header('ETag'))
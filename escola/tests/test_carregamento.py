@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+from unittest import mock
+from django.conf import settings
+from django.test import SimpleTestCase
+from django.urls import resolve
+from escola.carregamento import visao_sob_demanda
+
+SCRIPT_SOMENTE_API = '''
+import base64, json, sys
+import django
+from django.conf import settings
+settings.DATABASES['default']['NAME'] = ':memory:'
+settings.ALLOWED_HOSTS = ['*']
+settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = {'anon': '1000000/day', 'user': '1000000/day'}
+django.setup()
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import Client
+call_command('migrate', verbosity=0)
+User.objects.create_superuser('massoto', 'massoto@gmail.com', 'senha')
+cliente = Client(HTTP_AUTHORIZATION='Basic ' + base64.b64encode(b'massoto:senha').decode())
+resultado = {'cursos': cliente.get('/cursos/').status_code, 'drf_yasg_antes': 'drf_yasg' in sys.modules}
+resultado['swagger'] = cliente.get('/swagger/?format=openapi').status_code
+resultado['ui'] = cliente.get('/swagger/').status_code
+resultado['admin'] = cliente.get('/admin/').status_code
+print(json.dumps(resultado))
+'''
+
+
+class CarregamentoSobDemandaTestCase(SimpleTestCase):
+    """classe CarregamentoSobDemandaTestCase
+
+    Intenção :
+    Se trata do teste das views carregadas sob demanda ("escola/carregamento.py") e dos processos "SOMENTE_API" ("setup/settings.py").
+
+    Argumentos :
+    "SimpleTestCase" : teste do Django sem banco de dados; o processo "SOMENTE_API" cria o seu próprio banco em memória (sem as
+    fixtures, que têm registros do admin).
+
+    Atributos :
+    "test_importada_na_primeira_chamada" : a view só é importada na primeira chamada, e uma única vez.
+    "test_rotas_da_documentacao" : as rotas "swagger/" e "redoc/" usam a view sob demanda, que carrega a view do drf_yasg.
+    "test_somente_api" : em um processo com "SOMENTE_API=1" a API responde sem importar o drf_yasg, a documentação (esquema e
+    interface) continua funcionando e a rota "admin/" não existe.
+    """
+
+    def test_importada_na_primeira_chamada(self):
+        view = mock.Mock(return_value='resposta')
+        with mock.patch('escola.carregamento.import_string', return_value=view) as importar:
+            visao = visao_sob_demanda('modulo.view')
+            self.assertEqual(importar.call_count, 0)
+            self.assertEqual(visao('request', pk=1), 'resposta')
+            self.assertEqual(visao('request', pk=2), 'resposta')
+        importar.assert_called_once_with('modulo.view')
+        view.assert_called_with('request', pk=2)
+        self.assertTrue(visao.csrf_exempt)
+
+    def test_rotas_da_documentacao(self):
+        from setup.documentacao import redoc, swagger
+        self.assertIs(resolve('/swagger/').func.carregar(), swagger)
+        self.assertIs(resolve('/redoc/').func.carregar(), redoc)
+
+    def test_somente_api(self):
+        ambiente = {**os.environ, 'SOMENTE_API': '1', 'DJANGO_SETTINGS_MODULE': 'setup.settings'}
+        saida = subprocess.run(
+            [sys.executable, '-c', SCRIPT_SOMENTE_API], cwd=settings.BASE_DIR, env=ambiente, capture_output=True, text=True, check=True,
+        ).stdout
+        self.assertEqual(
+            json.loads(saida.splitlines()[-1]),
+            {'cursos': 200, 'drf_yasg_antes': False, 'swagger': 200, 'ui': 200, 'admin': 404},
+        )
@@ -0,0 +1,105 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test.utils import override_settings
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+from escola import documentacao
+from escola.documentacao import limpar_esquemas
+from setup.documentacao import schema_view
+
+
+class DocumentacaoTestCase(APITestCase):
+    """classe DocumentacaoTestCase
+
+    Intenção :
+    Se trata do teste do esquema OpenAPI pré-calculado ("escola/documentacao.py") das rotas "swagger/" e "redoc/".
+
+    Argumentos :
+    "APITestCase" : biblioteca de testes do Django Rest, com as fixtures do banco de dados.
+
+    Atributos :
+    "setUp" : limpa o cache (throttles) e os esquemas do processo, usa um arquivo temporário como "DOCUMENTACAO_ARQUIVO", autentica o
+    superusuário e observa o "gerar_esquemas".
+    "test_esquema_gerado_uma_vez" : as requisições seguintes (inclusive em outro formato) não geram o esquema novamente.
+    "test_etag" : com o "If-None-Match" a resposta é "304 Not Modified", sem corpo.
+    "test_versoes" : cada versão tem o seu esquema e ETag, e uma versão fora de "DOCUMENTACAO_VERSOES" não é guardada.
+    "test_mesmo_esquema_do_drf_yasg" : o esquema é o mesmo da view original do drf_yasg, sem o "host" e o "schemes".
+    "test_arquivo_do_comando" : com o arquivo do "gerar_documentacao" o esquema não é gerado; um arquivo de outro código é ignorado.
+    """
+
+    fixtures = ['prototipo_banco.json']
+    url = '/swagger/?format=openapi'
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        limpar_esquemas()
+        self.addCleanup(limpar_esquemas)
+        self.arquivo = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), 'openapi.json')
+        self.enterContext(override_settings(DOCUMENTACAO_ARQUIVO=self.arquivo))
+        self.usuario = User.objects.get(username='massoto')
+        self.client.force_authenticate(user=self.usuario)
+        self.gerar = self.enterContext(mock.patch('escola.documentacao.gerar_esquemas', wraps=documentacao.gerar_esquemas))
+
+    def test_esquema_gerado_uma_vez(self):
+        primeira = self.client.get(self.url)
+        self.assertEqual(primeira.status_code, status.HTTP_200_OK)
+        self.assertIn('/estudantes/', json.loads(primeira.content)['paths'])
+        segunda = self.client.get(self.url)
+        self.assertEqual(segunda.content, primeira.content)
+        self.assertEqual(segunda['ETag'], primeira['ETag'])
+
+        yaml = self.client.get('/redoc/', headers={'Accept': 'application/yaml'})
+        self.assertEqual(yaml.status_code, status.HTTP_200_OK)
+        self.assertTrue(yaml['Content-Type'].startswith('application/yaml'))
+        self.assertNotEqual(yaml['ETag'], primeira['ETag'])
+        self.assertEqual(self.gerar.call_count, 1)
+
+    def test_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_versoes(self):
+        v1 = self.client.get(self.url)
+        v2 = self.client.get(self.url + '&version=v2')
+        self.assertNotEqual(v1['ETag'], v2['ETag'])
+        self.assertEqual(json.loads(v2.content)['info']['version'], 'v2')
+        self.assertEqual(self.gerar.call_count, 2)
+
+        response = self.client.get(self.url + '&version=v9')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('ETag', response)
+        self.assertEqual(self.gerar.call_count, 2)
+
+    def test_mesmo_esquema_do_drf_yasg(self):
+        request = APIRequestFactory().get(self.url)
+        force_authenticate(request, user=self.usuario)
+        original = json.loads(schema_view.without_ui()(request).render().content)
+        self.assertEqual(original.pop('host'), 'testserver')
+        original.pop('schemes')
+        self.assertEqual(json.loads(self.client.get(self.url).content), original)
+
+    def test_arquivo_do_comando(self):
+        saida = StringIO()
+        call_command('gerar_documentacao', stdout=saida)
+        self.assertIn('6 esquema(s)', saida.getvalue())
+        self.gerar.reset_mock()
+
+        response = self.client.get(self.url + '&version=v2')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)['info']['version'], 'v2')
+        self.assertEqual(self.gerar.call_count, 0)
+
+        limpar_esquemas()
+        with mock.patch('escola.documentacao.assinatura_codigo', return_value='outro código'):
+            self.assertEqual(self.client.get(self.url + '&version=v2').content, response.content)
+        self.assertEqual(self.gerar.call_count, 1)
@@ -0,0 +1,165 @@
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from rest_framework import status
+from rest_framework.test import APITestCase
+from escola.estatisticas import verificar_banco
+from escola.models import Curso, Estudante, EstatisticaMatricula, Matricula
+
+
+class EstatisticasMatriculasTestCase(APITestCase):
+    """classe EstatisticasMatriculasTestCase
+
+    Intenção :
+    Se trata do teste da tabela de estatísticas das matrículas ("escola/estatisticas.py") e da rota "matriculas/estatisticas/".
+    Depois de cada escrita a tabela precisa ter exatamente as mesmas contagens de um "GROUP BY" sobre as matrículas.
+
+    Argumentos :
+    "APITestCase" : biblioteca de testes do Django Rest, com as fixtures do banco de dados.
+
+    Atributos :
+    "setUp" : limpa o cache (respostas e throttles), autentica o superusuário e cria algumas matrículas pela API, uma a uma e em lote
+    ("bulk_create").
+    "esperado" e "tabela" : contagens por (curso, período) calculadas das matrículas e lidas da tabela de estatísticas.
+    "test_triggers_mantem_a_tabela" : criação, alteração de curso e período, exclusão e exclusão em cascata (estudante e curso).
+    "test_rota_de_estatisticas" : totais por curso, período e nível, com o mesmo número de consultas para qualquer quantidade de
+    matrículas.
+    "test_recalcular_estatisticas" : o comando refaz a tabela depois de ela ser alterada sem os triggers.
+    "test_outros_bancos_sao_recusados" : a verificação do Django acusa um banco que não é SQLite, já que sem os triggers os totais
+    ficariam em 0.
+    "totais_cursos" : "total_matriculas" de cada curso comparado com a contagem das matrículas.
+    "test_total_matriculas_dos_cursos" : o contador do curso acompanha criação, lote, alteração, exclusão e cascata, e o "save" de
+    um curso lido antes de uma matrícula não volta o contador.
+    "test_save_de_curso_sem_linha" : o "save" de um curso cuja linha foi apagada, ou copiado com "pk = None", insere a linha, com
+    o contador em 0.
+    "test_rota_de_cursos" : "cursos/" traz o total, ordena por ele e não responde 304 nem do cache depois de uma nova matrícula.
+    """
+
+    fixtures = ['prototipo_banco.json']
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client.force_authenticate(user=User.objects.get(username='massoto'))
+        for estudante, curso, periodo in ((1, 1, 'M'), (2, 1, 'M'), (3, 1, 'N'), (1, 2, 'V')):
+            response = self.client.post('/matriculas/', {'estudante': estudante, 'curso': curso, 'periodo': periodo})
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        lote = [{'estudante': estudante, 'curso': 3, 'periodo': 'N'} for estudante in range(4, 10)]
+        response = self.client.post('/matriculas/lote/', lote, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def esperado(self):
+        return {
+            (linha['curso_id'], linha['periodo']): linha['total']
+            for linha in Matricula.objects.values('curso_id', 'periodo').annotate(total=Count('id')).order_by()
+        }
+
+    def tabela(self):
+        return {(curso_id, periodo): total for curso_id, periodo, total in EstatisticaMatricula.objects.values_list('curso_id', 'periodo', 'total')}
+
+    def test_triggers_mantem_a_tabela(self):
+        self.assertEqual(self.tabela(), {(1, 'M'): 2, (1, 'N'): 1, (2, 'V'): 1, (3, 'N'): 6})
+
+        Matricula.objects.filter(estudante_id=3, curso_id=1).update(periodo='V')
+        Matricula.objects.filter(estudante_id=4).update(curso_id=2)
+        self.assertEqual(self.tabela(), self.esperado())
+
+        Matricula.objects.filter(estudante_id=2).delete()
+        Estudante.objects.get(pk=5).delete()
+        self.assertEqual(self.tabela(), self.esperado())
+
+        Curso.objects.get(pk=3).delete()
+        self.assertEqual(self.tabela(), self.esperado())
+        self.assertFalse(EstatisticaMatricula.objects.filter(curso_id=3).exists())
+
+    def test_rota_de_estatisticas(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/matriculas/estatisticas/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 10)
+        self.assertEqual(response.data['por_periodo'], {'M': 2, 'V': 1, 'N': 7})
+        niveis = {nivel: 0 for nivel, _ in Curso.NIVEL}
+        for curso in Curso.objects.filter(pk__in=[1, 2, 3]):
+            niveis[curso.nivel] += Matricula.objects.filter(curso=curso).count()
+        self.assertEqual(response.data['por_nivel'], niveis)
+        self.assertEqual(len(response.data['por_curso']), Curso.objects.count())
+        self.assertEqual(response.data['por_curso'][0], {
+            'curso': 1, 'codigo': Curso.objects.get(pk=1).codigo, 'nivel': Curso.objects.get(pk=1).nivel, 'total': 3,
+            'por_periodo': {'M': 2, 'V': 0, 'N': 1},
+        })
+
+        Matricula.objects.bulk_create(Matricula(estudante_id=estudante, curso_id=4, periodo='M') for estudante in range(10, 50))
+        with self.assertNumQueries(2):
+            response = self.client.get('/matriculas/estatisticas/')
+        self.assertEqual(response.data['total'], 50)
+
+    def test_recalcular_estatisticas(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER escola_estatisticamatricula_insert')
+        Matricula.objects.create(estudante_id=10, curso_id=5, periodo='M')
+        EstatisticaMatricula.objects.filter(curso_id=1).update(total=99)
+        self.assertNotEqual(self.tabela(), self.esperado())
+
+        saida = StringIO()
+        call_command('recalcular_estatisticas', stdout=saida)
+        self.assertEqual(self.tabela(), self.esperado())
+        self.assertIn('5 linha(s)', saida.getvalue())
+
+        Matricula.objects.create(estudante_id=11, curso_id=5, periodo='M')
+        self.assertEqual(self.tabela(), self.esperado())
+
+    def test_outros_bancos_sao_recusados(self):
+        self.assertEqual(verificar_banco(None), [])
+        with mock.patch.object(connection, 'vendor', 'postgresql'):
+            erros = verificar_banco(None)
+        self.assertEqual([erro.id for erro in erros], ['escola.E001'])
+        self.assertIn('"default" (postgresql)', erros[0].msg)
+
+    def totais_cursos(self):
+        esperado = dict(Curso.objects.annotate(contagem=Count('matricula')).values_list('id', 'contagem'))
+        return dict(Curso.objects.values_list('id', 'total_matriculas')), esperado
+
+    def test_total_matriculas_dos_cursos(self):
+        self.assertEqual(Curso.objects.get(pk=3).total_matriculas, 6)
+        self.assertEqual(*self.totais_cursos())
+
+        curso = Curso.objects.get(pk=1)
+        Matricula.objects.filter(estudante_id=4).update(curso_id=1)
+        Matricula.objects.filter(estudante_id=2).delete()
+        Estudante.objects.get(pk=5).delete()
+        self.assertEqual(*self.totais_cursos())
+
+        curso.descricao = 'Alterado'
+        curso.save()
+        self.assertEqual(*self.totais_cursos())
+        self.assertEqual(Curso.objects.get(pk=1).descricao, 'Alterado')
+
+    def test_save_de_curso_sem_linha(self):
+        curso = Curso.objects.create(codigo='APG', descricao='Apagado')
+        Curso.objects.filter(pk=curso.pk).delete()
+        curso.save()
+        self.assertTrue(Curso.objects.filter(pk=curso.pk, codigo='APG').exists())
+
+        copia = Curso.objects.get(pk=3)
+        copia.pk, copia.codigo = None, 'CPY'
+        copia.save()
+        self.assertNotEqual(copia.pk, 3)
+        self.assertEqual(Curso.objects.get(pk=copia.pk).total_matriculas, 0)
+        self.assertEqual(*self.totais_cursos())
+
+    def test_rota_de_cursos(self):
+        response = self.client.get('/cursos/?ordering=-total_matriculas')
+        self.assertEqual([(curso['id'], curso['total_matriculas']) for curso in response.data['results'][:3]], [(3, 6), (1, 3), (2, 1)])
+
+        primeira = self.client.get('/cursos/2/')
+        self.assertEqual(primeira.data['total_matriculas'], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/matriculas/', {'estudante': 20, 'curso': 2, 'periodo': 'M'})
+        response = self.client.get('/cursos/2/', headers={'If-None-Match': primeira['ETag']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_matriculas'], 2)
+        self.assertEqual(response['X-Cache'], 'MISS')
@@ -1,8 +1,18 @@
+import base64
+import csv
+import json
+from base64 import b64decode
+from asgiref.sync import async_to_sync
+from urllib.parse import parse_qs, urlparse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from rest_framework.test import APITestCase
 from django.urls import reverse
 from rest_framework import status
 from escola.models import Estudante
+from escola.exportacao import FORMATOS
 from escola.serializers import EstudanteSerializer
 
 
@@ -73,4 +83,207 @@ class EstudantesTestCase(APITestCase):
             'celular' : '21970758285',
         }
         response = self.client.put(f"{self.url}1/", dados)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+class EstudantesPaginacaoCursorTestCase(APITestCase):
+    """classe EstudantesPaginacaoCursorTestCase
+
+    Intenção : 
+    Se trata do teste da paginação por cursor ("?paginacao=cursor"), que percorre todas as páginas através do link "next" e confere se
+    os estudantes vieram completos, sem repetição e na ordem pedida.
+
+    Argumentos : 
+    "APITestCase" é a biblioteca responsável pelos testes dentro do Django Rest, dedicado exclusicamente aos testes de funcionalidade da API.
+
+    Atributos : 
+    "percorrer_paginas" : segue os links "next" a partir da url fornecida e devolve todos os resultados.
+    "test_paginacao_cursor_por_id" : percorre a lista na ordem padrão (id).
+    "test_paginacao_cursor_ordenada_por_nome" : percorre a lista ordenada pelo "OrderingFilter" ("?ordering=nome").
+    "test_paginacao_cursor_com_nomes_repetidos" : com um mesmo nome ocupando várias páginas, percorre a lista nos dois sentidos (links
+    "next" e "previous") e em ordem crescente e decrescente, sem "OFFSET" nas consultas e nos cursores.
+    "test_paginacao_por_numero_continua_padrao" : garante que sem o parâmetro a paginação por número de página (com "count") continua valendo.
+    """
+
+    fixtures = ['prototipo_banco.json']
+    def setUp(self):
+        cache.clear()
+        self.usuario = User.objects.get(username='massoto')
+        self.url = reverse('Estudantes-list')
+        self.client.force_authenticate(user=self.usuario)
+
+    def percorrer_paginas(self, url):
+        resultados = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            resultados += response.data['results']
+            url = response.data['next']
+        return resultados
+
+    def test_paginacao_cursor_por_id(self):
+        resultados = self.percorrer_paginas(self.url + '?paginacao=cursor')
+        ids = [estudante['id'] for estudante in resultados]
+        self.assertEqual(ids, list(Estudante.objects.order_by('id').values_list('id', flat=True)))
+
+    def test_paginacao_cursor_ordenada_por_nome(self):
+        resultados = self.percorrer_paginas(self.url + '?paginacao=cursor&ordering=nome')
+        ids = [estudante['id'] for estudante in resultados]
+        self.assertEqual(ids, list(Estudante.objects.order_by('nome', 'id').values_list('id', flat=True)))
+
+    def test_paginacao_cursor_com_nomes_repetidos(self):
+        for numero in range(45):
+            Estudante.objects.create(
+                nome='Repetido', email='repetido@gmail.com', cpf=f'{numero:011d}', data_nascimento='2000-01-01', celular='21970758285',
+            )
+        for ordering, ordem in (('nome', ('nome', 'id')), ('-nome', ('-nome', '-id'))):
+            esperados = list(Estudante.objects.order_by(*ordem).values_list('id', flat=True))
+            url, paginas = self.url + f'?paginacao=cursor&ordering={ordering}', []
+            while url:
+                with CaptureQueriesContext(connection) as consultas:
+                    response = self.client.get(url)
+                self.assertFalse(any('OFFSET' in consulta['sql'] for consulta in consultas.captured_queries))
+                paginas.append([estudante['id'] for estudante in response.data['results']])
+                url = response.data['next']
+                if url:
+                    self.assertNotIn('o=', b64decode(parse_qs(urlparse(url).query)['cursor'][0]).decode())
+            self.assertEqual(sum(paginas, []), esperados)
+
+            voltando = []
+            url = response.data['previous']
+            while url:
+                response = self.client.get(url)
+                voltando.insert(0, [estudante['id'] for estudante in response.data['results']])
+                url = response.data['previous']
+            self.assertEqual(voltando, paginas[:-1])
+
+    def test_paginacao_por_numero_continua_padrao(self):
+        response = self.client.get(self.url + '?page=2')
+        self.assertEqual(response.data['count'], Estudante.objects.count())
+
+
+class EstudantesLoteTestCase(APITestCase):
+    """classe EstudantesLoteTestCase
+
+    Intenção : 
+    Se trata do teste do cadastro de estudantes em lote ("estudantes/lote/"), tanto do lote válido quanto dos erros reportados por linha.
+
+    Argumentos : 
+    "APITestCase" é a biblioteca responsável pelos testes dentro do Django Rest, dedicado exclusicamente aos testes de funcionalidade da API.
+
+    Atributos : 
+    "setUp" : Cria o contexto com 1 superusuário das fixtures e a url do lote.
+    "test_requisicao_post_lote_valido" : grava todos os estudantes com um número fixo de consultas.
+    "test_requisicao_post_lote_com_erros" : não grava nenhum estudante e retorna os erros na posição de cada linha.
+    "test_requisicao_post_lote_que_nao_e_lista" : um objeto no lugar da lista retorna 400.
+    """
+
+    fixtures = ['prototipo_banco.json']
+    def setUp(self):
+        self.usuario = User.objects.get(username='massoto')
+        self.url = reverse('Estudantes-lote')
+        self.client.force_authenticate(user=self.usuario)
+
+    def estudante(self, cpf, nome='teste', celular='21970758285'):
+        return {
+            'nome' : nome,
+            'email' : 'testelote@gmail.com',
+            'cpf' : cpf,
+            'data_nascimento' : '1985-08-25',
+            'celular' : celular,
+        }
+
+    def test_requisicao_post_lote_valido(self):
+        dados = [self.estudante('82449761012'), self.estudante('52987802021'), self.estudante('68195899056')]
+        total = Estudante.objects.count()
+        with self.assertNumQueries(4):
+            # 1 consulta de CPF, 1 INSERT e o SAVEPOINT/RELEASE da transação
+            response = self.client.post(self.url, dados, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {'criados': 3})
+        self.assertEqual(Estudante.objects.count(), total + 3)
+
+    def test_requisicao_post_lote_com_erros(self):
+        dados = [
+            self.estudante('82449761012'),
+            self.estudante('82449761012'),
+            self.estudante('49465543357'),
+            self.estudante('12345678900'),
+            self.estudante('52987802021', nome='teste 1'),
+            self.estudante('68195899056', celular='123'),
+        ]
+        total = Estudante.objects.count()
+        response = self.client.post(self.url, dados, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.data), 6)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(list(response.data[1]), ['cpf'])
+        self.assertEqual(list(response.data[2]), ['cpf'])
+        self.assertEqual(list(response.data[3]), ['cpf'])
+        self.assertEqual(list(response.data[4]), ['nome'])
+        self.assertEqual(list(response.data[5]), ['celular'])
+        self.assertEqual(Estudante.objects.count(), total)
+
+    def test_requisicao_post_lote_que_nao_e_lista(self):
+        response = self.client.post(self.url, self.estudante('82449761012'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class EstudantesExportacaoTestCase(APITestCase):
+    """classe EstudantesExportacaoTestCase
+
+    Intenção : 
+    Se trata do teste da exportação de estudantes ("estudantes/exportar/") nos formatos NDJSON e CSV, com os filtros da listagem.
+
+    Argumentos : 
+    "APITestCase" é a biblioteca responsável pelos testes dentro do Django Rest, dedicado exclusicamente aos testes de funcionalidade da API.
+
+    Atributos : 
+    "setUp" : limpa o cache e cria o contexto com 1 superusuário das fixtures e a url da exportação.
+    "test_exportacao_ndjson" : exporta todos os estudantes, cada linha igual ao "EstudanteSerializer".
+    "test_exportacao_csv_com_filtros" : exporta em CSV apenas os estudantes da pesquisa, na ordem pedida.
+    "test_exportacao_formato_invalido" : um formato desconhecido retorna 400.
+    "test_exportacao_asgi" : pelo "async_client" (ASGI) a resposta usa o gerador assíncrono, com o mesmo conteúdo da síncrona.
+    """
+
+    fixtures = ['prototipo_banco.json']
+    def setUp(self):
+        cache.clear()
+        self.usuario = User.objects.get(username='massoto')
+        self.url = reverse('Estudantes-exportar')
+        self.client.force_authenticate(user=self.usuario)
+
+    def test_exportacao_ndjson(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        linhas = [json.loads(linha) for linha in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(linhas), Estudante.objects.count())
+        self.assertEqual(linhas[0], EstudanteSerializer(instance=Estudante.objects.get(pk=1)).data)
+
+    def test_exportacao_csv_com_filtros(self):
+        response = self.client.get(self.url + '?formato=csv&search=ana&ordering=-nome')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        linhas = list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(linhas[0], ['id','nome','email','cpf','data_nascimento','celular'])
+        nomes = [linha[1] for linha in linhas[1:]]
+        self.assertEqual(nomes, list(Estudante.objects.filter(nome__icontains='ana').order_by('-nome').values_list('nome', flat=True)))
+
+    def test_exportacao_formato_invalido(self):
+        response = self.client.get(self.url + '?formato=xml')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_exportacao_asgi(self):
+        User.objects.create_superuser('exportacao', 'exportacao@gmail.com', 'senha')
+        credenciais = {'Authorization': 'Basic ' + base64.b64encode(b'exportacao:senha').decode()}
+
+        async def exportar(url):
+            response = await self.async_client.get(url, headers=credenciais)
+            return response, b''.join([parte async for parte in response.streaming_content])
+
+        for formato in FORMATOS:
+            url = self.url + f'?formato={formato}'
+            response, conteudo = async_to_sync(exportar)(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.is_async)
+            self.assertEqual(conteudo, b''.join(self.client.get(url).streaming_content))
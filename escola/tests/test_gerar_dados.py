@@ -0,0 +1,80 @@
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Sum
+from django.test import TestCase
+from escola.management.commands.gerar_dados import cpf_sintetico
+from escola.models import Curso, Estudante, Matricula
+from escola.validators import celulares_invalidos, cpfs_invalidos, nomes_invalidos
+
+class GerarDadosTestCase(TestCase):
+    """classe GerarDadosTestCase
+
+    Intenção :
+    Se trata do teste do comando "python manage.py gerar_dados", com poucos estudantes e shards pequenos.
+
+    Argumentos :
+    "TestCase" : teste do Django com banco de dados, cada teste começa com a base vazia.
+
+    Atributos :
+    "gerar" : executa o comando e retorna a saída.
+    "linhas" : estudantes e matrículas gravados (sem as chaves primárias das matrículas e as datas de alteração).
+    "test_dados_validos" : CPFs, nomes, celulares e e-mails passam pelas regras da API, e as matrículas pelos triggers dos cursos.
+    "test_mesmo_resultado_com_processos" : a mesma semente grava as mesmas linhas em 1 ou 2 processos; outra semente, outras linhas.
+    "test_cpfs_existentes_e_prefixo" : o estudante de CPF já cadastrado é ignorado com as suas matrículas, e um prefixo de cursos já
+    usado é recusado.
+    """
+
+    def gerar(self, **opcoes):
+        saida = StringIO()
+        call_command('gerar_dados', stdout=saida, **{'estudantes': 250, 'tamanho_shard': 60, 'processos': 0, **opcoes})
+        return saida.getvalue()
+
+    def linhas(self):
+        return (
+            list(Estudante.objects.order_by('id').values_list('id', 'nome', 'email', 'cpf', 'data_nascimento', 'celular')),
+            list(Matricula.objects.order_by('id').values_list('estudante', 'curso', 'periodo')),
+        )
+
+    def test_dados_validos(self):
+        self.assertIn('12 cursos, 250 estudantes (0 CPFs já existentes)', self.gerar())
+        estudantes = Estudante.objects.all()
+        self.assertFalse(any(cpfs_invalidos([estudante.cpf for estudante in estudantes])))
+        self.assertFalse(any(nomes_invalidos([estudante.nome for estudante in estudantes])))
+        self.assertFalse(any(celulares_invalidos([estudante.celular for estudante in estudantes])))
+        self.assertTrue(all(len(estudante.email) <= 30 and '@' in estudante.email for estudante in estudantes))
+
+        matriculas = Matricula.objects.count()
+        self.assertTrue(2 * 250 < matriculas < 4 * 250)
+        self.assertEqual(Curso.objects.aggregate(total=Sum('total_matriculas'))['total'], matriculas)
+        mais_procurado = Curso.objects.order_by('-total_matriculas').first()
+        self.assertEqual(mais_procurado.codigo, 'G01')
+
+    def test_mesmo_resultado_com_processos(self):
+        self.gerar()
+        primeira = self.linhas()
+        Matricula.objects.all().delete()
+        Estudante.objects.all().delete()
+        Curso.objects.all().delete()
+        self.gerar(processos=2)
+        self.assertEqual(self.linhas(), primeira)
+
+        Matricula.objects.all().delete()
+        Estudante.objects.all().delete()
+        Curso.objects.all().delete()
+        self.gerar(semente=2)
+        self.assertNotEqual(self.linhas()[0], primeira[0])
+
+    def test_cpfs_existentes_e_prefixo(self):
+        existente = Estudante.objects.create(
+            nome='Existente', email='existente@gmail.com', cpf=cpf_sintetico(5, 1), data_nascimento='2000-01-01', celular='21970758285',
+        )
+        self.assertIn('249 estudantes (1 CPFs já existentes)', self.gerar())
+        self.assertEqual(Estudante.objects.filter(cpf=existente.cpf).count(), 1)
+        self.assertFalse(Matricula.objects.filter(estudante=existente).exists())
+        self.assertFalse(Estudante.objects.filter(pk=existente.pk + 1 + 5).exists())
+        # o estudante de número 5 teria a chave primária (maior id + 1) + 5
+
+        with self.assertRaisesMessage(CommandError, 'prefixo "G"'):
+            self.gerar()
+        self.gerar(prefixo_cursos='H', semente=3)
@@ -0,0 +1,98 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from escola.models import Estudante, Curso
+
+class ImportarTestCase(TestCase):
+    """classe ImportarTestCase
+
+    Intenção : 
+    Se trata do teste do comando "python manage.py importar", com arquivos CSV e NDJSON criados no próprio teste.
+
+    Argumentos : 
+    "TestCase" é a biblioteca responsável pelos testes dentro do Django Rest, que ulitliza o Unnitest do Python para realiza-los
+
+    Atributos : 
+    "criar_arquivo" : grava um arquivo temporário com o conteúdo fornecido e o remove ao final do teste.
+    "test_importar_estudantes_ndjson" : grava as linhas válidas, ignora o CPF repetido e reporta as inválidas.
+    "test_importar_cursos_csv_com_processos" : importa cursos de um CSV validando em 2 processos.
+    "test_retomar_importacao" : com "--retomar" pula as linhas já gravadas segundo o arquivo de progresso.
+    "test_linhas_mal_formadas" : JSON inválido, linhas que não são objetos e e-mails inválidos são reportados com o número da linha,
+    sem interromper a importação.
+    "test_linhas_em_branco" : as linhas em branco são puladas, mas contam no número da linha reportada.
+    """
+
+    def criar_arquivo(self, conteudo, extensao):
+        descritor, caminho = tempfile.mkstemp(suffix=extensao)
+        with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(conteudo)
+        self.addCleanup(lambda: [os.remove(c) for c in (caminho, caminho + '.progresso') if os.path.exists(c)])
+        return caminho
+
+    def estudante(self, cpf, nome='teste', celular='21970758285', email='teste@gmail.com'):
+        return json.dumps({'nome': nome, 'email': email, 'cpf': cpf, 'data_nascimento': '1985-08-25', 'celular': celular})
+
+    def test_importar_estudantes_ndjson(self):
+        caminho = self.criar_arquivo('\n'.join([
+            self.estudante('82449761012'),
+            self.estudante('82449761012'),
+            self.estudante('12345678900'),
+            self.estudante('52987802021', celular='123'),
+            self.estudante('68195899056'),
+        ]), '.ndjson')
+        saida, erros = StringIO(), StringIO()
+        call_command('importar', caminho, processos=0, tamanho_lote=2, stdout=saida, stderr=erros)
+        self.assertEqual(set(Estudante.objects.values_list('cpf', flat=True)), {'82449761012', '68195899056'})
+        self.assertIn('2 gravados, 1 já existentes, 2 inválidos', saida.getvalue())
+        self.assertIn('linha 3: cpf: CPF inválido!', erros.getvalue())
+        self.assertIn('linhas/s', saida.getvalue())
+        self.assertFalse(os.path.exists(caminho + '.progresso'))
+
+    def test_importar_cursos_csv_com_processos(self):
+        caminho = self.criar_arquivo('codigo,descricao,nivel\nCPP,Curso de C++,I\nCJ,Curto demais,B\nCDJ,Curso de Django,A\n', '.csv')
+        call_command('importar', caminho, modelo='cursos', processos=2, stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(list(Curso.objects.order_by('codigo').values_list('codigo', 'nivel')), [('CDJ', 'A'), ('CPP', 'I')])
+
+    def test_retomar_importacao(self):
+        caminho = self.criar_arquivo('\n'.join([self.estudante('82449761012'), self.estudante('68195899056')]), '.ndjson')
+        with open(caminho + '.progresso', 'w') as progresso:
+            json.dump({'linha': 1}, progresso)
+        call_command('importar', caminho, processos=0, retomar=True, stdout=StringIO())
+        self.assertEqual(list(Estudante.objects.values_list('cpf', flat=True)), ['68195899056'])
+
+    def test_linhas_mal_formadas(self):
+        caminho = self.criar_arquivo('\n'.join([
+            self.estudante('82449761012'),
+            '{"nome": "teste",',
+            '[1, 2]',
+            self.estudante('52987802021', email='teste@'),
+            self.estudante('39053344705', email='x y@gmail.com'),
+            self.estudante('68195899056'),
+        ]), '.ndjson')
+        saida, erros = StringIO(), StringIO()
+        call_command('importar', caminho, processos=0, tamanho_lote=4, stdout=saida, stderr=erros)
+        self.assertEqual(set(Estudante.objects.values_list('cpf', flat=True)), {'82449761012', '68195899056'})
+        self.assertIn('2 gravados, 0 já existentes, 4 inválidos', saida.getvalue())
+        erros = erros.getvalue().splitlines()
+        self.assertTrue(erros[0].startswith('linha 2: JSON inválido'))
+        self.assertEqual(erros[1:], [
+            'linha 3: a linha deve ser um objeto JSON.',
+            'linha 4: email: Insira um endereço de email válido.',
+            'linha 5: email: Insira um endereço de email válido.',
+        ])
+
+    def test_linhas_em_branco(self):
+        caminho = self.criar_arquivo('\n'.join([
+            self.estudante('82449761012'),
+            '',
+            '   ',
+            self.estudante('52987802021', email='teste@'),
+            self.estudante('68195899056'),
+        ]), '.ndjson')
+        saida, erros = StringIO(), StringIO()
+        call_command('importar', caminho, processos=0, stdout=saida, stderr=erros)
+        self.assertIn('2 gravados, 0 já existentes, 1 inválidos', saida.getvalue())
+        self.assertEqual(erros.getvalue().splitlines(), ['linha 4: email: Insira um endereço de email válido.'])
@@ -0,0 +1,106 @@
+import re
+from unittest import mock
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APITestCase
+from escola.models import Curso, Estudante, Matricula
+
+VARREDURA = re.compile(r'SCAN (\w+)$')
+# linha do plano que percorre a tabela inteira, sem usar nenhum índice
+
+def problemas_plano(sql, plano, ordenacao=True):
+# retorna as linhas do plano que indicam uma varredura completa da tabela ou (com "ordenacao") uma ordenação em B-tree temporária.
+# A leitura sem filtro e limitada pela paginação ("SELECT ... ORDER BY id LIMIT 20") percorre apenas as primeiras linhas da
+# chave primária, por isso não conta como varredura
+
+    problemas = []
+    for linha in plano:
+        if ordenacao and 'USE TEMP B-TREE' in linha:
+            problemas.append(linha)
+        elif VARREDURA.match(linha) and (' WHERE ' in sql or ' LIMIT ' not in sql):
+            problemas.append(linha)
+    return problemas
+
+
+class PlanoConsultasTestCase(APITestCase):
+    """classe PlanoConsultasTestCase
+
+    Intenção :
+    Se trata do teste de regressão dos índices ("Meta.indexes" dos models). Captura todas as consultas de cada rota e verifica, com o
+    "EXPLAIN QUERY PLAN" do SQLite, que nenhuma delas percorre uma tabela inteira nem ordena as linhas em uma B-tree temporária.
+    Cada rota é testada com e sem a leitura rápida ("LEITURA_RAPIDA"), que busca colunas diferentes.
+
+    Argumentos :
+    "APITestCase" é a biblioteca responsável pelos testes dentro do Django Rest, dedicado exclusicamente aos testes de funcionalidade da API.
+
+    Atributos :
+    "setUp" : cria matrículas para as rotas de matrículas e autentica o superusuário das fixtures.
+    "verificar_planos" : executa a requisição com o cache limpo e falha mostrando a consulta e o plano de cada problema encontrado.
+    "test_rotas_de_leitura" : listagens, detalhes, ordenação por nome e por total de matrículas, busca e paginação por cursor da API.
+    "test_rotas_de_lote" : consultas de validação dos cadastros em lote de estudantes e de matrículas.
+    "test_admin" : listagens e busca do admin. Na busca ordenada por nome apenas a varredura é verificada, pois ordenar as linhas
+    encontradas pela busca é necessário.
+    Obs: as rotas de exportação leem a tabela inteira por definição e não fazem parte do teste.
+    """
+
+    fixtures = ['prototipo_banco.json']
+
+    def setUp(self):
+        self.usuario = User.objects.get(username='massoto')
+        self.client.force_authenticate(user=self.usuario)
+        for estudante in Estudante.objects.order_by('id')[:5]:
+            for curso in Curso.objects.order_by('id')[:3]:
+                Matricula.objects.create(estudante=estudante, curso=curso)
+
+    def verificar_planos(self, requisicao, ordenacao=True):
+        cache.clear()
+        with CaptureQueriesContext(connection) as consultas:
+            response = requisicao()
+        self.assertLess(response.status_code, 400, response.content)
+        for consulta in consultas.captured_queries:
+            sql = consulta['sql']
+            if not sql.startswith('SELECT'):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                plano = [linha[-1] for linha in cursor.fetchall()]
+            self.assertEqual(problemas_plano(sql, plano, ordenacao), [], f'\n{sql}\n{plano}')
+        return response
+
+    def test_rotas_de_leitura(self):
+        rotas = [
+            '/estudantes/', '/estudantes/?page=2', '/estudantes/?ordering=nome', '/estudantes/?ordering=-nome', '/estudantes/1/',
+            '/estudantes/?version=v2', '/estudantes/?search=pedro', '/estudantes/?search=pedro lucas', '/cursos/', '/cursos/1/',
+            '/matriculas/', '/matriculas/1/', '/estudantes/1/matriculas/', '/cursos/1/matriculas/',
+            '/estudantes/?paginacao=cursor', '/estudantes/?paginacao=cursor&ordering=nome', '/cursos/?ordering=-total_matriculas',
+            '/cursos/?paginacao=cursor&ordering=-total_matriculas',
+        ]
+        for leitura_rapida in (False, True):
+            for rota in rotas:
+                with self.subTest(rota=rota, leitura_rapida=leitura_rapida), override_settings(LEITURA_RAPIDA=leitura_rapida):
+                    response = self.verificar_planos(lambda: self.client.get(rota))
+                    if 'paginacao=cursor' in rota and response.data['next']:
+                        # os 12 cursos das fixtures cabem em uma página
+                        self.verificar_planos(lambda: self.client.get(response.data['next']))
+
+    def test_rotas_de_lote(self):
+        estudantes = [
+            {'nome': 'Zuleica', 'email': 'z@gmail.com', 'cpf': '52998224725', 'data_nascimento': '2000-01-01', 'celular': '21970758285'},
+        ]
+        self.verificar_planos(lambda: self.client.post('/estudantes/lote/', estudantes, format='json'))
+        matriculas = [{'estudante': 1, 'curso': 4, 'periodo': 'N'}, {'estudante': 2, 'curso': 1, 'periodo': 'N'}]
+        self.verificar_planos(lambda: self.client.post('/matriculas/lote/', matriculas, format='json'))
+        self.verificar_planos(lambda: self.client.post('/matriculas/lote/', {'curso_origem': 1, 'curso': 5}, format='json'))
+
+    def test_admin(self):
+        self.client.force_login(self.usuario)
+        for modelo in (Curso, Matricula):
+            # com tudo em uma única página o admin não usa o LIMIT, o que não acontece com o volume real de cursos e matrículas
+            self.enterContext(mock.patch.object(admin.site._registry[modelo], 'list_per_page', 5))
+        for rota in ['/admin/escola/estudante/', '/admin/escola/estudante/?p=2', '/admin/escola/curso/', '/admin/escola/matricula/']:
+            with self.subTest(rota=rota):
+                self.verificar_planos(lambda: self.client.get(rota))
+        self.verificar_planos(lambda: self.client.get('/admin/escola/estudante/?q=pedro'), ordenacao=False)
@@ -1,8 +1,11 @@
+import csv
+import json
 from django.contrib.auth.models import User
 from rest_framework.test import APITestCase
 from django.urls import reverse
 from rest_framework import status
 from escola.models import Curso, Estudante, Matricula
+from escola.serializers import MatriculaSerializer
 
 class MatriculasTestCase(APITestCase):
     """classe MatriculasTestCase
@@ -67,4 +70,153 @@ class MatriculasTestCase(APITestCase):
             'periodo' : 'N'
         }
         response = self.client.put(f"{self.url}1/", dados)
-        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+class MatriculasConsultasTestCase(APITestCase):
+    """classe MatriculasConsultasTestCase
+
+    Intenção : 
+    Se trata de um teste de regressão da quantidade de consultas ao banco feitas pelas rotas de matrículas. A quantidade deve ser fixa, 
+    independente de quantas matrículas existem na página, evitando o problema de "N+1" consultas.
+
+    Argumentos : 
+    "APITestCase": é a biblioteca responsável pelos testes dentro do Django Rest, dedicado exclusicamente aos testes de funcionalidade da API.
+
+    Atributos : 
+    "setUp" : Cria o contexto com 1 superusuário, 1 estudante e 1 curso vindos das fixtures.
+    "criar_matriculas" : Cria a quantidade pedida de matrículas do estudante no curso.
+    "test_*" : Fazem a mesma requisição "get" com 1 e com 20 matrículas e verificam através do "assertNumQueries" que o número de consultas
+    é o mesmo (1 para a agregação do ETag/Last-Modified, 1 para o COUNT da paginação e 1 para a página em si).
+    """
+
+    fixtures = ['prototipo_banco.json']
+    def setUp(self):
+        self.usuario = User.objects.get(username='massoto')
+        self.client.force_authenticate(user=self.usuario)
+
+        self.estudante = Estudante.objects.get(pk=12)
+        self.curso = Curso.objects.get(pk=3)
+
+    def criar_matriculas(self, quantidade):
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(quantidade):
+                Matricula.objects.create(estudante=self.estudante, curso=self.curso, periodo='N')
+
+    def verificar_consultas(self, url):
+        for quantidade in (1, 19):
+            self.criar_matriculas(quantidade)
+            with self.assertNumQueries(3):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_consultas_lista_matriculas(self):
+        self.verificar_consultas(reverse('Matriculas-list'))
+
+    def test_consultas_lista_matriculas_do_estudante(self):
+        self.verificar_consultas(f"/estudantes/{self.estudante.pk}/matriculas/")
+
+    def test_consultas_lista_matriculas_do_curso(self):
+        self.verificar_consultas(f"/cursos/{self.curso.pk}/matriculas/")
+
+
+class MatriculasLoteTestCase(APITestCase):
+    """classe MatriculasLoteTestCase
+
+    Intenção : 
+    Se trata do teste da matrícula em lote ("matriculas/lote/"), tanto pela lista de matrículas quanto pela forma resumida 
+    (todos os estudantes de um curso em outro curso).
+
+    Argumentos : 
+    "APITestCase": é a biblioteca responsável pelos testes dentro do Django Rest, dedicado exclusicamente aos testes de funcionalidade da API.
+
+    Atributos : 
+    "setUp" : Cria o contexto com 1 superusuário das fixtures, a url do lote e 1 matrícula já existente.
+    "test_requisicao_post_lote_de_matriculas" : grava as novas matrículas e ignora a repetida, com um número fixo de consultas.
+    "test_requisicao_post_lote_com_ids_inexistentes" : retorna os erros na posição de cada linha e não grava nada.
+    "test_requisicao_post_lote_de_turma" : matricula no curso de destino todos os estudantes do curso de origem.
+    """
+
+    fixtures = ['prototipo_banco.json']
+    def setUp(self):
+        self.usuario = User.objects.get(username='massoto')
+        self.url = reverse('Matriculas-lote')
+        self.client.force_authenticate(user=self.usuario)
+        Matricula.objects.create(estudante_id=1, curso_id=3, periodo='M')
+
+    def test_requisicao_post_lote_de_matriculas(self):
+        dados = [
+            {'estudante': 1, 'curso': 3, 'periodo': 'M'},
+            {'estudante': 2, 'curso': 3, 'periodo': 'V'},
+            {'estudante': 3, 'curso': 4, 'periodo': 'N'},
+            {'estudante': 3, 'curso': 4, 'periodo': 'N'},
+        ]
+        with self.assertNumQueries(6):
+            # 1 consulta de estudantes, 1 de cursos, 1 de matrículas existentes, 1 INSERT e o SAVEPOINT/RELEASE da transação
+            response = self.client.post(self.url, dados, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {'criadas': 2, 'ignoradas': 2})
+        self.assertEqual(Matricula.objects.count(), 3)
+
+    def test_requisicao_post_lote_com_ids_inexistentes(self):
+        dados = [
+            {'estudante': 2, 'curso': 3, 'periodo': 'V'},
+            {'estudante': 999, 'curso': 3, 'periodo': 'V'},
+            {'estudante': 2, 'curso': 999, 'periodo': 'V'},
+        ]
+        response = self.client.post(self.url, dados, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(list(response.data[1]), ['estudante'])
+        self.assertEqual(list(response.data[2]), ['curso'])
+        self.assertEqual(Matricula.objects.count(), 1)
+
+    def test_requisicao_post_lote_de_turma(self):
+        Matricula.objects.create(estudante_id=2, curso_id=3, periodo='M')
+        dados = {'curso_origem': 3, 'curso': 5, 'periodo': 'N'}
+        response = self.client.post(self.url, dados, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {'criadas': 2, 'ignoradas': 0})
+        self.assertEqual(set(Matricula.objects.filter(curso_id=5).values_list('estudante_id', flat=True)), {1, 2})
+
+
+class MatriculasExportacaoTestCase(APITestCase):
+    """classe MatriculasExportacaoTestCase
+
+    Intenção : 
+    Se trata do teste da exportação de matrículas ("matriculas/exportar/") nos formatos NDJSON e CSV, que lê as colunas 
+    "estudante_id" e "curso_id" do banco e as exporta com os nomes "estudante" e "curso" do "MatriculaSerializer".
+
+    Argumentos : 
+    "APITestCase": é a biblioteca responsável pelos testes dentro do Django Rest, dedicado exclusicamente aos testes de funcionalidade da API.
+
+    Atributos : 
+    "setUp" : Cria o contexto com 1 superusuário das fixtures, a url da exportação e 3 matrículas.
+    "test_exportacao_ndjson" : cada linha é igual ao "MatriculaSerializer" da matrícula, na ordem dos ids.
+    "test_exportacao_csv" : o cabeçalho tem os nomes dos campos e as linhas os ids do estudante e do curso de cada matrícula.
+    """
+
+    fixtures = ['prototipo_banco.json']
+    def setUp(self):
+        self.usuario = User.objects.get(username='massoto')
+        self.url = reverse('Matriculas-exportar')
+        self.client.force_authenticate(user=self.usuario)
+        Matricula.objects.create(estudante_id=1, curso_id=3, periodo='M')
+        Matricula.objects.create(estudante_id=2, curso_id=3, periodo='V')
+        Matricula.objects.create(estudante_id=2, curso_id=5, periodo='N')
+
+    def test_exportacao_ndjson(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        linhas = [json.loads(linha) for linha in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(linhas, [MatriculaSerializer(instance=matricula).data for matricula in Matricula.objects.order_by('id')])
+
+    def test_exportacao_csv(self):
+        response = self.client.get(self.url + '?formato=csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="matriculas.csv"')
+        linhas = list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(linhas[0], ['id', 'estudante', 'curso', 'periodo'])
+        self.assertEqual(
+            [linha[1:] for linha in linhas[1:]],
+            [['1', '3', 'M'], ['2', '3', 'V'], ['2', '5', 'N']],
+        )
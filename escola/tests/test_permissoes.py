@@ -0,0 +1,104 @@
+import base64
+import time
+from unittest import mock
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from escola.authentication import limpar_credenciais
+from escola.permissoes import limpar_permissoes
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class PermissoesCacheTestCase(APITestCase):
+    """classe PermissoesCacheTestCase
+
+    Intenção :
+    Se trata do teste do cache de permissões por usuário ("escola/permissoes.py"). As requisições usam o HTTP Basic, para que cada
+    uma carregue o usuário novamente, como fora dos testes (o "force_authenticate" reaproveita o mesmo objeto).
+
+    Argumentos :
+    "APITestCase" : biblioteca de testes do Django Rest, com as fixtures do banco de dados.
+
+    Atributos :
+    "setUp" : limpa o cache, as credenciais e as permissões guardadas e cria o usuário "secretaria", com a permissão de alterar
+    estudantes e o grupo "cadastro" (permissão de cadastrar estudantes).
+    "requisicoes" : status de um conjunto de requisições que dependem das permissões de modelo ("DjangoModelPermissions"), com um
+    novo estudante de cpf diferente a cada chamada.
+    "test_mesmas_decisoes_do_model_backend" : os mesmos status com o "ModelBackend" do Django, na primeira vez e com o cache.
+    "test_menos_consultas" : depois da primeira requisição as permissões não são consultadas novamente.
+    "test_alteracoes_invalidam_o_cache" : permissões e grupos alterados pelos dois lados das relações, grupo apagado e usuário
+    desativado valem já na requisição seguinte.
+    "test_tempo_maximo" : uma alteração sem signals ("bulk_create") vale depois de "PERMISSOES_CACHE_TEMPO" segundos.
+    """
+
+    fixtures = ['prototipo_banco.json']
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        limpar_credenciais()
+        self.addCleanup(limpar_credenciais)
+        limpar_permissoes()
+        self.addCleanup(limpar_permissoes)
+        self.usuario = User.objects.create_user(username='secretaria', password='senha-secretaria')
+        self.usuario.user_permissions.add(Permission.objects.get(codename='change_estudante'))
+        self.grupo = Group.objects.create(name='cadastro')
+        self.grupo.permissions.add(Permission.objects.get(codename='add_estudante'))
+        self.usuario.groups.add(self.grupo)
+        self.client.credentials(HTTP_AUTHORIZATION='Basic ' + base64.b64encode(b'secretaria:senha-secretaria').decode())
+
+    def nova_matricula(self):
+        return self.client.post('/matriculas/', {'estudante': 1, 'curso': 1, 'periodo': 'M'}).status_code
+
+    def requisicoes(self, cpf):
+        estudante = {'nome': 'Permissão', 'email': 'permissao@gmail.com', 'cpf': cpf, 'data_nascimento': '2000-01-01', 'celular': '21970758285'}
+        return [
+            self.client.get('/estudantes/').status_code,
+            self.client.put('/estudantes/2/', {**estudante, 'cpf': '22829858182'}).status_code,
+            self.client.post('/estudantes/', estudante).status_code,
+            self.client.delete('/estudantes/3/').status_code,
+            self.nova_matricula(),
+        ]
+
+    def test_mesmas_decisoes_do_model_backend(self):
+        with override_settings(AUTHENTICATION_BACKENDS=['django.contrib.auth.backends.ModelBackend']):
+            esperado = self.requisicoes('52998224725')
+        self.assertEqual(esperado, [200, 200, 201, 403, 403])
+        self.assertEqual(self.requisicoes('11144477735'), esperado)
+        self.assertEqual(self.requisicoes('12345678909'), esperado)
+
+    def test_menos_consultas(self):
+        with CaptureQueriesContext(connection) as primeira:
+            self.assertEqual(self.client.delete('/estudantes/3/').status_code, status.HTTP_403_FORBIDDEN)
+        with self.assertNumQueries(len(primeira) - 2):
+            self.assertEqual(self.client.delete('/estudantes/3/').status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_alteracoes_invalidam_o_cache(self):
+        adicionar_matricula = Permission.objects.get(codename='add_matricula')
+        self.assertEqual(self.nova_matricula(), status.HTTP_403_FORBIDDEN)
+        self.grupo.permissions.add(adicionar_matricula)
+        self.assertEqual(self.nova_matricula(), status.HTTP_201_CREATED)
+        self.usuario.groups.remove(self.grupo)
+        self.assertEqual(self.nova_matricula(), status.HTTP_403_FORBIDDEN)
+        self.grupo.user_set.add(self.usuario)
+        self.assertEqual(self.nova_matricula(), status.HTTP_201_CREATED)
+        self.grupo.delete()
+        self.assertEqual(self.nova_matricula(), status.HTTP_403_FORBIDDEN)
+
+        self.usuario.user_permissions.add(adicionar_matricula)
+        self.assertEqual(self.nova_matricula(), status.HTTP_201_CREATED)
+        self.usuario.is_active = False
+        self.usuario.save()
+        self.assertEqual(self.nova_matricula(), status.HTTP_401_UNAUTHORIZED)
+
+    def test_tempo_maximo(self):
+        self.assertEqual(self.nova_matricula(), status.HTTP_403_FORBIDDEN)
+        User.user_permissions.through.objects.bulk_create([
+            User.user_permissions.through(user=self.usuario, permission=Permission.objects.get(codename='add_matricula')),
+        ])
+        self.assertEqual(self.nova_matricula(), status.HTTP_403_FORBIDDEN)
+        with mock.patch('escola.permissoes.time.monotonic', return_value=time.monotonic() + 61):
+            self.assertEqual(self.nova_matricula(), status.HTTP_201_CREATED)
@@ -0,0 +1,93 @@
+import datetime
+import json
+from io import BytesIO
+from unittest import mock
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from escola.models import Curso
+from escola.renderers import JSONRapidoRenderer, MessagePackRenderer, msgpack, orjson
+from escola.parsers import JSONRapidoParser
+
+class JSONRapidoTestCase(SimpleTestCase):
+    """classe JSONRapidoTestCase
+
+    Intenção : 
+    Se trata do teste do renderer e do parser JSON com "orjson" ("escola/renderers.py" e "escola/parsers.py"), que devem gerar e ler
+    exatamente o mesmo que os do Django Rest.
+
+    Argumentos : 
+    "SimpleTestCase" é a versão do TestCase do Django que não usa o banco de dados.
+
+    Atributos : 
+    "dados" : dados com os tipos que aparecem nas respostas (datas, acentos, textos traduzidos, \\u2028...).
+    "test_mesma_saida_do_json_renderer" : compara os bytes com o "JSONRenderer" do Django Rest, compacto e indentado.
+    "test_parser_json" : lê o mesmo que o "json.loads" e responde erro para JSON inválido e NaN.
+    """
+
+    dados = {
+        'nome': 'João\u2028da Conceição\u2029',
+        'data_nascimento': datetime.date(2000, 1, 31),
+        'atualizado_em': datetime.datetime(2024, 9, 26, 12, 36, 0, 123456, tzinfo=datetime.timezone.utc),
+        'valor': Decimal('10.50'),
+        'erro': gettext_lazy('This field is required.'),
+        'lista': [1, 2.5, None, True, {'a': []}],
+    }
+
+    def test_mesma_saida_do_json_renderer(self):
+        for media_type in ('application/json', 'application/json; indent=4'):
+            self.assertEqual(
+                JSONRapidoRenderer().render(self.dados, media_type),
+                JSONRenderer().render(self.dados, media_type),
+            )
+
+    def test_parser_json(self):
+        texto = json.dumps({'nome': 'João', 'lista': [1, 2.5, None]}).encode()
+        self.assertEqual(JSONRapidoParser().parse(BytesIO(texto)), json.loads(texto))
+        for invalido in (b'{"nome": ', b'{"valor": NaN}'):
+            with self.assertRaises(Exception):
+                JSONRapidoParser().parse(BytesIO(invalido))
+
+class MessagePackTestCase(APITestCase):
+    """classe MessagePackTestCase
+
+    Intenção : 
+    Se trata do teste do formato MessagePack na API, escolhido pelos cabeçalhos "Accept" e "Content-Type".
+
+    Argumentos : 
+    "APITestCase" é a biblioteca responsável pelos testes dentro do Django Rest, dedicado exclusicamente aos testes de funcionalidade da API.
+
+    Atributos : 
+    "test_requisicao_get_em_msgpack" : a resposta em MessagePack traz os mesmos dados da resposta em JSON.
+    "test_requisicao_post_em_msgpack" : cria um curso enviando o corpo em MessagePack.
+    "test_formatos_rapidos_em_uso" : o "orjson" e o "msgpack" (do "requirements.txt") estão instalados e as respostas JSON da API
+    passam pelo "orjson", e não pelo json padrão.
+    """
+
+    fixtures = ['prototipo_banco.json']
+    def setUp(self):
+        self.client.force_authenticate(user=User.objects.get(username='massoto'))
+
+    def test_requisicao_get_em_msgpack(self):
+        url = '/estudantes/1/'
+        response = self.client.get(url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content), json.loads(self.client.get(url, HTTP_ACCEPT='application/json').content))
+
+    def test_requisicao_post_em_msgpack(self):
+        corpo = MessagePackRenderer().render({'codigo': 'MSG', 'descricao': 'Curso em MessagePack', 'nivel': 'A'})
+        response = self.client.post('/cursos/', corpo, content_type='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Curso.objects.get(codigo='MSG').nivel, 'A')
+
+    def test_formatos_rapidos_em_uso(self):
+        self.assertIsNotNone(orjson)
+        self.assertIsNotNone(msgpack)
+        with mock.patch.object(orjson, 'dumps', wraps=orjson.dumps) as dumps:
+            response = self.client.get('/estudantes/1/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        dumps.assert_called_once()
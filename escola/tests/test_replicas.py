@@ -0,0 +1,153 @@
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from escola import replicas
+from escola.models import Curso, Estudante
+from escola.replicas import RoteadorLeituraEscrita, banco_leitura, copiar_banco
+
+
+class RoteadorLeituraEscritaTestCase(SimpleTestCase):
+    """classe RoteadorLeituraEscritaTestCase
+
+    Intenção :
+    Se trata do teste do roteador de leitura e escrita ("escola/replicas.py"), sem consultar o banco: o alias usado por um queryset
+    ("queryset.db") já é decidido pelo roteador.
+
+    Argumentos :
+    "SimpleTestCase" : teste do Django sem o banco de testes.
+
+    Atributos :
+    "test_leitura_na_replica_da_requisicao" : com a réplica definida em "banco_leitura" as leituras vão para ela, e sem ela para o "default".
+    "test_escrita_no_principal" : a escrita vai para o "default" mesmo com um objeto lido de uma réplica.
+    "test_replicas_sem_migracao" : o "migrate" não altera as réplicas.
+    "test_rodizio_entre_replicas" : o "escolher_replica" distribui as leituras entre todas as réplicas.
+    """
+
+    def usar_replica(self, alias):
+        token = banco_leitura.set(alias)
+        self.addCleanup(banco_leitura.reset, token)
+
+    @override_settings(REPLICAS_LEITURA=['replica_1'])
+    def test_leitura_na_replica_da_requisicao(self):
+        self.assertEqual(Estudante.objects.all().db, 'default')
+        self.usar_replica('replica_1')
+        self.assertEqual(Estudante.objects.all().db, 'replica_1')
+
+    @override_settings(REPLICAS_LEITURA=['replica_1'])
+    def test_escrita_no_principal(self):
+        self.usar_replica('replica_1')
+        estudante = Estudante(nome='Teste')
+        estudante._state.db = 'replica_1'
+        self.assertEqual(RoteadorLeituraEscrita().db_for_write(Estudante, instance=estudante), 'default')
+        curso = Curso()
+        curso._state.db = 'default'
+        self.assertTrue(RoteadorLeituraEscrita().allow_relation(estudante, curso))
+
+    @override_settings(REPLICAS_LEITURA=['replica_1'])
+    def test_replicas_sem_migracao(self):
+        self.assertFalse(RoteadorLeituraEscrita().allow_migrate('replica_1', 'escola'))
+        self.assertIsNone(RoteadorLeituraEscrita().allow_migrate('default', 'escola'))
+
+    @override_settings(REPLICAS_LEITURA=['replica_1', 'replica_2'])
+    def test_rodizio_entre_replicas(self):
+        escolhidas = [replicas.escolher_replica() for _ in range(4)]
+        self.assertEqual(sorted(escolhidas), ['replica_1', 'replica_1', 'replica_2', 'replica_2'])
+
+
+@override_settings(REPLICAS_LEITURA=['default'])
+class LeituraReplicaTestCase(APITestCase):
+    """classe LeituraReplicaTestCase
+
+    Intenção :
+    Se trata do teste do "LeituraReplicaMixin" nas views. A réplica configurada é o próprio "default" (o único banco dos testes), e o
+    "escolher_replica" é observado para saber quando uma leitura foi enviada para uma réplica.
+
+    Argumentos :
+    "APITestCase" : biblioteca de testes do Django Rest, com as fixtures do banco de dados.
+
+    Atributos :
+    "setUp" : limpa o cache (onde ficam os clientes fixados no banco principal) e observa o "escolher_replica".
+    "test_leituras_nas_replicas" : listagem, detalhe e listas aninhadas de matrículas vão para a réplica, e a réplica não fica
+    definida depois da requisição.
+    "test_cliente_fixado_depois_da_escrita" : depois de uma escrita o mesmo cliente lê do banco principal, e os outros continuam
+    nas réplicas.
+    "test_matriculas_no_principal" : a "MatriculaViewSet" não usa as réplicas.
+    """
+
+    fixtures = ['prototipo_banco.json']
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.usuario = User.objects.get(username='massoto')
+        self.escolher = self.enterContext(mock.patch('escola.replicas.escolher_replica', wraps=replicas.escolher_replica))
+
+    def test_leituras_nas_replicas(self):
+        for url in ('/estudantes/', '/estudantes/1/', '/cursos/', '/cursos/1/', '/estudantes/1/matriculas/', '/cursos/1/matriculas/'):
+            self.client.force_authenticate(user=self.usuario)
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+        self.assertEqual(self.escolher.call_count, 6)
+        self.assertIsNone(banco_leitura.get())
+
+    def test_cliente_fixado_depois_da_escrita(self):
+        self.client.force_authenticate(user=self.usuario)
+        response = self.client.post('/cursos/', {'codigo': 'RPL', 'descricao': 'Réplica', 'nivel': 'B'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get('/cursos/')
+        self.assertIn('RPL', [curso['codigo'] for curso in response.data['results']])
+        self.assertEqual(self.escolher.call_count, 0)
+
+        self.client.force_authenticate(user=None)
+        self.client.get('/cursos/')
+        self.assertEqual(self.escolher.call_count, 1)
+
+    def test_matriculas_no_principal(self):
+        self.client.force_authenticate(user=self.usuario)
+        response = self.client.get('/matriculas/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.escolher.call_count, 0)
+
+
+class SincronizacaoReplicaTestCase(SimpleTestCase):
+    """classe SincronizacaoReplicaTestCase
+
+    Intenção :
+    Se trata do teste da cópia do banco principal para uma réplica ("copiar_banco"), com os dois bancos em arquivos temporários.
+
+    Argumentos :
+    "SimpleTestCase" : teste do Django sem o banco de testes, a conexão de origem é criada pelo próprio teste.
+
+    Atributos :
+    "test_copia_e_atualiza_a_replica" : a réplica recebe o esquema e as linhas, e uma nova cópia traz as alterações feitas depois,
+    inclusive para uma conexão que já estava aberta na réplica.
+    """
+
+    def test_copia_e_atualiza_a_replica(self):
+        pasta = self.enterContext(tempfile.TemporaryDirectory())
+        destino = os.path.join(pasta, 'replica.sqlite3')
+        conexoes = ConnectionHandler({'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.path.join(pasta, 'principal.sqlite3')}})
+        origem = conexoes['default']
+        self.addCleanup(origem.close)
+        with origem.cursor() as cursor:
+            cursor.execute('CREATE TABLE curso (codigo TEXT)')
+            cursor.execute("INSERT INTO curso VALUES ('CTT')")
+
+        copiar_banco(origem, destino)
+        with closing(sqlite3.connect(destino)) as replica:
+            self.assertEqual(replica.execute('SELECT codigo FROM curso').fetchall(), [('CTT',)])
+            with origem.cursor() as cursor:
+                cursor.execute("INSERT INTO curso VALUES ('POO')")
+            self.assertEqual(replica.execute('SELECT COUNT(*) FROM curso').fetchone(), (1,))
+            copiar_banco(origem, destino)
+            self.assertEqual(replica.execute('SELECT COUNT(*) FROM curso').fetchone(), (2,))
@@ -1,4 +1,8 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
 from escola.models import Estudante, Curso, Matricula
 from escola.serializers import EstudanteSerializer, CursoSerializer, MatriculaSerializer
 
@@ -69,7 +73,7 @@ class SerializerCursoTestCase(TestCase):
 
     def test_verifica_campos_serializados_do_curso(self):
         dados = self.serializer_curso.data
-        self.assertEqual(set(dados.keys()), set(['id','codigo', 'descricao', 'nivel']))
+        self.assertEqual(set(dados.keys()), set(['id','codigo', 'descricao', 'nivel', 'total_matriculas']))
 
     def test_verifica_conteudo_dos_campos_serializados_do_curso(self):
          dados = self.serializer_curso.data
@@ -77,6 +81,7 @@ class SerializerCursoTestCase(TestCase):
          self.assertEqual(dados['codigo'], self.curso.codigo)
          self.assertEqual(dados['descricao'], self.curso.descricao)
          self.assertEqual(dados['nivel'], self.curso.nivel)
+         self.assertEqual(dados['total_matriculas'], 0)
 
 class SerializerMatriculaTestCase(TestCase):
     """Classe SerializerMatriculaTestCase
@@ -131,3 +136,50 @@ class SerializerMatriculaTestCase(TestCase):
         self.assertEqual(dados["periodo"], self.matricula.periodo)
 
 
+
+
+class LeituraRapidaTestCase(APITestCase):
+    """Classe LeituraRapidaTestCase
+
+    Intenção : 
+    Se trata do teste da leitura rápida ("escola/leitura_rapida.py"), que deve gerar exatamente os mesmos bytes que os serializers
+    em todas as rotas de leitura, inclusive com versão, pesquisa, ordenação, paginação por cursor e rotas aninhadas.
+
+    Argumentos : 
+    "APITestCase" é a biblioteca responsável pelos testes dentro do Django Rest, dedicado exclusicamente aos testes de funcionalidade da API.
+
+    Atributos : 
+    "setUp" : Cria o contexto com 1 superusuário das fixtures e algumas matrículas.
+    "resposta" : faz a requisição com a leitura rápida ligada ou desligada, limpando o cache de respostas antes.
+    "test_respostas_identicas" : compara o conteúdo das duas respostas para cada url.
+    "test_detalhe_inexistente" : o detalhe de um id inexistente continua retornando 404.
+    """
+
+    fixtures = ['prototipo_banco.json']
+    def setUp(self):
+        self.usuario = User.objects.get(username='massoto')
+        self.client.force_authenticate(user=self.usuario)
+        for estudante, curso, periodo in ((1, 3, 'M'), (2, 3, 'V'), (1, 4, 'N')):
+            Matricula.objects.create(estudante_id=estudante, curso_id=curso, periodo=periodo)
+
+    def resposta(self, url, ativa):
+        cache.clear()
+        with self.settings(LEITURA_RAPIDA=ativa):
+            return self.client.get(url)
+
+    def test_respostas_identicas(self):
+        urls = [
+            '/estudantes/', '/estudantes/?page=2', '/estudantes/?version=v2', '/estudantes/?search=ana&ordering=-nome',
+            '/estudantes/?paginacao=cursor&ordering=nome', '/estudantes/1/', '/estudantes/1/?version=v2',
+            '/cursos/', '/cursos/3/', '/matriculas/', '/matriculas/1/',
+            '/estudantes/1/matriculas/', '/cursos/3/matriculas/',
+        ]
+        for url in urls:
+            normal = self.resposta(url, False)
+            rapida = self.resposta(url, True)
+            self.assertEqual(normal.status_code, status.HTTP_200_OK, url)
+            self.assertEqual(rapida.content, normal.content, url)
+
+    def test_detalhe_inexistente(self):
+        self.assertEqual(self.resposta('/estudantes/999/', True).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.resposta('/estudantes/abc/', True).status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,68 @@
+import pickle
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from escola.throttles import AnonJanelaThrottle
+
+class ThrottleTeste(AnonJanelaThrottle):
+    rate = '10/min'
+
+    def __init__(self, relogio):
+        super().__init__()
+        self.timer = lambda: relogio[0]
+
+class JanelaDeslizanteTestCase(SimpleTestCase):
+    """classe JanelaDeslizanteTestCase
+
+    Intenção :
+    Se trata do teste dos throttles de janela deslizante ("escola/throttles.py"), com um relógio controlado pelo teste.
+
+    Argumentos :
+    "SimpleTestCase" : teste do Django sem banco de dados, o throttle usa apenas o cache.
+
+    Atributos :
+    "setUp" : limpa o cache, cria a requisição anônima e o relógio, que começa no início de uma janela de 60 segundos.
+    "permitir" : executa o throttle no instante atual do relógio.
+    "test_limite_dentro_da_janela" : 10 requisições passam e a 11ª é bloqueada, com o "wait" até o fim da janela.
+    "test_janela_anterior_conta_proporcionalmente" : na janela seguinte ainda vale a parte da janela anterior dentro do intervalo.
+    "test_janelas_antigas_sao_descartadas" : depois de duas janelas sem requisições o limite volta inteiro.
+    "test_tamanho_fixo_no_cache" : o valor guardado tem o mesmo tamanho com 1 ou com 10 requisições.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.request = Request(APIRequestFactory().get('/', REMOTE_ADDR='10.0.0.1'))
+        self.relogio = [6000.0]
+
+    def permitir(self):
+        self.throttle = ThrottleTeste(self.relogio)
+        return self.throttle.allow_request(self.request, None)
+
+    def test_limite_dentro_da_janela(self):
+        self.assertTrue(all(self.permitir() for _ in range(10)))
+        self.relogio[0] += 15
+        self.assertFalse(self.permitir())
+        self.assertAlmostEqual(self.throttle.wait(), 45)
+
+    def test_janela_anterior_conta_proporcionalmente(self):
+        for _ in range(10):
+            self.permitir()
+        self.relogio[0] += 80
+        # 20s após o início da janela seguinte ainda contam 2/3 das 10 requisições da janela anterior: passam apenas 4
+        self.assertEqual(sum(self.permitir() for _ in range(8)), 4)
+        # a estimativa (4 + 10 * 2/3) fica abaixo de 10 quando a janela anterior contar menos de 6, 4 segundos depois
+        self.assertAlmostEqual(self.throttle.wait(), 4)
+
+    def test_janelas_antigas_sao_descartadas(self):
+        for _ in range(10):
+            self.permitir()
+        self.relogio[0] += 120
+        self.assertTrue(all(self.permitir() for _ in range(10)))
+
+    def test_tamanho_fixo_no_cache(self):
+        self.permitir()
+        tamanho = len(pickle.dumps(cache.get(self.throttle.key)))
+        for _ in range(9):
+            self.permitir()
+        self.assertEqual(len(pickle.dumps(cache.get(self.throttle.key))), tamanho)
@@ -0,0 +1,57 @@
+import random
+import re
+from django.test import SimpleTestCase
+from validate_docbr import CPF
+from escola.validators import cpf_invalido, celular_invalido, nome_invalido, cpfs_invalidos, celulares_invalidos, nomes_invalidos
+
+class ValidadoresParidadeTestCase(SimpleTestCase):
+    """classe ValidadoresParidadeTestCase
+
+    Intenção : 
+    Se trata do teste de paridade dos validadores de "escola.validators" com as versões anteriores (que usavam o "validate_docbr" a 
+    cada chamada e o "re.findall"), garantindo os mesmos resultados, e das versões em lote com as versões de um item.
+
+    Argumentos : 
+    "SimpleTestCase" é a versão do TestCase do Django que não usa o banco de dados.
+
+    Atributos : 
+    "casos_cpf" : CPFs válidos (com e sem máscara), repetidos, curtos, longos e com caracteres aleatórios, gerados com semente fixa.
+    "test_cpf_igual_ao_validate_docbr" : o "cpf_invalido" dá o mesmo resultado do "validate_docbr" para todos os casos.
+    "test_celular_igual_ao_modelo_anterior" : para os celulares só com dígitos o resultado é o mesmo do "re.findall" anterior.
+    "test_celular_nao_aceita_numero_no_meio_de_outros_caracteres" : diferença intencional em relação ao "re.findall".
+    "test_versoes_em_lote" : as versões em lote retornam a mesma lista que a aplicação item a item.
+    """
+
+    def casos_cpf(self):
+        aleatorio = random.Random(10)
+        gerador = CPF()
+        casos = [gerador.generate() for _ in range(2000)] + [gerador.generate(mask=True) for _ in range(500)]
+        casos += [''.join(aleatorio.choice('0123456789') for _ in range(aleatorio.randint(0, 13))) for _ in range(3000)]
+        casos += [''.join(aleatorio.choice('0123456789.- a/') for _ in range(aleatorio.randint(0, 15))) for _ in range(3000)]
+        casos += [digito * 11 for digito in '0123456789'] + ['٣' * 11, '']
+        return casos
+
+    def test_cpf_igual_ao_validate_docbr(self):
+        referencia = CPF()
+        for cpf in self.casos_cpf():
+            self.assertEqual(cpf_invalido(cpf), not referencia.validate(cpf), cpf)
+
+    def test_celular_igual_ao_modelo_anterior(self):
+        aleatorio = random.Random(10)
+        casos = [''.join(aleatorio.choice('0123456789') for _ in range(11)) for _ in range(3000)]
+        casos += ['21970758285', '01970758285', '21870758285', '2197075828', '']
+        for celular in casos:
+            self.assertEqual(celular_invalido(celular), not re.findall('[1-9]{2}[9]{1}[0-9]{8}', celular), celular)
+
+    def test_celular_nao_aceita_numero_no_meio_de_outros_caracteres(self):
+        self.assertTrue(celular_invalido('+5521970758285'))
+        self.assertTrue(celular_invalido('21970758285xx'))
+        self.assertFalse(celular_invalido('21970758285'))
+
+    def test_versoes_em_lote(self):
+        cpfs = self.casos_cpf()
+        self.assertEqual(cpfs_invalidos(cpfs), [cpf_invalido(cpf) for cpf in cpfs])
+        celulares = ['21970758285', '+5521970758285', '123']
+        self.assertEqual(celulares_invalidos(celulares), [celular_invalido(celular) for celular in celulares])
+        nomes = ['teste', 'teste 1', 'Ana']
+        self.assertEqual(nomes_invalidos(nomes), [nome_invalido(nome) for nome in nomes])
@@ -1,5 +1,70 @@
 from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
 
-class MatriculaAnonRateThrottle(AnonRateThrottle):
+class JanelaDeslizanteMixin:
+    """Classe JanelaDeslizanteMixin
+
+    Intenção :
+    Troca o histórico do "SimpleRateThrottle" (uma lista com o horário de cada requisição, regravada a cada requisição) por um
+    contador de janela deslizante de tamanho fixo: para cada chave o cache guarda apenas (início da janela atual, requisições na
+    janela atual, requisições na janela anterior). O total dos últimos "duration" segundos é estimado somando a janela atual à parte
+    da janela anterior que ainda está dentro do intervalo, então cada verificação faz o mesmo trabalho, independente do limite.
+
+    Argumentos :
+    Deve vir antes do throttle do Django Rest na herança, ex: "class UserJanelaThrottle(JanelaDeslizanteMixin, UserRateThrottle)".
+    A taxa continua no mesmo formato ("20/day", "5/min") do atributo "rate" ou do "DEFAULT_THROTTLE_RATES".
+
+    Atributos :
+    "allow_request" : lê o contador, calcula a estimativa e grava o contador com mais 1 requisição, se ela for permitida.
+    "wait" : segundos até a estimativa ficar abaixo do limite, usado no cabeçalho "Retry-After" da resposta 429.
+    """
+
+    espera = None
+
+    def contador(self, agora):
+    # retorna (início da janela atual, requisições na janela atual, requisições na janela anterior) da chave, já avançado até "agora"
+
+        inicio = agora - agora % self.duration
+        janela, atual, anterior = self.cache.get(self.key, (inicio, 0, 0))
+        if janela != inicio:
+            anterior = atual if janela == inicio - self.duration else 0
+            atual = 0
+        return inicio, atual, anterior
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        agora = self.timer()
+        inicio, atual, anterior = self.contador(agora)
+        decorrido = agora - inicio
+        if anterior * (1 - decorrido / self.duration) + atual >= self.num_requests:
+            self.espera = self.calcular_espera(decorrido, atual, anterior)
+            return self.throttle_failure()
+        self.cache.set(self.key, (inicio, atual + 1, anterior), 2 * self.duration)
+        return True
+
+    def calcular_espera(self, decorrido, atual, anterior):
+    # a estimativa só diminui com o tempo: dentro da janela atual, pela parte da anterior que sai do intervalo; depois, quando a
+    # janela atual passa a ser a anterior
+
+        if atual < self.num_requests:
+            return self.duration * (1 - (self.num_requests - atual) / anterior) - decorrido
+        return self.duration - decorrido + self.duration * (1 - self.num_requests / atual)
+
+    def wait(self):
+        return None if self.espera is None else max(self.espera, 0)
+
+class AnonJanelaThrottle(JanelaDeslizanteMixin, AnonRateThrottle):
+    # mesmo escopo "anon" do "AnonRateThrottle", usando o contador de janela deslizante
+    pass
+
+class UserJanelaThrottle(JanelaDeslizanteMixin, UserRateThrottle):
+    # mesmo escopo "user" do "UserRateThrottle", usando o contador de janela deslizante
+    pass
+
+class MatriculaAnonRateThrottle(AnonJanelaThrottle):
     rate = '5/day'
-    # altera em específico o login de usuário anônimo, limitando 5 acessos por dia 
\ No newline at end of file
+    # altera em específico o login de usuário anônimo, limitando 5 acessos por dia
@@ -0,0 +1,72 @@
+import random
+import time
+from functools import wraps
+from django.conf import settings
+from django.db import OperationalError, transaction
+
+def bloqueio(exc):
+# "database is locked" / "database table is locked": outra conexão segurou a escrita por mais tempo que o "busy_timeout"
+
+    return isinstance(exc, OperationalError) and 'locked' in str(exc)
+
+def atomic_com_repeticao(funcao=None, *, using=None):
+    """Função atomic_com_repeticao
+
+    Intenção :
+    Executa a função em um "transaction.atomic" e, quando a transação falha por bloqueio do SQLite ("database is locked"), desfaz
+    tudo e executa de novo, com uma espera crescente e aleatória entre as tentativas, para que as conexões que disputam a escrita
+    não tentem no mesmo instante.
+
+    Argumentos :
+    "funcao" : usada como decorator ("@atomic_com_repeticao") ou chamada direto ("atomic_com_repeticao(funcao)()").
+    "using" : alias do banco, como no "transaction.atomic".
+    As tentativas e a espera inicial (em segundos) vêm do settings: "TRANSACAO_TENTATIVAS" (padrão 5) e "TRANSACAO_ESPERA" (0.05).
+
+    Return :
+    A função decorada. Dentro de outro "atomic" apenas a transação mais externa pode ser repetida, então a função é executada uma
+    única vez e o erro segue para quem abriu a transação.
+    """
+
+    if funcao is None:
+        return lambda funcao: atomic_com_repeticao(funcao, using=using)
+
+    @wraps(funcao)
+    def executar(*args, **kwargs):
+        if transaction.get_connection(using).in_atomic_block:
+            return funcao(*args, **kwargs)
+
+        tentativas = getattr(settings, 'TRANSACAO_TENTATIVAS', 5)
+        espera = getattr(settings, 'TRANSACAO_ESPERA', 0.05)
+        for tentativa in range(1, tentativas + 1):
+            try:
+                with transaction.atomic(using=using):
+                    return funcao(*args, **kwargs)
+            except OperationalError as exc:
+                if not bloqueio(exc) or tentativa == tentativas:
+                    raise
+            time.sleep(espera * 2 ** (tentativa - 1) * random.uniform(0.5, 1.5))
+    return executar
+
+
+class EscritaComRepeticaoMixin:
+    """Classe EscritaComRepeticaoMixin
+
+    Intenção :
+    Faz a gravação das views (criação, alteração e exclusão) dentro do "atomic_com_repeticao", para que uma disputa de escrita no
+    SQLite seja repetida ao invés de responder 500.
+
+    Argumentos :
+    Deve vir antes da view do Django Rest na herança. As ações extras (ex: "lote") chamam o "perform_create" para ter o mesmo efeito.
+
+    Atributos :
+    "perform_create", "perform_update" e "perform_destroy" : os mesmos do Django Rest, dentro do "atomic_com_repeticao".
+    """
+
+    def perform_create(self, serializer):
+        atomic_com_repeticao(super().perform_create)(serializer)
+
+    def perform_update(self, serializer):
+        atomic_com_repeticao(super().perform_update)(serializer)
+
+    def perform_destroy(self, instance):
+        atomic_com_repeticao(super().perform_destroy)(instance)
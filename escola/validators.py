@@ -1,12 +1,39 @@
 import re
 from validate_docbr import CPF
 
+CPF_DOCBR = CPF()
+# instância única do "validate_docbr", usada apenas para os CPFs fora do formato simples (ex: com caracteres unicode)
+
+MODELO_CPF = re.compile(r'[0-9]{11}')
+MODELO_CPF_MASCARA = re.compile(r'[0-9.\-]*')
+MODELO_CELULAR = re.compile(r'[1-9]{2}9[0-9]{8}')
+# padrões compilados uma única vez, na importação do módulo
+
+def cpf_digitos_validos(digitos):
+# núcleo do cálculo dos dígitos verificadores, apenas aritmética sobre os 11 dígitos ASCII do CPF (mesmas regras do "validate_docbr")
+
+    if digitos == digitos[0] * 11:
+        return False
+    d = digitos.encode()
+    # os bytes são os códigos ASCII ("0" = 48), por isso é descontado 48 vezes a soma dos pesos de cada dígito
+    soma = 10*d[0] + 9*d[1] + 8*d[2] + 7*d[3] + 6*d[4] + 5*d[5] + 4*d[6] + 3*d[7] + 2*d[8] - 48 * 54
+    if soma * 10 % 11 % 10 != d[9] - 48:
+        return False
+    soma = 11*d[0] + 10*d[1] + 9*d[2] + 8*d[3] + 7*d[4] + 6*d[5] + 5*d[6] + 4*d[7] + 3*d[8] + 2*d[9] - 48 * 65
+    return soma * 10 % 11 % 10 == d[10] - 48
+
 def cpf_invalido(numero_cpf):
-# define os requisitos para validação do cpf, já pré definidos pelo "validate_docbr"
+# define os requisitos para validação do cpf, os mesmos do "validate_docbr": apenas dígitos, "." e "-", 11 dígitos, não todos iguais
+# e os dígitos verificadores corretos
 
-    cpf = CPF()
-    cpf_valido = cpf.validate(numero_cpf)
-    return not cpf_valido
+    if MODELO_CPF.fullmatch(numero_cpf):
+        return not cpf_digitos_validos(numero_cpf)
+    if MODELO_CPF_MASCARA.fullmatch(numero_cpf):
+        digitos = numero_cpf.replace('.', '').replace('-', '')
+        return len(digitos) != 11 or not cpf_digitos_validos(digitos)
+    if numero_cpf.isascii():
+        return True
+    return not CPF_DOCBR.validate(numero_cpf)
 
 def nome_invalido(nome):
 # define o requisito para a validação do nome, que seja alpha, ou seja, contenha apenas letras
@@ -14,10 +41,25 @@ def nome_invalido(nome):
     return not nome.isalpha()
 
 def celular_invalido(celular):
-# define os requisitos para a validação do celular, nesse caso temos um modelo base que ultiliza o "re.findall" para fazer a verificação
-    
-    modelo = '[1-9]{2}[9]{1}[0-9]{8}'
-    
-    resposta = re.findall(modelo,celular)
-    
-    return not resposta
\ No newline at end of file
+# define os requisitos para a validação do celular: DDD sem zero, o dígito 9 e mais 8 dígitos. O "fullmatch" exige que o celular
+# seja só isso, sem aceitar um número válido no meio de outros caracteres
+
+    return MODELO_CELULAR.fullmatch(celular) is None
+
+def cpfs_invalidos(cpfs):
+# versão em lote do "cpf_invalido": recebe uma coluna de CPFs e retorna a lista de resultados na mesma ordem
+
+    modelo = MODELO_CPF.fullmatch
+    nucleo = cpf_digitos_validos
+    return [not nucleo(cpf) if modelo(cpf) else cpf_invalido(cpf) for cpf in cpfs]
+
+def celulares_invalidos(celulares):
+# versão em lote do "celular_invalido"
+
+    modelo = MODELO_CELULAR.fullmatch
+    return [modelo(celular) is None for celular in celulares]
+
+def nomes_invalidos(nomes):
+# versão em lote do "nome_invalido"
+
+    return [not nome.isalpha() for nome in nomes]
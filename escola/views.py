@@ -1,12 +1,36 @@
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
 from escola.models import Estudante,Curso, Matricula
-from escola.serializers import EstudanteSerializer,CursoSerializer, MatriculaSerializer, ListaMatriculasEstudanteSerializer, ListaMatriculasCursoSerializer, EstudanteSerializerV2
-from rest_framework import viewsets, generics, filters
+from escola.serializers import EstudanteSerializer,CursoSerializer, MatriculaSerializer, ListaMatriculasEstudanteSerializer, ListaMatriculasCursoSerializer, EstudanteSerializerV2, EstudanteLoteSerializer, MatriculaLoteSerializer, MatriculaTurmaSerializer
+from rest_framework import viewsets, generics, filters, status
+from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.throttling import UserRateThrottle
-from escola.throttles import MatriculaAnonRateThrottle
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from escola.throttles import MatriculaAnonRateThrottle, UserJanelaThrottle
+from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAdminUser, IsAuthenticated
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
+from escola.exportacao import resposta_exportacao, FORMATOS
+from escola.cache import CacheRespostaMixin, RequisicaoCondicionalMixin, estatisticas_cache
+from escola.leitura_rapida import LeituraRapidaMixin
+from escola.busca import BuscaIndexadaFilter, TABELA_BUSCA
+from escola.assincrono import LeituraAssincronaMixin
+from escola.transacoes import EscritaComRepeticaoMixin
+from escola.replicas import LeituraReplicaMixin
+from escola.estatisticas import estatisticas_matriculas
+from escola.authentication import BasicAssincronaAuthentication, gerar_token
 
-class EstudanteViewSet(viewsets.ModelViewSet):
+def exportar_ou_erro(request, queryset, campos, nome_arquivo, colunas=None):
+# lê o formato pedido em "?formato=" (padrão "ndjson") e monta a exportação, retornando erro 400 para formatos desconhecidos
+
+    formato = request.query_params.get('formato', 'ndjson')
+    assincrono = isinstance(request._request, ASGIRequest)
+    response = resposta_exportacao(queryset, campos, formato, nome_arquivo, colunas, assincrono)
+    if response is None:
+        raise ValidationError({'formato': f'Formato inválido. Opções: {", ".join(FORMATOS)}.'})
+    return response
+
+class EstudanteViewSet(EscritaComRepeticaoMixin, LeituraReplicaMixin, LeituraAssincronaMixin, RequisicaoCondicionalMixin, CacheRespostaMixin, LeituraRapidaMixin, viewsets.ModelViewSet):
     """Classe EstudanteViewSet
 
     Intenção : 
@@ -24,22 +48,48 @@ class EstudanteViewSet(viewsets.ModelViewSet):
     "filter_backends" : traz os filtros através do "DjangoFilterBackend", dentre eles o filtro de ordenação(OrderingFilter)
     e o filtro de pesquisa(SearchFilter)
     "ordering_fields, search_field" : recebem os campos que serão responsáveis por cada filtro, por isso o "_fields"
-    
+    "busca_tabela" : tabela FTS5 usada pelo "BuscaIndexadaFilter" no lugar do "SearchFilter", com o mesmo "?search=" (ver "escola/busca.py")
+
     "get_serializer_class" : Vai ser responsável pelo controle de versão a escolha do usuário na qual será extraído da URL
+    "lote" : rota "estudantes/lote/" para o cadastro de vários estudantes de uma vez (ver "EstudanteLoteSerializer")
+    "exportar" : rota "estudantes/exportar/?formato=ndjson|csv" que envia todos os estudantes filtrados, sem paginação
+    "cache_modelos" : models dos quais as respostas em cache dependem, também usados no ETag/Last-Modified (ver "escola/cache.py")
     
     """
     
+    cache_modelos = (Estudante,)
     queryset = Estudante.objects.all().order_by("id")
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, BuscaIndexadaFilter]
     ordering_fields = ['nome']
     search_fields = ['nome', 'cpf']
-    
+    busca_tabela = TABELA_BUSCA
+
     def get_serializer_class(self):
+        if self.action == 'lote':
+            return EstudanteLoteSerializer
         if self.request.version == 'v2':
             return EstudanteSerializerV2
         return EstudanteSerializer
 
-class CursoViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['post'])
+    def lote(self, request):
+    # cadastro em lote ("estudantes/lote/"): recebe uma lista de estudantes e grava todos ou nenhum. Em caso de erro, retorna uma
+    # lista com os erros de cada linha, na mesma posição da linha enviada
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response({'criados': len(serializer.instance)}, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'])
+    def exportar(self, request):
+    # exporta os estudantes com os mesmos filtros da listagem ("?search=" e "?ordering=") e os campos da versão pedida
+
+        queryset = self.filter_queryset(self.get_queryset())
+        campos = self.get_serializer_class().Meta.fields
+        return exportar_ou_erro(request, queryset, campos, 'estudantes')
+
+class CursoViewSet(EscritaComRepeticaoMixin, LeituraReplicaMixin, LeituraAssincronaMixin, RequisicaoCondicionalMixin, CacheRespostaMixin, LeituraRapidaMixin, viewsets.ModelViewSet):
     """Classe CursoViewSet
 
     Intenção : 
@@ -55,13 +105,20 @@ class CursoViewSet(viewsets.ModelViewSet):
     "serializer_class" : é colocado o serializer que será ultilizado, nesse caso o "CursoSerializer"
     "permission_classes" : alteramos as permissões da classe, nesse caso com o uso de "IsAuthenticatedOrReadOnly" que implica em
     somente pessoas autorizadas farão alterações, se não autorizada apenas a função de leitura.
+    "filter_backends, ordering_fields" : ordenação pelo total de matrículas ("?ordering=-total_matriculas"), pelo índice
+    (total_matriculas, id) do model
+    "cache_modelos" : models dos quais as respostas em cache dependem, também usados no ETag/Last-Modified (ver "escola/cache.py").
+    A "Matricula" faz parte, pois cada matrícula altera o "total_matriculas" do curso
     """
 
+    cache_modelos = (Curso, Matricula)
     queryset = Curso.objects.all().order_by("id")
     serializer_class = CursoSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['total_matriculas']
 
-class MatriculaViewSet(viewsets.ModelViewSet):
+class MatriculaViewSet(EscritaComRepeticaoMixin, LeituraReplicaMixin, LeituraAssincronaMixin, RequisicaoCondicionalMixin, LeituraRapidaMixin, viewsets.ModelViewSet):
     """Classe MatriculaViewSet
 
     Intenção :
@@ -78,14 +135,53 @@ class MatriculaViewSet(viewsets.ModelViewSet):
     "serializer_class" : é colocado o serializer que será ultilizado, nesse caso o "MatriculaSerializer"
     "throttle_classes" : resposável pela limitação nas requisições feitas. Limites impostos no "throttles.py" e no "settings.py"
     "http_method_names" : define os métodos permitido dentro das views referente as matrículas, nesse caso "get" "post"
+    "lote" : rota "matriculas/lote/" para matricular vários estudantes em uma única requisição (conta como 1 requisição no throttle)
+    "exportar" : rota "matriculas/exportar/?formato=ndjson|csv" que envia todas as matrículas, sem paginação
+    "estatisticas" : rota "matriculas/estatisticas/" com as quantidades de matrículas por curso, por período e por nível, lidas da
+    tabela de resumo mantida pelos triggers (ver "escola/estatisticas.py")
+    "cache_modelos" : models considerados no "Last-Modified" (ver "RequisicaoCondicionalMixin" em "escola/cache.py")
+    "leitura_replica" : as leituras das matrículas ficam no banco principal; as escritas fixam o cliente no banco principal (ver
+    "escola/replicas.py")
     """
 
+    cache_modelos = (Matricula,)
+    leitura_replica = False
+
     queryset = Matricula.objects.all().order_by("id")
     serializer_class = MatriculaSerializer
-    throttle_classes = [UserRateThrottle, MatriculaAnonRateThrottle ]
+    throttle_classes = [UserJanelaThrottle, MatriculaAnonRateThrottle ]
     http_method_names = ["get", "post"]
 
-class ListaMatriculaEstudante(generics.ListAPIView):
+    @action(detail=False, methods=['post'], serializer_class=MatriculaLoteSerializer)
+    def lote(self, request):
+    # recebe uma lista de matrículas ({"estudante", "curso", "periodo"}) ou um objeto {"curso_origem", "curso", "periodo"} que
+    # matricula no "curso" todos os estudantes do "curso_origem". As matrículas já existentes são ignoradas e informadas na resposta
+
+        dados = request.data
+        if isinstance(dados, dict):
+            turma = MatriculaTurmaSerializer(data=dados)
+            turma.is_valid(raise_exception=True)
+            dados = turma.linhas()
+
+        serializer = self.get_serializer(data=dados, many=True)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response({'criadas': len(serializer.instance), 'ignoradas': serializer.ignoradas}, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'])
+    def exportar(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        campos = ['id', 'estudante', 'curso', 'periodo']
+        colunas = ['id', 'estudante_id', 'curso_id', 'periodo']
+        return exportar_ou_erro(request, queryset, campos, 'matriculas', colunas)
+
+    @action(detail=False, methods=['get'])
+    def estatisticas(self, request):
+    # totais de matrículas sem percorrer as matrículas: o custo depende apenas da quantidade de cursos
+
+        return Response(estatisticas_matriculas(self.get_queryset().db))
+
+class ListaMatriculaEstudante(LeituraReplicaMixin, LeituraAssincronaMixin, RequisicaoCondicionalMixin, CacheRespostaMixin, LeituraRapidaMixin, generics.ListAPIView):
     """Classe ListaMatriculaEstudante
 
     Intenção : 
@@ -97,18 +193,24 @@ class ListaMatriculaEstudante(generics.ListAPIView):
     Atributos : 
     "get_queryset" :  Permite personalizar, filtrar e ordenar os dados retornados pelo viewset.
     nesse caso ele está usando os dados do model "Matricula" e instanciando a primary key do estudante trazida dentro da url e ordenando pelo Id
-    .
+    . O "select_related" traz o estudante no mesmo JOIN, evitando uma consulta extra por linha ao ler "estudante.nome".
     "serializer_class" : colocamos o setrializer que iremo ultilizar nesse caso o "ListaMatriculasEstudanteSerializer" para transforma-lo em Json.
+    "cache_modelos" : models dos quais as respostas em cache dependem, também usados no ETag/Last-Modified (ver "escola/cache.py")
     """
 
-    def get_queryset(self):
+    cache_modelos = (Matricula, Estudante)
+    condicional_campos = ('atualizado_em', 'estudante__atualizado_em')
 
-        queryset = Matricula.objects.filter(estudante_id=self.kwargs['pk']).order_by("id")
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            # geração do esquema da documentação, sem o "pk" da url
+            return Matricula.objects.none()
+        queryset = Matricula.objects.filter(estudante_id=self.kwargs['pk']).select_related('estudante').order_by("id")
         return queryset
     
     serializer_class = ListaMatriculasEstudanteSerializer
 
-class ListaMatriculaCurso(generics.ListAPIView):
+class ListaMatriculaCurso(LeituraReplicaMixin, LeituraAssincronaMixin, RequisicaoCondicionalMixin, CacheRespostaMixin, LeituraRapidaMixin, generics.ListAPIView):
     """Classe ListaMatriculaCurso
 
     Intenção : 
@@ -120,12 +222,59 @@ class ListaMatriculaCurso(generics.ListAPIView):
     Atributos : 
     "get_queryset" :  Permite personalizar, filtrar e ordenar os dados retornados pelo viewset.
     nesse caso ele está usando os dados do model "Matricula" e instanciando a primary key do curso trazida dentro da url e ordenando pelo Id
-    .
+    . O "select_related" traz o curso no mesmo JOIN, evitando uma consulta extra por linha ao ler "curso.descricao".
     "serializer_class" : colocamos o setrializer que iremo ultilizar nesse caso o "ListaMatriculasCursoSerializer" para transforma-lo em Json.
+    "cache_modelos" : models dos quais as respostas em cache dependem, também usados no ETag/Last-Modified (ver "escola/cache.py")
     """
+
+    cache_modelos = (Matricula, Curso)
+    condicional_campos = ('atualizado_em', 'curso__atualizado_em')
         
     def get_queryset(self):
-        queryset = Matricula.objects.filter(curso_id=self.kwargs['pk']).order_by("id")
+        if getattr(self, 'swagger_fake_view', False):
+            return Matricula.objects.none()
+        queryset = Matricula.objects.filter(curso_id=self.kwargs['pk']).select_related('curso').order_by("id")
         return queryset
     
-    serializer_class = ListaMatriculasCursoSerializer
\ No newline at end of file
+    serializer_class = ListaMatriculasCursoSerializer
+
+class EstatisticasCache(APIView):
+    """Classe EstatisticasCache
+
+    Intenção : 
+    Expõe os contadores de acertos e falhas do cache de respostas, apenas para administradores.
+
+    Argumentos : 
+    "APIView" : View mais simples do Django Rest, sem queryset nem serializer.
+     
+    Atributos : 
+    "permission_classes" : "IsAdminUser" permite o acesso apenas para usuários "is_staff".
+    "get" : retorna os contadores através de "estatisticas_cache".
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(estatisticas_cache())
+
+class ObterToken(APIView):
+    """Classe ObterToken
+
+    Intenção : 
+    Rota "token/" (POST) que troca o usuário e a senha do HTTP Basic por um token assinado, usado depois no cabeçalho
+    "Authorization: Token <token>" (ver "TokenAssinadoAuthentication" em "escola/authentication.py"), sem o PBKDF2 a cada requisição.
+
+    Argumentos : 
+    "APIView" : View mais simples do Django Rest, sem queryset nem serializer.
+     
+    Atributos : 
+    "authentication_classes" : apenas o HTTP Basic, um token não renova a si mesmo.
+    "permission_classes" : "IsAuthenticated" qualquer usuário autenticado (e ativo) obtém o seu token.
+    "post" : retorna o token e a sua validade em segundos ("TOKEN_VALIDADE").
+    """
+
+    authentication_classes = [BasicAssincronaAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        return Response({'token': gerar_token(request.user), 'validade': settings.TOKEN_VALIDADE})
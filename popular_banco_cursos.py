@@ -1,32 +1,10 @@
-import os
-import django
-import random
+import os, django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
 django.setup()
 
-from escola.models import Curso
+from django.core.management import call_command
 
-dados = [
-    ('CPOO1', 'Curso de Python Orientação à Objetos 01'),
-    ('CPOO2', 'Curso de Python Orientação à Objetos 02'),
-    ('CPOO3', 'Curso de Python Orientação à Objetos 03'),
-    ('CDJ01', 'Curso de Django 01'),
-    ('CDJ02', 'Curso de Django 02'),
-    ('CDJ03', 'Curso de Django 03'),
-    ('CDJ04', 'Curso de Django 04'),
-    ('CDJ05', 'Curso de Django 05'),
-    ('CDJRF01', 'Curso de Django REST Framework 01'),
-    ('CDJRF02', 'Curso de Django REST Framework 02'),
-    ('CDJRF03', 'Curso de Django REST Framework 03'),
-    ('CDJRF04', 'Curso de Django REST Framework 04')
-]
-
-niveis = ['B', 'I', 'A']
-
-def criar_cursos():
-    for codigo, descricao in dados:
-        nivel = random.choice(niveis)
-        Curso.objects.create(codigo=codigo, descricao=descricao, nivel=nivel)
-
-criar_cursos()
\ No newline at end of file
+# mantido por compatibilidade: os 12 cursos são gerados pelo "python manage.py gerar_dados" (códigos "C01" a "C12"), que pode
+# ser usado diretamente para outras quantidades
+call_command('gerar_dados', estudantes=0, cursos=12, prefixo_cursos='C')
@@ -3,23 +3,8 @@ import os, django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
 django.setup()
 
-from faker import Faker
-from validate_docbr import CPF
-import random
-from escola.models import Estudante
+from django.core.management import call_command
 
-def criando_pessoas(quantidade_de_pessoas):
-    fake = Faker('pt_BR')
-    Faker.seed(10)
-    for _ in range(quantidade_de_pessoas):
-        cpf = CPF()
-        nome = fake.name()
-        email = '{}@{}'.format(nome.lower(),fake.free_email_domain())
-        email = email.replace(' ', '')
-        cpf = cpf.generate()
-        data_nascimento = fake.date_of_birth(minimum_age=18, maximum_age=30)  # Gera uma data de nascimento aleatória entre 18 e 30 anos
-        celular = "{}9{}{}".format(random.randrange(10, 89), random.randrange(4000, 9999), random.randrange(4000, 9999))
-        p = Estudante(nome=nome, email=email, cpf=cpf, data_nascimento=data_nascimento, celular=celular)
-        p.save()
-
-criando_pessoas(50)
\ No newline at end of file
+# mantido por compatibilidade: os 50 estudantes (com cursos e matrículas) são gerados pelo "python manage.py gerar_dados", que
+# pode ser usado diretamente para outras quantidades
+call_command('gerar_dados', estudantes=50, semente=10)
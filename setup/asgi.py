@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
+os.environ.setdefault('LEITURA_ASSINCRONA', '1')
+# leituras assíncronas de "escola/assincrono.py" (ver "LEITURA_ASSINCRONA" no settings)
 
 application = get_asgi_application()
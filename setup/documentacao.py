@@ -0,0 +1,29 @@
+from drf_yasg.views import get_schema_view
+from drf_yasg import openapi
+from escola.documentacao import DocumentacaoPrecalculadaMixin
+
+info_documentacao = openapi.Info(
+     title="Documentação da API",
+      default_version='v1',
+      description="Documentação da API Escola",
+      terms_of_service="https://www.google.com/policies/terms/",
+      contact=openapi.Contact(email="contact@snippets.local"),
+      license=openapi.License(name="BSD License"),
+)
+schema_view = get_schema_view(
+   info_documentacao,
+   public=True,
+)
+# toda biblioteca drf_yasg se trata da documentação swagger, nesse caso preenchida com os dados necessários,
+# como título, versão, descrição, termos, contato e licença. (https://swagger.io/specification/)
+# obs: este módulo só é importado na primeira requisição da documentação (ver "visao_sob_demanda" em "setup/urls.py")
+
+class DocumentacaoView(DocumentacaoPrecalculadaMixin, schema_view):
+    documentacao_info = info_documentacao
+# o esquema é gerado uma vez por versão e servido com ETag, ao invés de a cada requisição (ver "escola/documentacao.py")
+
+swagger = DocumentacaoView.with_ui('swagger', cache_timeout=0)
+redoc = DocumentacaoView.with_ui('redoc', cache_timeout=0)
+# cache_timeout=0 desativa o "cache_page" do drf_yasg: o esquema já vem pronto do "DocumentacaoView", que só o gera novamente
+# quando o código muda, e o ETag evita enviar de novo o mesmo conteúdo.
+#(https://drf-yasg.readthedocs.io/en/stable/readme.html)
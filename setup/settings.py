@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
+from importlib.util import find_spec
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -88,6 +90,59 @@ DATABASES = {
     }
 }
 
+BANCO_PERFIL = os.environ.get('BANCO_PERFIL', 'desenvolvimento')
+# perfil do banco: "desenvolvimento" (o SQLite padrão do Django) ou "producao"
+
+if BANCO_PERFIL == 'producao':
+    DATABASES['default'].update({
+        'ENGINE': 'escola.backends.sqlite3',
+        # WAL, synchronous=NORMAL, mmap, cache, busy_timeout e "BEGIN IMMEDIATE" (ver "escola/backends/sqlite3/base.py")
+        'CONN_MAX_AGE': None,
+        'CONN_HEALTH_CHECKS': True,
+        # conexões persistentes, reaproveitadas entre as requisições e verificadas antes do reuso
+        'OPTIONS': {'pragmas': {}, 'transaction_mode': 'IMMEDIATE'},
+        # "pragmas" sobrescreve os PRAGMAs padrão do backend
+    })
+
+BANCO_REPLICAS = int(os.environ.get('BANCO_REPLICAS', 0))
+# quantidade de réplicas de leitura: cópias do banco principal ("db.replica_1.sqlite3", ...) atualizadas pela API de backup do
+# SQLite com "python manage.py sincronizar_replicas --intervalo 5" (ver "escola/replicas.py")
+
+for numero in range(1, BANCO_REPLICAS + 1):
+    DATABASES[f'replica_{numero}'] = {
+        **DATABASES['default'],
+        'NAME': BASE_DIR / f'db.replica_{numero}.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+        # nos testes a réplica é o próprio banco de testes
+    }
+
+DATABASE_ROUTERS = ['escola.replicas.RoteadorLeituraEscrita']
+# leituras das views com "LeituraReplicaMixin" nas réplicas, escritas sempre no "default"
+
+REPLICAS_LEITURA = [alias for alias in DATABASES if alias != 'default']
+REPLICAS_INTERVALO = 5
+# segundos entre as sincronizações das réplicas, também o tempo máximo no cache de uma resposta lida de uma réplica
+REPLICAS_FIXACAO = 15
+# segundos em que as leituras de um cliente ficam no banco principal depois de uma escrita dele
+
+CREDENCIAIS_CACHE_TAMANHO = 10_000
+# credenciais HTTP Basic já conferidas guardadas em cada processo, para não repetir o PBKDF2 da senha a cada requisição (ver
+# "escola/authentication.py"). Cada uma deixa de valer quando a senha muda ou o usuário é desativado; 0 desativa o cache
+
+AUTHENTICATION_BACKENDS = ['escola.permissoes.PermissoesCacheBackend']
+# o "ModelBackend" do Django com as permissões de cada usuário guardadas no processo (ver "escola/permissoes.py")
+
+PERMISSOES_CACHE_TEMPO = 60
+# tempo máximo (em segundos) das permissões guardadas. Elas também são descartadas pelos signals a cada alteração de usuários, grupos e
+# permissões
+
+TOKEN_VALIDADE = 60 * 60 * 24
+# validade (em segundos) dos tokens da rota "token/"
+
+TRANSACAO_TENTATIVAS = 5
+TRANSACAO_ESPERA = 0.05
+# tentativas e espera inicial (segundos) das gravações que falham com "database is locked" (ver "escola/transacoes.py")
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -132,7 +187,10 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.BasicAuthentication',
+        'escola.authentication.BasicAssincronaAuthentication',
+        # o mesmo "BasicAuthentication" do Django Rest, com a versão assíncrona usada pela leitura assíncrona e o cache de credenciais
+        'escola.authentication.TokenAssinadoAuthentication',
+        # "Authorization: Token <token>", com o token da rota "token/"
     ],
     # Puxa a informação do usuário
     'DEFAULT_PERMISSION_CLASSES': [
@@ -145,18 +203,34 @@ REST_FRAMEWORK = {
 
     # processo de autenticação feito para acessar as rotas, sendo os mesmo dependente um do outro
 
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'escola.paginations.EscolaPagination',
     'PAGE_SIZE':20,
-    # Puxado diretamente da documentação o comando de configuração de paginação
+    # Paginação por número de página (padrão do "PageNumberPagination"), com o modo cursor opcional via "?paginacao=cursor"
+    # definido em "escola/paginations.py"
     # Definido no próprio corpo a quantidade de itens por página "'PAGE_SIZE':20"
+    'DEFAULT_RENDERER_CLASSES': [
+        'escola.renderers.JSONRapidoRenderer',
+        # JSON com o "orjson" (mesma saída do "JSONRenderer" padrão), ver "escola/renderers.py"
+        *(['escola.renderers.MessagePackRenderer'] if find_spec('msgpack') else []),
+        # MessagePack para os clientes internos ("Accept: application/msgpack"), apenas com o pacote "msgpack" instalado
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'escola.parsers.JSONRapidoParser',
+        *(['escola.parsers.MessagePackParser'] if find_spec('msgpack') else []),
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # A ordem define o formato padrão (o primeiro) quando o cliente não pede um formato específico
     'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.QueryParameterVersioning',
     # Puxado diretamente da documentação o comando de configuração de versionamento
     # usada em views.py linha 14
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
+        'escola.throttles.AnonJanelaThrottle',
         #captura usuários anonimos
-        'rest_framework.throttling.UserRateThrottle'
+        'escola.throttles.UserJanelaThrottle'
         #captura usuários autenticado
+        # (mesmos escopos do "AnonRateThrottle"/"UserRateThrottle", com um contador de tamanho fixo por chave, ver "escola/throttles.py")
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '20/day',
@@ -166,6 +240,52 @@ REST_FRAMEWORK = {
     }
 }
 
+CACHE_RESPOSTAS_TIMEOUT = 60 * 60
+# tempo máximo (em segundos) de uma resposta no cache de "escola/cache.py". As respostas também são invalidadas pelos signals
+# a cada alteração nos models. Com mais de um processo, configure um "CACHES" compartilhado (ex: Redis ou Memcached), pois o cache
+# padrão do Django ("LocMemCache") é separado por processo; o mesmo cache guarda a fixação das réplicas e as versões das permissões.
+
+DOCUMENTACAO_ARQUIVO = os.environ.get('DOCUMENTACAO_ARQUIVO', BASE_DIR / 'openapi.json')
+# esquemas OpenAPI gerados no deploy pelo "python manage.py gerar_documentacao" e lidos pelas rotas "swagger/" e "redoc/". Sem o
+# arquivo (ou com um arquivo de outra versão do código) cada processo gera o esquema na primeira requisição (ver "escola/documentacao.py")
+
+DOCUMENTACAO_VERSOES = ['v1', 'v2']
+# versões da API com o esquema guardado ("?version="), a primeira é a versão padrão da documentação
+
+LEITURA_RAPIDA = False
+# caminho rápido das leituras (GET de listagem e detalhe) com ".values()" ao invés dos serializers, ver "escola/leitura_rapida.py"
+
+LEITURA_ASSINCRONA = os.environ.get('LEITURA_ASSINCRONA', '0') == '1'
+# leitura assíncrona (GET de listagem e detalhe) no servidor ASGI, ver "escola/assincrono.py". Ativada pelo "setup/asgi.py";
+# no servidor WSGI continua desativada, pois cada requisição já tem a sua própria thread
+
+if LEITURA_ASSINCRONA:
+    MIDDLEWARE = [
+        'escola.middlewares.SecurityMiddleware',
+        'escola.middlewares.SessionMiddleware',
+        'corsheaders.middleware.CorsMiddleware',
+        'escola.middlewares.CommonMiddleware',
+        'escola.middlewares.CsrfViewMiddleware',
+        'escola.middlewares.AuthenticationMiddleware',
+        'escola.middlewares.MessageMiddleware',
+        'escola.middlewares.XFrameOptionsMiddleware',
+    ]
+    # os mesmos middlewares, executados no loop de eventos ao invés de uma thread por método (ver "escola/middlewares.py")
+
+SOMENTE_API = os.environ.get('SOMENTE_API', '0') == '1'
+# processos que servem apenas a API: sem o admin e com o drf_yasg importado só na primeira requisição da documentação ("swagger/" e
+# "redoc/", ver "escola/carregamento.py"). Diminui o tempo de início e a memória de cada processo (ver "benchmarks/partida.py").
+# obs: o admin não pode ser carregado sob demanda (o modelo "LogEntry" e o "autodiscover" precisam do app instalado); nesse modo a
+# rota "admin/" não existe e o admin deve ser servido por outro processo, com a variável desligada
+
+if SOMENTE_API:
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ('django.contrib.admin', 'drf_yasg')]
+    _drf_yasg = Path(find_spec('drf_yasg').submodule_search_locations[0])
+    TEMPLATES[0]['DIRS'] = [*TEMPLATES[0]['DIRS'], _drf_yasg / 'templates']
+    STATICFILES_DIRS = [_drf_yasg / 'static']
+    # o drf_yasg fora do INSTALLED_APPS: os templates e arquivos estáticos da documentação continuam disponíveis pelos diretórios
+    # ("find_spec" localiza o pacote sem importá-lo)
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:8042",
     "http://127.0.0.1:8042",
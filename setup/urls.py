@@ -1,23 +1,10 @@
-from django.contrib import admin
+from django.apps import apps
+from django.conf import settings
 from django.urls import path,include
-from escola.views import EstudanteViewSet,CursoViewSet, MatriculaViewSet, ListaMatriculaEstudante,ListaMatriculaCurso
+from escola.views import EstudanteViewSet,CursoViewSet, MatriculaViewSet, ListaMatriculaEstudante,ListaMatriculaCurso, EstatisticasCache, ObterToken
 from rest_framework import routers
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-schema_view = get_schema_view(
-   openapi.Info(
-     title="Documentação da API",
-      default_version='v1',
-      description="Documentação da API Escola",
-      terms_of_service="https://www.google.com/policies/terms/",
-      contact=openapi.Contact(email="contact@snippets.local"),
-      license=openapi.License(name="BSD License"),
-   ),
-   public=True,
-)
-# toda biblioteca drf_yasg se trata da documentação swagger, nesse caso preenchida com os dados necessários,
-# como título, versão, descrição, termos, contato e licença. (https://swagger.io/specification/)
+from escola.assincrono import rotas_assincronas
+from escola.carregamento import visao_sob_demanda
 
 router = routers.DefaultRouter()
 # "DefaultRouter": Ultilizado por já possuir uma interface própria
@@ -28,8 +15,6 @@ router.register('matriculas',MatriculaViewSet,basename='Matriculas')
 #"basename": serve como uma identificação da rota.
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
-
     path('',include(router.urls)),
     # "include": Inclui as urls a serem seguidas além do router.
     # obs: não passe argumento no prefixo ('') pois já está definido no "router"
@@ -38,9 +23,23 @@ urlpatterns = [
     path('cursos/<int:pk>/matriculas/',ListaMatriculaCurso.as_view()),
     # "as_view": Reforça o "leitura apenas" dessas rotas
 
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-    #"swagger/" e "redoc/": Direcionam até as documentações da API, de respectivos modelos.
-    # cache_timeout=0, me garante que eu terei uma informação sempre atualizada, que se atualiza a cada 0 seg.
-    #(https://drf-yasg.readthedocs.io/en/stable/readme.html)
+    path('token/',ObterToken.as_view(),name='token'),
+    # troca o usuário e a senha (HTTP Basic) por um token assinado, ver "escola/authentication.py"
+
+    path('cache/estatisticas/',EstatisticasCache.as_view(),name='estatisticas-cache'),
+    # contadores de acertos e falhas do cache de respostas (apenas administradores)
+
+    path('swagger/', visao_sob_demanda('setup.documentacao.swagger'), name='schema-swagger-ui'),
+    path('redoc/', visao_sob_demanda('setup.documentacao.redoc'), name='schema-redoc'),
+    #"swagger/" e "redoc/": Direcionam até as documentações da API, de respectivos modelos (ver "setup/documentacao.py").
+    # o drf_yasg só é importado na primeira requisição de uma delas, e não no início de cada processo
 ]   
+
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
+    # sem o admin no INSTALLED_APPS (processos "SOMENTE_API", ver "setup/settings.py") a rota não existe
+
+if settings.LEITURA_ASSINCRONA:
+    urlpatterns = rotas_assincronas(urlpatterns)
+    # no servidor ASGI as leituras das views de "escola" passam pela "visao_hibrida" (ver "escola/assincrono.py")